@@ -0,0 +1,280 @@
+"""
+FAERS Disproportionality Signal Detection (PRR / ROR)
+
+This script screens every drug–reaction pair in the processed FAERS tables
+for disproportionate reporting, using sparse incidence matrices instead of
+SQL joins or row-wise pandas.
+
+Features:
+- Streams the primaryid/drugname (DRUG) and primaryid/pt (REAC) columns in
+  chunks and encodes names against a growing vocabulary.
+- Rows are deduplicated reports: each caseid's latest primaryid in DEMO
+  (the same case grain as fact_case), limited to reports with at least one
+  drug and one reaction.
+- Builds binary scipy.sparse case × drug and case × reaction matrices; one
+  sparse product (drugs × cases) @ (cases × reactions) gives the co-reported
+  case count `a` for all pairs at once, and the margins give b, c and d.
+- Vectorized PRR and ROR with 95% confidence intervals and Yates chi-square
+  for every pair with a > 0; tables with an empty cell (e.g. a reaction only
+  ever reported with one drug) get the Haldane–Anscombe +0.5 correction, so
+  PRR and ROR stay finite.
+- Signals follow the Evans criteria (a ≥ 3, PRR ≥ 2, chi-square ≥ 4) plus a
+  ROR lower bound above 1; results can be written to CSV.
+
+2×2 table per drug D and reaction R (counts are cases):
+
+            R     not R
+    D       a       b
+    not D   c       d
+
+Usage:
+    python -m analytics.disproportionality --processed-dir data/processed --output data/signals.csv
+
+Date: 2026-02-05
+"""
+
+import argparse
+import logging
+import sys
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+import numpy as np
+import pandas as pd
+
+# -----------------------
+# Base directories
+# -----------------------
+BASE_DIR = Path.cwd()  # repo root
+PROCESSED_DIR = BASE_DIR / "data" / "processed"
+
+CHUNK_SIZE = 500_000
+Z_95 = 1.959964
+
+
+# ---------------- Reading ---------------- #
+def _read_pairs(csv_path: Path, column: str, chunksize: int, vocab: dict, roles=None) -> tuple:
+    """
+    Stream (primaryid, name code) pairs from a merged CSV.
+
+    Names are encoded against `vocab` (name → code), which grows as new names
+    appear; rows with a non-numeric primaryid or a blank/'Unknown' name are
+    dropped. Repeated pairs are kept; the incidence matrix collapses them.
+
+    Returns:
+        tuple: (primaryids int64, codes int32).
+    """
+    usecols = ["primaryid", column] + (["role_cod"] if roles else [])
+    ids_parts, code_parts = [], []
+    for chunk in pd.read_csv(csv_path, usecols=usecols, dtype={column: str, "role_cod": str},
+                             chunksize=chunksize, keep_default_na=False):
+        if roles:
+            chunk = chunk[chunk["role_cod"].str.strip().isin(roles)]
+        ids = chunk["primaryid"]
+        if ids.dtype.kind not in "iu":  # e.g. the 'Unknown' fill value
+            ids = pd.to_numeric(ids.astype(str).str.strip(), errors="coerce")
+
+        # Names are stripped and encoded per distinct value, not per row
+        local_codes, uniques = pd.factorize(chunk[column])
+        names = [name.strip() for name in uniques]
+        to_global = np.array([-1 if name in ("", "Unknown") else vocab.setdefault(name, len(vocab))
+                              for name in names] + [-1], dtype=np.int32)
+        codes = to_global[local_codes]  # local code -1 (missing) maps to the trailing -1
+        keep = (codes >= 0) & ids.notna().to_numpy()
+        ids_parts.append(ids.to_numpy()[keep].astype(np.int64))
+        code_parts.append(codes[keep])
+
+    if not ids_parts:
+        return np.empty(0, dtype=np.int64), np.empty(0, dtype=np.int32)
+    return np.concatenate(ids_parts), np.concatenate(code_parts)
+
+
+def latest_primaryids(demo_csv: Path, chunksize: int = CHUNK_SIZE) -> np.ndarray:
+    """
+    Sorted primaryids of each caseid's latest version (highest caseversion, then primaryid).
+
+    Args:
+        demo_csv (Path): Path to merged_demo.csv.
+        chunksize (int): Rows read per chunk.
+
+    Returns:
+        np.ndarray: Sorted unique int64 primaryids.
+    """
+    parts = []
+    for chunk in pd.read_csv(demo_csv, usecols=["primaryid", "caseid", "caseversion"],
+                             chunksize=chunksize, keep_default_na=False):
+        numeric = chunk.apply(lambda s: s if s.dtype.kind in "iu" else
+                              pd.to_numeric(s.astype(str).str.strip(), errors="coerce"))
+        parts.append(numeric.dropna(subset=["primaryid", "caseid"]).fillna({"caseversion": 0})
+                     .to_numpy(dtype=np.int64))
+    if not parts:
+        return np.empty(0, dtype=np.int64)
+    demo = np.concatenate(parts)
+    order = np.lexsort((demo[:, 0], demo[:, 2], demo[:, 1]))  # caseid, then version, then primaryid
+    demo = demo[order]
+    last = np.r_[demo[1:, 1] != demo[:-1, 1], True]
+    return np.unique(demo[last, 0])
+
+
+# ---------------- Incidence Matrices ---------------- #
+def incidence_matrix(case_ids: np.ndarray, ids: np.ndarray, codes: np.ndarray, n_cols: int):
+    """
+    Binary CSR matrix of cases × names; pairs whose primaryid is not in `case_ids` are dropped.
+
+    Args:
+        case_ids (np.ndarray): Sorted unique primaryids (the row key).
+        ids (np.ndarray): primaryid of each (primaryid, code) pair.
+        codes (np.ndarray): Column code of each pair.
+        n_cols (int): Number of columns (vocabulary size).
+
+    Returns:
+        scipy.sparse.csr_matrix: int32 matrix with 1 where the case reports the name.
+    """
+    from scipy import sparse
+
+    rows = np.searchsorted(case_ids, ids)
+    rows[rows == len(case_ids)] = 0
+    member = case_ids[rows] == ids if len(case_ids) else np.zeros(len(ids), dtype=bool)
+    matrix = sparse.csr_matrix((np.ones(member.sum(), dtype=np.int32), (rows[member], codes[member])),
+                               shape=(len(case_ids), n_cols))
+    matrix.data[:] = 1  # duplicates were summed on construction
+    return matrix
+
+
+def contingency_statistics(drugs_x_cases, cases_x_reactions) -> dict:
+    """
+    2×2 counts, PRR, ROR, 95% CIs and Yates chi-square for every co-reported pair.
+
+    Args:
+        drugs_x_cases: Binary sparse matrix, drugs × cases (transposed case × drug incidence).
+        cases_x_reactions: Binary sparse matrix, cases × reactions.
+
+    Returns:
+        dict: Arrays aligned by pair — drug, reaction, a, b, c, d, prr, prr_lower,
+        prr_upper, ror, ror_lower, ror_upper, chi2. Counts are raw; PRR and ROR add
+        0.5 to every cell of a table with a zero cell (Haldane–Anscombe).
+    """
+    n = cases_x_reactions.shape[0]
+    co = (drugs_x_cases @ cases_x_reactions).tocoo()  # all pairs in one sparse product
+    drug_cases = np.asarray(drugs_x_cases.sum(axis=1)).ravel().astype(np.int64)
+    reaction_cases = np.asarray(cases_x_reactions.sum(axis=0)).ravel().astype(np.int64)
+
+    a = co.data.astype(np.int64)
+    b = drug_cases[co.row] - a
+    c = reaction_cases[co.col] - a
+    d = n - a - b - c
+    ar, br, cr, dr = (x.astype(np.float64) for x in (a, b, c, d))
+    # A zero b, c or d (a > 0 for every pair) would make PRR/ROR 0, inf or nan
+    half = 0.5 * ((b == 0) | (c == 0) | (d == 0))
+    af, bf, cf, df = (x + half for x in (ar, br, cr, dr))
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        prr = (af / (af + bf)) / (cf / (cf + df))
+        prr_se = np.sqrt(1 / af - 1 / (af + bf) + 1 / cf - 1 / (cf + df))
+        ror = (af * df) / (bf * cf)
+        ror_se = np.sqrt(1 / af + 1 / bf + 1 / cf + 1 / df)
+        # Chi-square uses the raw counts; it is nan (never a signal) when a margin is empty
+        chi2 = n * np.maximum(np.abs(ar * dr - br * cr) - n / 2, 0) ** 2 / (
+            (ar + br) * (cr + dr) * (ar + cr) * (br + dr))
+
+        stats = {
+            "drug": co.row, "reaction": co.col, "a": a, "b": b, "c": c, "d": d,
+            "prr": prr, "prr_lower": np.exp(np.log(prr) - Z_95 * prr_se),
+            "prr_upper": np.exp(np.log(prr) + Z_95 * prr_se),
+            "ror": ror, "ror_lower": np.exp(np.log(ror) - Z_95 * ror_se),
+            "ror_upper": np.exp(np.log(ror) + Z_95 * ror_se),
+            "chi2": chi2,
+        }
+    return stats
+
+
+# ---------------- Signal Detection ---------------- #
+def detect_signals(processed_dir: Path = None, min_cases: int = 3, min_prr: float = 2.0,
+                   min_chi2: float = 4.0, min_ror_lower: float = 1.0, roles=None,
+                   chunksize: int = CHUNK_SIZE, output_path: Path = None) -> pd.DataFrame:
+    """
+    Compute disproportionality statistics for all drug–reaction pairs and keep the signals.
+
+    Workflow:
+    - Reads the latest report per case from DEMO (all DRUG/REAC reports if DEMO is missing).
+    - Builds case × drug and case × reaction incidence matrices from DRUG and REAC.
+    - Computes all 2×2 tables with one sparse product, then PRR/ROR/chi-square.
+    - Filters pairs by the thresholds and optionally writes them to `output_path`.
+
+    Args:
+        processed_dir (Path): Directory containing merged_demo/drug/reac.csv.
+        min_cases (int): Minimum co-reported cases (a).
+        min_prr (float): Minimum PRR.
+        min_chi2 (float): Minimum Yates chi-square.
+        min_ror_lower (float): ROR 95% lower bound must exceed this.
+        roles: Drug role codes to count (e.g. ('PS', 'SS') for suspect drugs); all roles if None.
+        chunksize (int): Rows read per chunk.
+        output_path (Path): Optional CSV path for the signals.
+
+    Returns:
+        pd.DataFrame: One row per signal, sorted by PRR lower bound, with
+        drugname, pt, a, b, c, d, prr, prr_lower, prr_upper, ror, ror_lower, ror_upper, chi2.
+    """
+    processed_dir = Path(processed_dir or PROCESSED_DIR)
+    demo_csv = processed_dir / "merged_demo.csv"
+    drug_vocab, reaction_vocab = {}, {}
+    # The three column reads are independent; the CSV parser releases the GIL, so run them side by side
+    with ThreadPoolExecutor(max_workers=3, thread_name_prefix="signals") as pool:
+        drug_read = pool.submit(_read_pairs, processed_dir / "merged_drug.csv", "drugname", chunksize,
+                                drug_vocab, roles)
+        reac_read = pool.submit(_read_pairs, processed_dir / "merged_reac.csv", "pt", chunksize,
+                                reaction_vocab)
+        latest_read = pool.submit(latest_primaryids, demo_csv, chunksize) if demo_csv.exists() else None
+        (drug_ids, drug_codes), (reac_ids, reac_codes) = drug_read.result(), reac_read.result()
+        latest = latest_read.result() if latest_read else None
+
+    case_ids = np.intersect1d(np.unique(drug_ids), np.unique(reac_ids), assume_unique=True)
+    if latest is not None:
+        case_ids = np.intersect1d(case_ids, latest, assume_unique=True)
+    else:
+        logging.warning(f"{demo_csv.name} not found — counting every report, not the latest case versions")
+
+    drugs = incidence_matrix(case_ids, drug_ids, drug_codes, len(drug_vocab))
+    reactions = incidence_matrix(case_ids, reac_ids, reac_codes, len(reaction_vocab))
+    stats = contingency_statistics(drugs.T.tocsr(), reactions)
+    logging.info(f">>> disproportionality: {len(case_ids):,} cases, {len(drug_vocab):,} drugs, "
+                 f"{len(reaction_vocab):,} reactions, {len(stats['a']):,} co-reported pairs")
+
+    with np.errstate(invalid="ignore"):
+        keep = ((stats["a"] >= min_cases) & (stats["prr"] >= min_prr) & (stats["chi2"] >= min_chi2)
+                & (stats["ror_lower"] > min_ror_lower))
+    drug_names = np.array(list(drug_vocab), dtype=object)
+    reaction_names = np.array(list(reaction_vocab), dtype=object)
+    signals = pd.DataFrame({
+        "drugname": drug_names[stats.pop("drug")[keep]],
+        "pt": reaction_names[stats.pop("reaction")[keep]],
+        **{name: values[keep] for name, values in stats.items()},
+    }).sort_values(["prr_lower", "a"], ascending=False, ignore_index=True)
+    logging.info(f"{len(signals):,} signals (a ≥ {min_cases}, PRR ≥ {min_prr}, chi² ≥ {min_chi2}, "
+                 f"ROR lower > {min_ror_lower})")
+
+    if output_path:
+        output_path = Path(output_path)
+        output_path.parent.mkdir(parents=True, exist_ok=True)
+        signals.to_csv(output_path, index=False)
+        logging.info(f"Signals written to {output_path}")
+    return signals
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--processed-dir", type=Path, default=PROCESSED_DIR)
+    parser.add_argument("--output", type=Path, help="Write the signals as CSV")
+    parser.add_argument("--min-cases", type=int, default=3)
+    parser.add_argument("--min-prr", type=float, default=2.0)
+    parser.add_argument("--suspect-only", action="store_true", help="Count only PS/SS drug roles")
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+    signals = detect_signals(args.processed_dir, min_cases=args.min_cases, min_prr=args.min_prr,
+                             roles=("PS", "SS") if args.suspect_only else None, output_path=args.output)
+    print(signals.head(20).to_string(index=False))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,152 @@
+"""
+Case Store Lookup Benchmark (Synthetic FAERS Data)
+
+Generates and transforms seeded synthetic FAERS data, builds the
+memory-mapped case store (etl/case_store.py) and times:
+
+1. The store build for all seven tables.
+2. Single-report lookups (all tables) for random primaryids: median and p95.
+3. One batched lookup of --batch random primaryids.
+4. For reference, finding one report by scanning the merged CSVs in chunks,
+   the way a report was investigated before.
+
+Usage:
+    python -m benchmarks.bench_case_store --scale 1m
+    python -m benchmarks.bench_case_store --scale 10m --batch 10000 --output logs/case_store_bench.json
+
+Date: 2026-02-05
+"""
+
+import argparse
+import json
+import logging
+import shutil
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from etl.instrumentation import current_rss_bytes
+from etl.synthetic import generate_faers, cases_for_rows
+from benchmarks.bench_pipeline import SCALES
+
+
+def _anon_rss_bytes() -> int:
+    """Resident anonymous (heap) memory; mapped store pages are page cache and not counted."""
+    try:
+        with open("/proc/self/status") as f:
+            for line in f:
+                if line.startswith("RssAnon:"):
+                    return int(line.split()[1]) * 1024
+    except OSError:
+        pass
+    return current_rss_bytes()
+
+
+def _csv_scan(processed_dir: Path, primaryid: int) -> int:
+    """Rows of one report found by streaming every merged CSV (the pre-store workflow)."""
+    found = 0
+    for csv_path in sorted(processed_dir.glob("merged_*.csv")):
+        for chunk in pd.read_csv(csv_path, dtype=str, chunksize=500_000, keep_default_na=False):
+            found += int((chunk["primaryid"] == str(primaryid)).sum())
+    return found
+
+
+def run_benchmark(total_rows: int, work_dir: Path, lookups: int = 200, batch: int = 5_000,
+                  seed: int = 42) -> dict:
+    """
+    Build the case store over synthetic data and time single and batched lookups.
+
+    Args:
+        total_rows (int): Approximate rows across all FAERS tables.
+        work_dir (Path): Scratch directory for generated, processed and store files.
+        lookups (int): Single-report lookups to time.
+        batch (int): primaryids in the batched lookup.
+        seed (int): Generator and sampling seed.
+
+    Returns:
+        dict: Build time and size, lookup latencies, batch time and the CSV scan time.
+    """
+    from etl.transform import merge_and_transform_one_by_one
+    from etl.case_store import CaseStore, build_case_store
+
+    raw_dir, processed_dir, store_dir = work_dir / "raw", work_dir / "processed", work_dir / "case_store"
+    for d in (raw_dir, processed_dir, store_dir):
+        shutil.rmtree(d, ignore_errors=True)
+    generate_faers(raw_dir, n_cases=cases_for_rows(total_rows), seed=seed)
+    merge_and_transform_one_by_one(raw_dir, processed_dir)
+
+    start = time.perf_counter()
+    meta = build_case_store(processed_dir, store_dir)
+    build_seconds = time.perf_counter() - start
+
+    rss_before = _anon_rss_bytes()
+    store = CaseStore(store_dir)
+    ids = np.asarray(store.tables["DEMO"].index_ids)
+    rng = np.random.default_rng(seed)
+
+    latencies = []
+    for primaryid in rng.choice(ids, lookups):
+        start = time.perf_counter()
+        store.case(int(primaryid))
+        latencies.append(time.perf_counter() - start)
+
+    batch_ids = rng.choice(ids, min(batch, len(ids)), replace=False)
+    start = time.perf_counter()
+    batch_rows = sum(len(df) for df in store.lookup(batch_ids).values())
+    batch_seconds = time.perf_counter() - start
+    rss_growth = _anon_rss_bytes() - rss_before
+
+    start = time.perf_counter()
+    _csv_scan(processed_dir, int(batch_ids[0]))
+    scan_seconds = time.perf_counter() - start
+
+    return {
+        "rows": sum(m["rows"] for m in meta.values()),
+        "build_seconds": round(build_seconds, 3),
+        "store_mb": round(sum(f.stat().st_size for f in store_dir.rglob("*") if f.is_file()) / 1e6, 1),
+        "csv_mb": round(sum(f.stat().st_size for f in processed_dir.glob("merged_*.csv")) / 1e6, 1),
+        "lookup_ms_median": round(float(np.median(latencies)) * 1e3, 2),
+        "lookup_ms_p95": round(float(np.percentile(latencies, 95)) * 1e3, 2),
+        "batch_ids": len(batch_ids),
+        "batch_rows": batch_rows,
+        "batch_seconds": round(batch_seconds, 3),
+        "lookup_heap_growth_mb": round(rss_growth / 1e6, 1),
+        "csv_scan_seconds": round(scan_seconds, 3),
+    }
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--scale", choices=sorted(SCALES), default="1m")
+    parser.add_argument("--lookups", type=int, default=200)
+    parser.add_argument("--batch", type=int, default=5_000)
+    parser.add_argument("--work-dir", type=Path, help="Scratch directory (default: a temp dir)")
+    parser.add_argument("--output", type=Path, help="Write the results as JSON")
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.WARNING, format="%(message)s")
+    with tempfile.TemporaryDirectory(prefix=f"faers-case-store-{args.scale}-") as tmp:
+        work_dir = args.work_dir or Path(tmp)
+        work_dir.mkdir(parents=True, exist_ok=True)
+        r = run_benchmark(SCALES[args.scale], work_dir, args.lookups, args.batch, args.seed)
+
+    print(f"\n{args.scale}: {r['rows']:,} rows stored in {r['build_seconds']:.1f}s "
+          f"({r['store_mb']:,.0f} MB store, {r['csv_mb']:,.0f} MB merged CSVs)")
+    print(f"  single report, all tables   {r['lookup_ms_median']:.2f} ms median, {r['lookup_ms_p95']:.2f} ms p95")
+    print(f"  batch of {r['batch_ids']:,} reports       {r['batch_seconds']:.3f}s ({r['batch_rows']:,} rows), "
+          f"heap {r['lookup_heap_growth_mb']:+.0f} MB")
+    print(f"  CSV scan for one report     {r['csv_scan_seconds']:.2f}s")
+
+    if args.output:
+        args.output.parent.mkdir(parents=True, exist_ok=True)
+        args.output.write_text(json.dumps(r, indent=2) + "\n")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,173 @@
+"""
+Streamlit Dashboard Load Test (Local DuckDB Mode)
+
+Builds the case aggregates on a DuckDB warehouse filled with seeded
+synthetic FAERS data, then renders `fda_dbt/scripts/streamlit_app.py`
+headlessly with Streamlit's AppTest (WAREHOUSE_BACKEND=duckdb):
+
+1. First session on a cold cache: time to first render and warehouse queries.
+2. Reruns within that session (widget interaction): queries per rerun.
+3. Further sessions on the warm cache: time to first render and queries.
+
+The uncached query time is reported too; it is what every render paid
+before results were cached.
+
+Requires streamlit, altair and duckdb.
+
+Usage:
+    python -m benchmarks.bench_dashboard --scale 100k
+    python -m benchmarks.bench_dashboard --scale 1m --sessions 20 --output logs/dashboard_bench.json
+
+Date: 2026-02-05
+"""
+
+import argparse
+import json
+import logging
+import os
+import shutil
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+from etl.synthetic import generate_faers, cases_for_rows
+from benchmarks.bench_pipeline import SCALES
+from benchmarks.bench_marts import AFTER_BUILD
+
+REPO_ROOT = Path(__file__).resolve().parents[1]
+SCRIPTS_DIR = REPO_ROOT / "fda_dbt" / "scripts"
+APP = SCRIPTS_DIR / "streamlit_app.py"
+
+
+def _build_warehouse(total_rows: int, work_dir: Path, seed: int) -> Path:
+    """Load synthetic data and materialize MARTS.agg_drug_outcome_cases as dbt would."""
+    from etl.transform import merge_and_transform_one_by_one
+    from etl.warehouse import DuckDBBackend
+
+    raw_dir, processed_dir = work_dir / "raw", work_dir / "processed"
+    for d in (raw_dir, processed_dir):
+        shutil.rmtree(d, ignore_errors=True)
+    db_path = work_dir / "ETL_TESTING.duckdb"
+    db_path.unlink(missing_ok=True)
+
+    generate_faers(raw_dir, n_cases=cases_for_rows(total_rows), seed=seed)
+    merge_and_transform_one_by_one(raw_dir, processed_dir)
+    backend = DuckDBBackend(path=db_path)
+    backend.load_tables(sorted(processed_dir.glob("merged_*.csv")))
+    with backend.connection() as conn:
+        conn.execute("CREATE SCHEMA after")
+        for sql in AFTER_BUILD.values():
+            conn.execute(sql)
+        conn.execute("CREATE SCHEMA MARTS")
+        conn.execute("""
+            CREATE TABLE MARTS.agg_drug_outcome_cases AS
+            SELECT *, CAST(current_timestamp AS TIMESTAMP) AS dbt_built_at FROM after.agg_drug_outcome_cases
+        """)
+    return db_path
+
+
+def run_benchmark(total_rows: int, work_dir: Path, sessions: int = 10, reruns: int = 5, seed: int = 42) -> dict:
+    """
+    Render the dashboard for several sessions and count warehouse queries.
+
+    Args:
+        total_rows (int): Approximate rows across all FAERS tables.
+        work_dir (Path): Scratch directory for generated data and the DuckDB file.
+        sessions (int): Sessions to render, the first on a cold cache.
+        reruns (int): Reruns in the first session.
+        seed (int): Generator seed.
+
+    Returns:
+        dict: Uncached query time, cold and warm first-render times and queries per session.
+    """
+    import streamlit as st
+    from streamlit.testing.v1 import AppTest
+
+    db_path = _build_warehouse(total_rows, work_dir, seed)
+    os.environ.update({"WAREHOUSE_BACKEND": "duckdb", "DUCKDB_PATH": str(db_path)})
+
+    # The app imports dashboard_data from its own directory; share that module to count queries
+    sys.path.insert(0, str(SCRIPTS_DIR))
+    import dashboard_data
+
+    sources = []
+    make_source = dashboard_data.get_source
+
+    def counting_source():
+        sources.append(make_source())
+        return sources[-1]
+
+    dashboard_data.get_source = counting_source
+    queries = lambda: sum(s.queries for s in sources)  # noqa: E731
+
+    probe = make_source()
+    start = time.perf_counter()
+    dashboard_data.load_outcomes(probe)
+    uncached_query_seconds = time.perf_counter() - start
+
+    st.cache_data.clear()
+    st.cache_resource.clear()
+    renders = []
+    for session in range(sessions):
+        at = AppTest.from_file(str(APP), default_timeout=120)
+        before = queries()
+        start = time.perf_counter()
+        at.run()
+        seconds = time.perf_counter() - start
+        if at.exception:
+            raise RuntimeError(f"Dashboard failed to render: {at.exception[0].message}")
+        session_queries = queries() - before
+        rerun_queries = None
+        if session == 0:
+            before = queries()
+            for _ in range(reruns):
+                at.run()
+            rerun_queries = queries() - before
+        renders.append({"seconds": seconds, "queries": session_queries, "rerun_queries": rerun_queries})
+
+    warm = renders[1:] or renders
+    return {
+        "uncached_query_seconds": round(uncached_query_seconds, 4),
+        "cold_first_render_seconds": round(renders[0]["seconds"], 4),
+        "cold_queries": renders[0]["queries"],
+        "rerun_queries": renders[0]["rerun_queries"],
+        "reruns": reruns,
+        "warm_first_render_seconds": round(sorted(r["seconds"] for r in warm)[len(warm) // 2], 4),
+        "warm_queries_per_session": sum(r["queries"] for r in warm) / len(warm),
+        "sessions": sessions,
+    }
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--scale", choices=sorted(SCALES), default="100k")
+    parser.add_argument("--sessions", type=int, default=10)
+    parser.add_argument("--reruns", type=int, default=5)
+    parser.add_argument("--work-dir", type=Path, help="Scratch directory (default: a temp dir)")
+    parser.add_argument("--output", type=Path, help="Write the results as JSON")
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.WARNING, format="%(message)s")
+    with tempfile.TemporaryDirectory(prefix=f"faers-dashboard-{args.scale}-") as tmp:
+        work_dir = args.work_dir or Path(tmp)
+        work_dir.mkdir(parents=True, exist_ok=True)
+        results = run_benchmark(SCALES[args.scale], work_dir, args.sessions, args.reruns, args.seed)
+
+    print(f"\n{args.scale}: {args.sessions} sessions")
+    print(f"  uncached aggregate query      {results['uncached_query_seconds']:.4f}s (paid on every render before)")
+    print(f"  first render, cold cache      {results['cold_first_render_seconds']:.3f}s, "
+          f"{results['cold_queries']} warehouse queries")
+    print(f"  {results['reruns']} reruns in that session     {results['rerun_queries']} warehouse queries")
+    print(f"  first render, warm cache      {results['warm_first_render_seconds']:.3f}s (median), "
+          f"{results['warm_queries_per_session']:.1f} queries per session")
+
+    if args.output:
+        args.output.parent.mkdir(parents=True, exist_ok=True)
+        args.output.write_text(json.dumps(results, indent=2) + "\n")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
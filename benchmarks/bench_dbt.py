@@ -0,0 +1,154 @@
+"""
+dbt Full vs Incremental Build Benchmark (DuckDB)
+
+Times the dbt models on a local DuckDB warehouse filled with seeded
+synthetic FAERS data:
+
+1. Load quarter 1 and run `dbt run --full-refresh` (initial build).
+2. Append quarter 2 to the FDA source tables with a newer load_ts, as
+   LOAD_MODE=incremental does in Snowflake, and run `dbt run` (incremental:
+   only the new reports are processed).
+3. Run `dbt run --full-refresh` over both quarters for comparison.
+
+Requires duckdb, dbt-duckdb and the dbt packages (`dbt deps`, run once).
+
+Usage:
+    python -m benchmarks.bench_dbt --scale 1m
+    python -m benchmarks.bench_dbt --scale 100k --work-dir /tmp/faers-dbt --output logs/dbt_bench.json
+
+Date: 2026-02-05
+"""
+
+import argparse
+import json
+import logging
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+from etl.synthetic import generate_faers, cases_for_rows
+from benchmarks.bench_pipeline import SCALES
+
+REPO_ROOT = Path(__file__).resolve().parents[1]
+PROFILES_DIR = REPO_ROOT / "fda_dbt" / "profiles"
+TABLES = ["DEMO", "DRUG", "INDI", "OUTC", "REAC", "RPSR", "THER"]
+
+
+def _dbt_run(work_dir: Path, full_refresh: bool) -> dict:
+    """Run dbt models against the benchmark database; return wall time and slowest models."""
+    target_path = work_dir / "target"
+    cmd = ["dbt", "run", "--project-dir", str(REPO_ROOT), "--profiles-dir", str(PROFILES_DIR),
+           "--target", "duckdb", "--target-path", str(target_path)]
+    if full_refresh:
+        cmd.append("--full-refresh")
+    env = {**os.environ, "DUCKDB_PATH": str(work_dir / "ETL_TESTING.duckdb")}
+
+    start = time.perf_counter()
+    subprocess.run(cmd, check=True, cwd=REPO_ROOT, env=env, stdout=subprocess.DEVNULL)
+    seconds = time.perf_counter() - start
+
+    results = json.loads((target_path / "run_results.json").read_text())["results"]
+    models = sorted(({"model": r["unique_id"].split(".")[-1], "seconds": round(r["execution_time"], 3)}
+                     for r in results), key=lambda m: m["seconds"], reverse=True)
+    return {"seconds": round(seconds, 3), "models": models}
+
+
+def _append_quarter(db_path: Path, processed_dir: Path, quarter: str) -> int:
+    """Insert one quarter's rows into the FDA tables without touching the existing rows."""
+    from etl.warehouse import DuckDBBackend
+
+    staging = DuckDBBackend(path=db_path, schema="FDA_NEXT")  # same declared/inferred types per table
+    appended = 0
+    for table in TABLES:
+        staging.load_table(processed_dir / f"merged_{table.lower()}.csv", table)
+        with staging.connection() as conn:
+            appended += conn.execute(
+                f"INSERT INTO FDA.{table} SELECT * FROM FDA_NEXT.{table} WHERE source_quarter = ?", [quarter]
+            ).fetchone()[0]
+    with staging.connection() as conn:
+        conn.execute("DROP SCHEMA FDA_NEXT CASCADE")
+    return appended
+
+
+def run_benchmark(total_rows: int, work_dir: Path, seed: int = 42) -> dict:
+    """
+    Build the dbt project fully, incrementally after a new quarter, and fully again.
+
+    Args:
+        total_rows (int): Approximate rows across all FAERS tables (both quarters).
+        work_dir (Path): Scratch directory for generated data and the DuckDB file.
+        seed (int): Generator seed.
+
+    Returns:
+        dict: Timings for full_q1, incremental_q2 and full_q1_q2.
+    """
+    from etl.transform import merge_and_transform_one_by_one
+    from etl.warehouse import DuckDBBackend
+
+    gen_dir, raw_dir, processed_dir = work_dir / "generated", work_dir / "raw", work_dir / "processed"
+    for d in (raw_dir, processed_dir):
+        shutil.rmtree(d, ignore_errors=True)
+        d.mkdir(parents=True)
+    db_path = work_dir / "ETL_TESTING.duckdb"
+    db_path.unlink(missing_ok=True)
+    generate_faers(gen_dir, n_cases=cases_for_rows(total_rows), seed=seed)
+
+    # Quarter 1 only: initial full build
+    for f in gen_dir.glob("*25Q1.txt"):
+        shutil.copy(f, raw_dir / f.name)
+    merge_and_transform_one_by_one(raw_dir, processed_dir)
+    backend = DuckDBBackend(path=db_path)
+    q1_rows = sum(s["rows"] for s in backend.load_tables(sorted(processed_dir.glob("merged_*.csv"))).values())
+    full_q1 = _dbt_run(work_dir, full_refresh=True)
+
+    # Quarter 2 arrives: append its rows (newer load_ts), then build incrementally
+    for f in gen_dir.glob("*25Q2.txt"):
+        shutil.copy(f, raw_dir / f.name)
+    merge_and_transform_one_by_one(raw_dir, processed_dir)
+    q2_rows = _append_quarter(db_path, processed_dir, "25Q2")
+    incremental_q2 = _dbt_run(work_dir, full_refresh=False)
+
+    full_q1_q2 = _dbt_run(work_dir, full_refresh=True)
+
+    return {
+        "q1_rows": q1_rows,
+        "q2_rows": q2_rows,
+        "full_q1": full_q1,
+        "incremental_q2": incremental_q2,
+        "full_q1_q2": full_q1_q2,
+    }
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--scale", choices=sorted(SCALES), default="100k")
+    parser.add_argument("--work-dir", type=Path, help="Scratch directory (default: a temp dir)")
+    parser.add_argument("--output", type=Path, help="Write the results as JSON")
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.WARNING, format="%(message)s")
+    with tempfile.TemporaryDirectory(prefix=f"faers-dbt-{args.scale}-") as tmp:
+        work_dir = args.work_dir or Path(tmp)
+        work_dir.mkdir(parents=True, exist_ok=True)
+        results = run_benchmark(SCALES[args.scale], work_dir, seed=args.seed)
+
+    print(f"\n{args.scale}: {results['q1_rows']:,} rows in Q1, {results['q2_rows']:,} appended in Q2")
+    for name in ("full_q1", "incremental_q2", "full_q1_q2"):
+        slowest = ", ".join(f"{m['model']} {m['seconds']:.2f}s" for m in results[name]["models"][:3])
+        print(f"  {name:<15} {results[name]['seconds']:8.2f}s   slowest: {slowest}")
+    speedup = results["full_q1_q2"]["seconds"] / max(results["incremental_q2"]["seconds"], 1e-9)
+    print(f"  incremental vs full rebuild after Q2: {speedup:.1f}x")
+
+    if args.output:
+        args.output.parent.mkdir(parents=True, exist_ok=True)
+        args.output.write_text(json.dumps(results, indent=2) + "\n")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
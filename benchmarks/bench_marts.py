@@ -0,0 +1,214 @@
+"""
+Marts Layout Benchmark: Fan-Out Fact vs Case-Grain Fact + Bridges (DuckDB)
+
+Loads seeded synthetic FAERS data into DuckDB and compares the two marts
+layouts on the same data:
+
+- before: fact_adverse_events left-joins patient → drug, reaction, outcome and
+  reporter rows on (primaryid, caseid); EDA models count(distinct caseid) on it.
+- after: fact_case (one row per case, latest version), bridge_case_* tables and
+  the agg_* summaries that feed the EDA models.
+
+The SQL mirrors the dbt models without the incremental/Jinja parts, so it
+runs with duckdb alone. Reports fact row counts, build times and EDA query times.
+
+Usage:
+    python -m benchmarks.bench_marts --scale 100k
+    python -m benchmarks.bench_marts --scale 1m --output logs/marts_bench.json
+
+Date: 2026-02-05
+"""
+
+import argparse
+import json
+import logging
+import shutil
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+from etl.synthetic import generate_faers, cases_for_rows
+from benchmarks.bench_pipeline import SCALES
+
+ANTIDEPRESSANTS = ("'SERTRALINE', 'FLUOXETINE', 'CITALOPRAM', 'ESCITALOPRAM', 'VENLAFAXINE', "
+                   "'DULOXETINE', 'BUPROPION', 'TRAZODONE', 'AMITRIPTYLINE'")
+AGE_GROUP = ("case when age is null then null when age < 18 then 'Pediatric' "
+             "when age >= 65 then 'Elderly' else 'Adult' end")
+
+# ---------------- Before: fan-out fact ---------------- #
+BEFORE_BUILD = {
+    "fact_adverse_events": """
+        create or replace table before.fact_adverse_events as
+        select p.primaryid, p.caseid, p.caseversion, p.age, p.sex, p.reporter_country, p.occr_country,
+               d.drug_seq, r.pt, o.outc_cod, rp.rpsr_cod
+        from fda.demo p
+        left join fda.drug d on p.primaryid = d.primaryid and p.caseid = d.caseid
+        left join fda.reac r on p.primaryid = r.primaryid and p.caseid = r.caseid
+        left join fda.outc o on p.primaryid = o.primaryid and p.caseid = o.caseid
+        left join fda.rpsr rp on p.primaryid = rp.primaryid and p.caseid = rp.caseid
+    """,
+}
+BEFORE_EDA = {
+    "patient_demo": f"""
+        select {AGE_GROUP} as age_group, sex, count(distinct caseid) as num_patients
+        from before.fact_adverse_events where age is not null group by 1, 2
+    """,
+    "report_by_country": """
+        select occr_country, count(distinct caseid) as num_reports from before.fact_adverse_events
+        where occr_country is not null group by 1 order by 2 desc limit 10
+    """,
+    "top_antidepressants": f"""
+        select d.drugname, o.outc_cod, count(distinct d.caseid) as total_cases
+        from fda.drug d join fda.outc o on d.caseid = o.caseid
+        where d.drugname in ({ANTIDEPRESSANTS}) and o.outc_cod in ('DE', 'LT', 'HO', 'DS')
+        group by 1, 2
+    """,
+}
+
+# ---------------- After: case-grain fact, bridges, aggregates ---------------- #
+AFTER_BUILD = {
+    "fact_case": f"""
+        create or replace table after.fact_case as
+        with latest as (
+            select * from fda.demo
+            qualify row_number() over(partition by caseid order by caseversion desc, primaryid desc) = 1
+        )
+        select l.caseid, l.primaryid, l.caseversion, l.age, {AGE_GROUP.replace('age', 'l.age')} as age_group,
+               l.sex, l.reporter_country, l.occr_country,
+               coalesce(d.n, 0) as n_drugs, coalesce(r.n, 0) as n_reactions, coalesce(o.n, 0) as n_outcomes
+        from latest l
+        left join (select primaryid, count(*) n from fda.drug group by 1) d on l.primaryid = d.primaryid
+        left join (select primaryid, count(*) n from fda.reac group by 1) r on l.primaryid = r.primaryid
+        left join (select primaryid, count(*) n from fda.outc group by 1) o on l.primaryid = o.primaryid
+    """,
+    "bridge_case_drug": """
+        create or replace table after.bridge_case_drug as
+        select primaryid, caseid, drug_seq, role_cod, md5(drugname || '-' || prod_ai) as drug_key from fda.drug
+    """,
+    "dim_drug": """
+        create or replace table after.dim_drug as
+        select distinct md5(drugname || '-' || prod_ai) as drug_key, drugname, prod_ai from fda.drug
+    """,
+    "bridge_case_outcome": """
+        create or replace table after.bridge_case_outcome as select primaryid, caseid, outc_cod from fda.outc
+    """,
+    "agg_case_demographics": """
+        create or replace table after.agg_case_demographics as
+        select age_group, sex, reporter_country, occr_country, count(*) as num_cases
+        from after.fact_case group by 1, 2, 3, 4
+    """,
+    "agg_drug_outcome_cases": """
+        create or replace table after.agg_drug_outcome_cases as
+        with case_drugs as (
+            select distinct f.caseid, dd.drugname from after.fact_case f
+            join after.bridge_case_drug bd on f.primaryid = bd.primaryid
+            join after.dim_drug dd on bd.drug_key = dd.drug_key
+        ), case_outcomes as (
+            select distinct f.caseid, bo.outc_cod from after.fact_case f
+            join after.bridge_case_outcome bo on f.primaryid = bo.primaryid
+        )
+        select cd.drugname, co.outc_cod, count(*) as num_cases
+        from case_drugs cd join case_outcomes co on cd.caseid = co.caseid group by 1, 2
+    """,
+}
+AFTER_EDA = {
+    "patient_demo": """
+        select age_group, sex, sum(num_cases) as num_patients from after.agg_case_demographics
+        where age_group is not null group by 1, 2
+    """,
+    "report_by_country": """
+        select occr_country, sum(num_cases) as num_reports from after.agg_case_demographics
+        where occr_country is not null group by 1 order by 2 desc limit 10
+    """,
+    "top_antidepressants": f"""
+        select drugname, outc_cod, num_cases as total_cases from after.agg_drug_outcome_cases
+        where drugname in ({ANTIDEPRESSANTS}) and outc_cod in ('DE', 'LT', 'HO', 'DS')
+    """,
+}
+
+
+def _timed(conn, sql: str, repeat: int = 1) -> float:
+    """Best wall time of `repeat` executions, fetching all rows."""
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        conn.execute(sql).fetchall()
+        best = min(best, time.perf_counter() - start)
+    return round(best, 4)
+
+
+def _layout(conn, schema: str, build: dict, eda: dict, fact: str, repeat: int) -> dict:
+    conn.execute(f"create schema if not exists {schema}")
+    build_seconds = {name: _timed(conn, sql) for name, sql in build.items()}
+    return {
+        "fact_rows": conn.execute(f"select count(*) from {schema}.{fact}").fetchone()[0],
+        "build_seconds": build_seconds,
+        "eda_seconds": {name: _timed(conn, sql, repeat) for name, sql in eda.items()},
+    }
+
+
+def run_benchmark(total_rows: int, work_dir: Path, seed: int = 42, repeat: int = 3) -> dict:
+    """
+    Build both marts layouts over the same synthetic data and time the EDA queries.
+
+    Args:
+        total_rows (int): Approximate rows across all FAERS tables.
+        work_dir (Path): Scratch directory for generated data and the DuckDB file.
+        seed (int): Generator seed.
+        repeat (int): EDA query repetitions (best time is kept).
+
+    Returns:
+        dict: Source row counts and the before/after fact rows, build and EDA times.
+    """
+    from etl.transform import merge_and_transform_one_by_one
+    from etl.warehouse import DuckDBBackend
+
+    raw_dir, processed_dir = work_dir / "raw", work_dir / "processed"
+    for d in (raw_dir, processed_dir):
+        shutil.rmtree(d, ignore_errors=True)
+    db_path = work_dir / "ETL_TESTING.duckdb"
+    db_path.unlink(missing_ok=True)
+
+    generate_faers(raw_dir, n_cases=cases_for_rows(total_rows), seed=seed)
+    merge_and_transform_one_by_one(raw_dir, processed_dir)
+    backend = DuckDBBackend(path=db_path)
+    loaded = backend.load_tables(sorted(processed_dir.glob("merged_*.csv")))
+    with backend.connection() as conn:
+        return {
+            "source_rows": {table: stats["rows"] for table, stats in loaded.items()},
+            "before": _layout(conn, "before", BEFORE_BUILD, BEFORE_EDA, "fact_adverse_events", repeat),
+            "after": _layout(conn, "after", AFTER_BUILD, AFTER_EDA, "fact_case", repeat),
+        }
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--scale", choices=sorted(SCALES), default="100k")
+    parser.add_argument("--work-dir", type=Path, help="Scratch directory (default: a temp dir)")
+    parser.add_argument("--output", type=Path, help="Write the results as JSON")
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.WARNING, format="%(message)s")
+    with tempfile.TemporaryDirectory(prefix=f"faers-marts-{args.scale}-") as tmp:
+        work_dir = args.work_dir or Path(tmp)
+        work_dir.mkdir(parents=True, exist_ok=True)
+        results = run_benchmark(SCALES[args.scale], work_dir, seed=args.seed)
+
+    before, after = results["before"], results["after"]
+    print(f"\n{args.scale}: {sum(results['source_rows'].values()):,} source rows")
+    print(f"  fact rows      {before['fact_rows']:>12,} (fan-out)  →  {after['fact_rows']:>10,} (case grain)")
+    print(f"  marts build    {sum(before['build_seconds'].values()):>11.3f}s             →  "
+          f"{sum(after['build_seconds'].values()):>9.3f}s")
+    for name in BEFORE_EDA:
+        print(f"  {name:<20} {before['eda_seconds'][name]:>8.4f}s  →  {after['eda_seconds'][name]:>8.4f}s")
+
+    if args.output:
+        args.output.parent.mkdir(parents=True, exist_ok=True)
+        args.output.write_text(json.dumps(results, indent=2) + "\n")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
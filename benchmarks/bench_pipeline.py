@@ -0,0 +1,202 @@
+"""
+Pipeline Scale Benchmark
+
+Runs extract-from-local-zip, transform, validation and a mocked load over
+seeded synthetic FAERS data at 100k / 1M / 10M rows, and compares rows/sec
+and peak memory per stage against stored baselines.
+
+The load stage runs load_csv_to_snowflake for real (schema inference,
+chunk parsing, type coercion) against a no-op connection with write_pandas
+replaced, so it measures the client-side cost without a warehouse.
+
+Usage:
+    python -m benchmarks.bench_pipeline --scale 100k
+    python -m benchmarks.bench_pipeline --scale 1m --scale 10m --work-dir /tmp/faers-bench
+    python -m benchmarks.bench_pipeline --scale 1m --update-baseline
+
+Exits with status 1 if any stage is slower or uses more memory than its
+baseline by more than --tolerance. Peak RSS is cleanest with one scale per
+process, since Python rarely returns freed memory to the OS.
+
+Date: 2026-02-05
+"""
+
+import argparse
+import json
+import logging
+import multiprocessing
+import os
+import sys
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from unittest.mock import patch
+
+from etl import instrumentation
+from etl.synthetic import generate_faers, write_faers_zips, cases_for_rows
+
+SCALES = {"100k": 100_000, "1m": 1_000_000, "10m": 10_000_000}
+STAGES = ["extract", "transform", "validate", "load"]
+BASELINE_PATH = Path(__file__).parent / "baselines.json"
+DEFAULT_TOLERANCE = 0.3
+
+
+class _NullCursor:
+    def execute(self, sql, *args):
+        return self
+
+    def fetchone(self):
+        return None
+
+    def fetchall(self):
+        return []
+
+    def close(self):
+        pass
+
+
+class _NullConnection:
+    """Connection stand-in for the mocked load; DDL is accepted and ignored."""
+    database = "ETL_TESTING"
+    schema = "FDA"
+
+    def cursor(self):
+        return _NullCursor()
+
+
+def _null_write_pandas(conn, df, table_name, **kwargs):
+    return True, 1, len(df), None
+
+
+def run_benchmark(total_rows: int, work_dir: Path, stages=STAGES, seed: int = 42) -> dict:
+    """
+    Generate synthetic data and run the selected stages, timed with etl.instrumentation.
+
+    Args:
+        total_rows (int): Approximate rows across all FAERS tables.
+        work_dir (Path): Scratch directory for ZIPs, raw/processed files and reports.
+        stages: Subset of STAGES to run, in order.
+        seed (int): Generator seed.
+
+    Returns:
+        dict: stage → {rows, wall_seconds, rows_per_sec, peak_rss_mb}.
+    """
+    from etl.extract import download_faers_data
+    from etl.transform import merge_and_transform_one_by_one
+    from etl.load import load_csv_to_snowflake
+
+    if "validate" in stages:
+        # Imported up front so GX start-up is not counted as validation time
+        os.environ.setdefault("GX_ANALYTICS_ENABLED", "False")
+        from validation.extract_gx import validate_all_texts, get_gx_context
+        from validation.referential_integrity import validate_referential_integrity
+        get_gx_context()
+
+    work_dir = Path(work_dir)
+    gen_dir, zip_dir = work_dir / "generated", work_dir / "zips"
+    raw_dir, processed_dir = work_dir / "raw", work_dir / "processed"
+    reports_dir = work_dir / "gx_reports"
+    for d in (raw_dir, processed_dir):
+        d.mkdir(parents=True, exist_ok=True)
+        for f in d.glob("*.*"):
+            f.unlink()
+
+    # Generated in a child process so its memory does not inflate the measured peak RSS
+    with ProcessPoolExecutor(max_workers=1, mp_context=multiprocessing.get_context("spawn")) as pool:
+        written = pool.submit(generate_faers, gen_dir, cases_for_rows(total_rows), seed=seed).result()
+    rows = sum(written.values())
+    write_faers_zips(gen_dir, zip_dir)
+    logging.info(f"Generated {rows:,} synthetic rows in {len(written)} files")
+
+    recorder = instrumentation.reset_recorder()
+    for name in stages:
+        with instrumentation.stage(name) as st:
+            st.add(rows=rows)
+            if name == "extract":
+                download_faers_data(raw_dir, zip_dir=zip_dir)
+            elif name == "transform":
+                merge_and_transform_one_by_one(raw_dir, processed_dir)
+            elif name == "validate":
+                validate_all_texts(processed_dir, output_dir=reports_dir)
+                validate_referential_integrity(processed_dir, output_dir=reports_dir)
+            elif name == "load":
+                with patch("etl.load.write_pandas", _null_write_pandas):
+                    for csv_path in sorted(processed_dir.glob("merged_*.csv")):
+                        table = csv_path.stem.replace("merged_", "").upper()
+                        load_csv_to_snowflake(csv_path, table, _NullConnection())
+
+    report = recorder.write_report(work_dir / "run_report.json")
+    return {
+        s["stage"]: {k: s[k] for k in ("rows", "wall_seconds", "rows_per_sec", "peak_rss_mb")}
+        for s in report["stages"] if s["table"] is None
+    }
+
+
+def compare_to_baseline(results: dict, baseline: dict, tolerance: float = DEFAULT_TOLERANCE) -> list:
+    """
+    Flag stages whose throughput dropped or peak RSS grew beyond `tolerance`.
+
+    Returns:
+        list[str]: Human-readable regression messages (empty if none).
+    """
+    regressions = []
+    for name, res in results.items():
+        base = baseline.get(name)
+        if not base:
+            continue
+        if res["rows_per_sec"] < base["rows_per_sec"] * (1 - tolerance):
+            regressions.append(f"{name}: {res['rows_per_sec']:,.0f} rows/sec "
+                               f"< baseline {base['rows_per_sec']:,.0f}")
+        if res["peak_rss_mb"] > base["peak_rss_mb"] * (1 + tolerance):
+            regressions.append(f"{name}: peak RSS {res['peak_rss_mb']:,.0f} MB "
+                               f"> baseline {base['peak_rss_mb']:,.0f} MB")
+    return regressions
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--scale", action="append", choices=sorted(SCALES), help="Repeatable; default 100k")
+    parser.add_argument("--stage", action="append", choices=STAGES, help="Repeatable; default all")
+    parser.add_argument("--work-dir", type=Path, help="Scratch directory (default: a temp dir)")
+    parser.add_argument("--baseline", type=Path, default=BASELINE_PATH)
+    parser.add_argument("--tolerance", type=float, default=DEFAULT_TOLERANCE)
+    parser.add_argument("--update-baseline", action="store_true", help="Store these results as baselines")
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.WARNING, format="%(message)s")
+    baselines = json.loads(args.baseline.read_text()) if args.baseline.exists() else {}
+    stages = [s for s in STAGES if s in (args.stage or STAGES)]
+
+    failed = False
+    for scale in args.scale or ["100k"]:
+        with tempfile.TemporaryDirectory(prefix=f"faers-bench-{scale}-") as tmp:
+            work_dir = (args.work_dir / scale) if args.work_dir else Path(tmp)
+            results = run_benchmark(SCALES[scale], work_dir, stages, seed=args.seed)
+
+        print(f"\n{scale}: {next(iter(results.values()))['rows']:,} rows")
+        base = baselines.get(scale, {})
+        for name, res in results.items():
+            ref = base.get(name)
+            vs = f"  (baseline {ref['rows_per_sec']:>10,.0f} rows/sec, {ref['peak_rss_mb']:>7,.0f} MB)" if ref else ""
+            print(f"  {name:<10} {res['wall_seconds']:8.2f}s {res['rows_per_sec']:>12,.0f} rows/sec "
+                  f"{res['peak_rss_mb']:>8,.0f} MB peak{vs}")
+
+        if args.update_baseline:
+            baselines[scale] = {name: {"rows_per_sec": res["rows_per_sec"], "peak_rss_mb": res["peak_rss_mb"]}
+                                for name, res in results.items()}
+            continue
+        if not base:
+            print(f"  no baseline for {scale} — run with --update-baseline to record one")
+        for msg in compare_to_baseline(results, base, args.tolerance):
+            print(f"  REGRESSION {msg}")
+            failed = True
+
+    if args.update_baseline:
+        args.baseline.write_text(json.dumps(baselines, indent=2, sort_keys=True) + "\n")
+        print(f"\nBaselines written to {args.baseline}")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
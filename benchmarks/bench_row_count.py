@@ -0,0 +1,55 @@
+"""
+Row Count Benchmark
+
+Compares the original text-mode generator count used by validation
+(`sum(1 for line in f)`) with the memory-mapped `count_rows` utility,
+cold (no sidecar) and warm (sidecar cache hit).
+
+Usage:
+    python -m benchmarks.bench_row_count [path/to/merged_drug.csv]
+
+Date: 2026-02-05
+"""
+
+import sys
+import time
+from pathlib import Path
+
+from etl.row_count import count_rows, _sidecar_path
+
+DEFAULT_PATH = Path.cwd() / "data" / "processed" / "merged_drug.csv"
+
+
+def _timed(fn):
+    start = time.perf_counter()
+    result = fn()
+    return result, time.perf_counter() - start
+
+
+def generator_count(path: Path) -> int:
+    """Baseline: decode every line and count in Python."""
+    with open(path, "r", encoding="utf-8") as f:
+        return sum(1 for line in f) - 1
+
+
+def main(path: Path = DEFAULT_PATH):
+    size_mb = path.stat().st_size / 1e6
+    _sidecar_path(path).unlink(missing_ok=True)
+
+    runs = [
+        ("text generator", lambda: generator_count(path)),
+        ("mmap lines (cold)", lambda: count_rows(path, use_cache=False)),
+        ("mmap quoted (cold)", lambda: count_rows(path, quoted=True)),
+        ("mmap quoted (cached)", lambda: count_rows(path, quoted=True)),
+    ]
+
+    print(f"{path.name}: {size_mb:,.1f} MB")
+    baseline = None
+    for name, fn in runs:
+        rows, secs = _timed(fn)
+        baseline = baseline or secs
+        print(f"  {name:<22} {rows:>12,} rows  {secs:8.3f}s  {baseline / secs:7.1f}x")
+
+
+if __name__ == "__main__":
+    main(Path(sys.argv[1]) if len(sys.argv) > 1 else DEFAULT_PATH)
@@ -0,0 +1,127 @@
+"""
+Disproportionality Signal Benchmark (Synthetic FAERS Data)
+
+Generates seeded synthetic FAERS data (default: full FAERS scale, ~11.5M
+rows over two quarters), transforms it, and times
+analytics.disproportionality.detect_signals, which computes the 2×2 tables,
+PRR and ROR for all drug–reaction pairs with one sparse matrix product.
+
+With --pandas-baseline, the same counts are also computed the pandas way
+(merge DRUG and REAC on primaryid, group by pair, join the margins) for
+comparison.
+
+Usage:
+    python -m benchmarks.bench_signals                   # 10m rows
+    python -m benchmarks.bench_signals --scale 1m --pandas-baseline --output logs/signals_bench.json
+
+Date: 2026-02-05
+"""
+
+import argparse
+import json
+import logging
+import multiprocessing
+import shutil
+import sys
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+import pandas as pd
+
+from etl import instrumentation
+from etl.synthetic import generate_faers, cases_for_rows
+from benchmarks.bench_pipeline import SCALES
+
+
+def pandas_pair_counts(processed_dir: Path, case_ids) -> pd.DataFrame:
+    """Reference implementation: 2×2 counts for all pairs with a merge and group-bys."""
+    drug = pd.read_csv(processed_dir / "merged_drug.csv", usecols=["primaryid", "drugname"])
+    reac = pd.read_csv(processed_dir / "merged_reac.csv", usecols=["primaryid", "pt"])
+    drug = drug[drug["primaryid"].isin(case_ids)].drop_duplicates()
+    reac = reac[reac["primaryid"].isin(case_ids)].drop_duplicates()
+
+    pairs = drug.merge(reac, on="primaryid").groupby(["drugname", "pt"]).size().rename("a").reset_index()
+    pairs = pairs.join(drug.groupby("drugname").size().rename("n_drug"), on="drugname")
+    pairs = pairs.join(reac.groupby("pt").size().rename("n_reaction"), on="pt")
+    n = len(case_ids)
+    pairs["b"] = pairs["n_drug"] - pairs["a"]
+    pairs["c"] = pairs["n_reaction"] - pairs["a"]
+    pairs["d"] = n - pairs["a"] - pairs["b"] - pairs["c"]
+    pairs["prr"] = (pairs["a"] / pairs["n_drug"]) / (pairs["c"] / (pairs["c"] + pairs["d"]))
+    pairs["ror"] = (pairs["a"] * pairs["d"]) / (pairs["b"] * pairs["c"])
+    return pairs
+
+
+def run_benchmark(total_rows: int, work_dir: Path, seed: int = 42, pandas_baseline: bool = False) -> dict:
+    """
+    Generate and transform synthetic data, then time signal detection.
+
+    Args:
+        total_rows (int): Approximate rows across all FAERS tables.
+        work_dir (Path): Scratch directory for generated and processed files.
+        seed (int): Generator seed.
+        pandas_baseline (bool): Also time the merge/group-by implementation.
+
+    Returns:
+        dict: Input sizes, signal count and wall time / peak RSS per method.
+    """
+    from etl.transform import merge_and_transform_one_by_one
+    from analytics.disproportionality import detect_signals, latest_primaryids
+
+    raw_dir, processed_dir = work_dir / "raw", work_dir / "processed"
+    for d in (raw_dir, processed_dir):
+        shutil.rmtree(d, ignore_errors=True)
+    # Generated in a child process so its memory does not inflate the measured peak RSS
+    with ProcessPoolExecutor(max_workers=1, mp_context=multiprocessing.get_context("spawn")) as pool:
+        written = pool.submit(generate_faers, raw_dir, cases_for_rows(total_rows), seed=seed).result()
+    merge_and_transform_one_by_one(raw_dir, processed_dir)
+
+    recorder = instrumentation.reset_recorder()
+    with instrumentation.stage("signals"):
+        signals = detect_signals(processed_dir)
+    results = {
+        "rows": sum(written.values()),
+        "signals": len(signals),
+    }
+    if pandas_baseline:
+        with instrumentation.stage("signals_pandas"):
+            pairs = pandas_pair_counts(processed_dir, latest_primaryids(processed_dir / "merged_demo.csv"))
+        results["pandas_pairs"] = len(pairs)
+
+    report = recorder.write_report(work_dir / "run_report.json")
+    results["methods"] = {s["stage"]: {k: s[k] for k in ("wall_seconds", "peak_rss_mb")}
+                          for s in report["stages"] if s["table"] is None}
+    return results
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--scale", choices=sorted(SCALES), default="10m")
+    parser.add_argument("--pandas-baseline", action="store_true", help="Also time the pandas merge/group-by")
+    parser.add_argument("--work-dir", type=Path, help="Scratch directory (default: a temp dir)")
+    parser.add_argument("--output", type=Path, help="Write the results as JSON")
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.WARNING, format="%(message)s")
+    start = time.perf_counter()
+    with tempfile.TemporaryDirectory(prefix=f"faers-signals-{args.scale}-") as tmp:
+        work_dir = args.work_dir or Path(tmp)
+        work_dir.mkdir(parents=True, exist_ok=True)
+        results = run_benchmark(SCALES[args.scale], work_dir, args.seed, args.pandas_baseline)
+
+    print(f"\n{args.scale}: {results['rows']:,} synthetic rows, {results['signals']:,} signals "
+          f"(total {time.perf_counter() - start:.0f}s incl. generation)")
+    for name, m in results["methods"].items():
+        print(f"  {name:<16} {m['wall_seconds']:8.2f}s   peak RSS {m['peak_rss_mb']:,.0f} MB")
+
+    if args.output:
+        args.output.parent.mkdir(parents=True, exist_ok=True)
+        args.output.write_text(json.dumps(results, indent=2) + "\n")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
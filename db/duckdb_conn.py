@@ -0,0 +1,38 @@
+"""
+DuckDB Connection Helper for Local Warehouse Runs
+
+This module provides a single function to open the local DuckDB warehouse
+used when the pipeline runs without Snowflake credentials.
+
+Features:
+- Stores the warehouse in data/warehouse/ETL_TESTING.duckdb by default, so the
+  DuckDB database name matches the Snowflake database 'ETL_TESTING' used by dbt sources.
+- Path can be overridden with the DUCKDB_PATH environment variable.
+- Creates the parent directory on first use.
+
+Returns:
+    duckdb.DuckDBPyConnection: Open DuckDB connection.
+
+Date: 2026-02-05
+"""
+
+import duckdb
+import os
+from pathlib import Path
+
+DEFAULT_DUCKDB_PATH = Path("data") / "warehouse" / "ETL_TESTING.duckdb"
+
+
+def get_duckdb_connection(path=None):
+    """
+    Open (or create) the local DuckDB warehouse.
+
+    Args:
+        path: Database file; defaults to DUCKDB_PATH or data/warehouse/ETL_TESTING.duckdb.
+
+    Returns:
+        duckdb.DuckDBPyConnection: Open DuckDB connection.
+    """
+    path = Path(path or os.environ.get("DUCKDB_PATH", DEFAULT_DUCKDB_PATH))
+    path.parent.mkdir(parents=True, exist_ok=True)
+    return duckdb.connect(str(path))
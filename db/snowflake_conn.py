@@ -1,8 +1,9 @@
 """
 Snowflake Connection Helper for ETL Pipelines
 
-This module provides a single function to establish a Snowflake connection
-for ETL workflows, loading FAERS datasets, or running dbt transformations.
+This module provides a function to establish a Snowflake connection
+for ETL workflows, loading FAERS datasets, or running dbt transformations,
+and a small thread-safe pool that reuses those connections across loads.
 
 Features:
 - Pulls connection credentials from environment variables:
@@ -11,6 +12,8 @@ Features:
     - SNOW_ACCOUNT
     - SNOW_WAREHOUSE
 - Connects to database 'ETL_TESTING', schema 'FDA', with role 'ETL_PIPELINE'.
+- SnowflakeConnectionPool lazily opens up to `size` connections and hands
+  them out to concurrent loader threads.
 
 Returns:
     snowflake.connector.SnowflakeConnection: Active Snowflake connection object.
@@ -20,6 +23,9 @@ Date: 2026-02-05
 
 import snowflake.connector
 import os
+import queue
+import threading
+from contextlib import contextmanager
 
 def get_snowflake_connection():
     """
@@ -48,3 +54,70 @@ def get_snowflake_connection():
         schema="FDA",
         insecure_mode=True  # allows the connection to proceed even if the security check fails in Codespace
     )
+
+
+class SnowflakeConnectionPool:
+    """
+    Small thread-safe pool of reusable Snowflake connections.
+
+    Connections are opened lazily (at most `size`) and returned to the pool
+    after each use, so concurrent table loads share a bounded number of sessions.
+
+    Args:
+        size (int): Maximum number of open connections.
+        factory (callable): Zero-argument function returning a new connection.
+    """
+
+    def __init__(self, size: int = 4, factory=get_snowflake_connection):
+        self.size = size
+        self.factory = factory
+        self.opened = 0
+        self._idle = queue.LifoQueue()
+        self._slots = threading.BoundedSemaphore(size)
+        self._lock = threading.Lock()
+        self._all = []
+        self._closed = False
+
+    @contextmanager
+    def connection(self):
+        """
+        Borrow a connection, opening one if none is idle and the pool is not full.
+
+        Raises:
+            RuntimeError: The pool has been closed.
+        """
+        self._slots.acquire()
+        try:
+            if self._closed:
+                raise RuntimeError("Connection pool is closed")
+            try:
+                conn = self._idle.get_nowait()
+            except queue.Empty:
+                conn = self.factory()
+                with self._lock:
+                    self.opened += 1
+                    self._all.append(conn)
+        except Exception:
+            self._slots.release()
+            raise
+
+        try:
+            yield conn
+        finally:
+            if not self._closed:  # a connection returned after close() was already closed there
+                self._idle.put(conn)
+            self._slots.release()
+
+    def close(self):
+        """Close every connection opened by the pool and reject further borrowing."""
+        with self._lock:
+            self._closed = True
+            conns, self._all = self._all, []
+        # Drain the idle queue so no closed connection can be handed out again
+        while True:
+            try:
+                self._idle.get_nowait()
+            except queue.Empty:
+                break
+        for conn in conns:
+            conn.close()
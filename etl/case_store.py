@@ -0,0 +1,394 @@
+"""
+Memory-Mapped Columnar Case Store with a primaryid Index
+
+This module persists the merged FAERS tables as columnar files sorted by
+primaryid, so every DEMO/DRUG/REAC/OUTC/THER/INDI/RPSR row of a report can
+be fetched in milliseconds without grepping the merged CSVs or querying the
+warehouse.
+
+Features:
+- One directory per table under data/processed/case_store/<TABLE>/:
+  primaryid.bin (sorted int64 row keys), an offset index of distinct
+  primaryids (index_ids.bin / index_starts.bin), and per column a UTF-8
+  byte buffer plus row offsets (<col>.data / <col>.offsets), the same
+  variable-length layout as Arrow string arrays (int32 offsets, or int64
+  for columns over 2 GB).
+- Built in bounded memory: the CSV is streamed in chunks straight to the
+  column files; if the rows are not already in primaryid order they are
+  reordered in batches from the memory-mapped spill files.
+- Files are opened with numpy.memmap, so lookups touch only the pages of the
+  requested rows; whole tables are never loaded into RAM.
+- Batched lookups: thousands of primaryids (or caseids, resolved through a
+  DEMO caseid index) are matched with one np.searchsorted per table.
+- meta.json is written last, atomically, and records the source CSV's
+  size/mtime; it is the build's completion marker for the run state.
+
+Usage:
+    python -m etl.case_store 1001234561 1001234572
+    python -m etl.case_store --caseid 10012345 --tables DEMO,DRUG
+
+Date: 2026-02-05
+"""
+
+import argparse
+import json
+import logging
+import os
+import shutil
+import sys
+from pathlib import Path
+import numpy as np
+import pandas as pd
+from etl.instrumentation import stage
+from etl.run_state import fingerprint
+
+STORE_VERSION = 1
+CHUNK_SIZE = 500_000
+REORDER_BATCH = 1_000_000  # rows gathered per batch when reordering a spilled column
+TABLES = ["DEMO", "DRUG", "REAC", "OUTC", "THER", "INDI", "RPSR"]
+
+
+# ---------------- File Helpers ---------------- #
+def _column_file(table_dir: Path, column: str, kind: str) -> Path:
+    return table_dir / f"{column}.{kind}"
+
+
+def _memmap(path: Path, dtype) -> np.ndarray:
+    """Read-only memory map of a raw array file (numpy cannot map empty files)."""
+    if path.stat().st_size == 0:
+        return np.empty(0, dtype=dtype)
+    return np.memmap(path, dtype=dtype, mode="r").view(np.ndarray)  # plain view: no memmap overhead per slice
+
+
+def _encode(values) -> tuple:
+    """UTF-8 bytes of a chunk of strings and each value's byte length."""
+    joined = "".join(values)
+    if joined.isascii():
+        return joined.encode("ascii"), np.fromiter(map(len, values), dtype=np.int64, count=len(values))
+    encoded = [v.encode("utf-8") for v in values]
+    return b"".join(encoded), np.fromiter(map(len, encoded), dtype=np.int64, count=len(encoded))
+
+
+def _gather(data: np.ndarray, starts: np.ndarray, ends: np.ndarray) -> np.ndarray:
+    """Concatenate the byte ranges [starts, ends) of `data` in one vectorized gather."""
+    lengths = ends - starts
+    total = int(lengths.sum())
+    if total == 0:
+        return np.empty(0, dtype=np.uint8)
+    return data[np.arange(total, dtype=np.int64) + np.repeat(starts - _exclusive_cumsum(lengths), lengths)]
+
+
+def _exclusive_cumsum(lengths: np.ndarray) -> np.ndarray:
+    """Start position of each length in a concatenation: [0, l0, l0+l1, ...] without the total."""
+    out = np.zeros(len(lengths), dtype=np.int64)
+    np.cumsum(lengths[:-1], out=out[1:])
+    return out
+
+
+def _decode(buffer: bytes, offsets: np.ndarray) -> list:
+    """Split a byte buffer back into strings at the given (relative) offsets."""
+    if buffer.isascii():
+        text = buffer.decode("ascii")
+        return [text[a:b] for a, b in zip(offsets[:-1].tolist(), offsets[1:].tolist())]
+    return [buffer[a:b].decode("utf-8") for a, b in zip(offsets[:-1].tolist(), offsets[1:].tolist())]
+
+
+# ---------------- Build ---------------- #
+def build_table_store(csv_path: Path, table: str, store_dir: Path, chunksize: int = CHUNK_SIZE) -> dict:
+    """
+    Write one merged CSV as a primaryid-sorted columnar table.
+
+    Rows whose primaryid is not numeric (e.g. the 'Unknown' fill value) are
+    skipped, since they cannot be looked up.
+
+    Args:
+        csv_path (Path): Merged CSV (e.g. merged_drug.csv).
+        table (str): FAERS table name, e.g. 'DRUG'.
+        store_dir (Path): Case store root; the table goes to store_dir/<TABLE>.
+        chunksize (int): Rows read per chunk.
+
+    Returns:
+        dict: The table's meta.json contents (rows, columns, source fingerprint).
+    """
+    csv_path, table = Path(csv_path), table.upper()
+    table_dir = Path(store_dir) / table
+    build_dir = table_dir.with_name(f"{table}.building")
+    shutil.rmtree(build_dir, ignore_errors=True)
+    build_dir.mkdir(parents=True)
+
+    with stage("case_store", table=table) as st:
+        columns, key_parts, skipped = None, [], 0
+        files, positions = {}, {}
+        try:
+            for chunk in pd.read_csv(csv_path, dtype=str, chunksize=chunksize, keep_default_na=False):
+                ids = pd.to_numeric(chunk["primaryid"].str.strip(), errors="coerce")
+                valid = ids.notna().to_numpy()
+                if not valid.all():
+                    skipped += int((~valid).sum())
+                    chunk, ids = chunk[valid], ids[valid]
+                key_parts.append(ids.to_numpy(dtype=np.int64))
+
+                if columns is None:
+                    columns = list(chunk.columns)
+                    for col in columns:
+                        files[col] = (open(_column_file(build_dir, col, "data"), "wb"),
+                                      open(_column_file(build_dir, col, "offsets"), "wb"))
+                        files[col][1].write(np.zeros(1, dtype=np.int64).tobytes())
+                        positions[col] = 0
+                for col in columns:
+                    data, lengths = _encode(chunk[col].tolist())
+                    files[col][0].write(data)
+                    files[col][1].write((positions[col] + np.cumsum(lengths)).tobytes())
+                    positions[col] += len(data)
+                st.add(rows=len(chunk))
+        finally:
+            for data_f, offsets_f in files.values():
+                data_f.close()
+                offsets_f.close()
+
+        columns = columns or []
+        keys = np.concatenate(key_parts) if key_parts else np.empty(0, dtype=np.int64)
+        if len(keys) and np.any(keys[1:] < keys[:-1]):
+            order = np.argsort(keys, kind="stable")
+            keys = keys[order]
+            for col in columns:
+                _reorder_column(build_dir, col, order)
+        keys.tofile(build_dir / "primaryid.bin")
+
+        # Offset index: distinct primaryids and the first row of each (plus the end)
+        first = np.r_[True, keys[1:] != keys[:-1]] if len(keys) else np.empty(0, dtype=bool)
+        keys[first].tofile(build_dir / "index_ids.bin")
+        np.r_[np.flatnonzero(first), len(keys)].astype(np.int64).tofile(build_dir / "index_starts.bin")
+
+        if table == "DEMO" and "caseid" in columns:
+            _build_caseid_index(build_dir, keys)
+        offset_types = {col: _narrow_offsets(build_dir, col, positions[col]) for col in columns}
+
+        meta = {
+            "version": STORE_VERSION,
+            "table": table,
+            "rows": int(len(keys)),
+            "columns": columns,
+            "offset_types": offset_types,
+            "skipped_rows": skipped,
+            "source": fingerprint([csv_path])[str(csv_path)],
+        }
+        tmp = build_dir / "meta.json.tmp"
+        tmp.write_text(json.dumps(meta, indent=2))
+        os.replace(tmp, build_dir / "meta.json")
+
+        shutil.rmtree(table_dir, ignore_errors=True)
+        os.replace(build_dir, table_dir)
+        st.add(n_bytes=sum(f.stat().st_size for f in table_dir.iterdir()))
+
+    if skipped:
+        logging.warning(f"[case_store] {table}: skipped {skipped} rows without a numeric primaryid")
+    logging.info(f"[case_store] {table}: {meta['rows']:,} rows, {len(columns)} columns → {table_dir}")
+    return meta
+
+
+def _reorder_column(build_dir: Path, column: str, order: np.ndarray):
+    """Rewrite a spilled column in `order`, REORDER_BATCH rows at a time."""
+    data_path, offsets_path = _column_file(build_dir, column, "data"), _column_file(build_dir, column, "offsets")
+    data, offsets = _memmap(data_path, np.uint8), _memmap(offsets_path, np.int64)
+    sorted_data, sorted_offsets = data_path.with_suffix(".data.sorted"), offsets_path.with_suffix(".offsets.sorted")
+    position = 0
+    with open(sorted_data, "wb") as data_f, open(sorted_offsets, "wb") as offsets_f:
+        offsets_f.write(np.zeros(1, dtype=np.int64).tobytes())
+        for start in range(0, len(order), REORDER_BATCH):
+            rows = order[start:start + REORDER_BATCH]
+            starts, ends = offsets[rows], offsets[rows + 1]
+            data_f.write(_gather(data, starts, ends).tobytes())
+            offsets_f.write((position + np.cumsum(ends - starts)).astype(np.int64).tobytes())
+            position += int((ends - starts).sum())
+    del data, offsets
+    os.replace(sorted_data, data_path)
+    os.replace(sorted_offsets, offsets_path)
+
+
+def _narrow_offsets(build_dir: Path, column: str, total_bytes: int) -> str:
+    """Rewrite a column's int64 offsets as int32 when its data fits; returns the dtype name."""
+    if total_bytes >= 2 ** 31:
+        return "int64"
+    path = _column_file(build_dir, column, "offsets")
+    offsets = _memmap(path, np.int64)
+    narrow = path.with_suffix(".offsets.int32")
+    with open(narrow, "wb") as f:
+        for start in range(0, len(offsets), REORDER_BATCH):
+            f.write(offsets[start:start + REORDER_BATCH].astype(np.int32).tobytes())
+    del offsets
+    os.replace(narrow, path)
+    return "int32"
+
+
+def _build_caseid_index(build_dir: Path, keys: np.ndarray):
+    """DEMO only: sorted caseids with the primaryid of each row, for caseid lookups."""
+    data, offsets = _memmap(_column_file(build_dir, "caseid", "data"), np.uint8), \
+        _memmap(_column_file(build_dir, "caseid", "offsets"), np.int64)
+    caseids = pd.to_numeric(pd.Series(_decode(bytes(data), np.asarray(offsets))).str.strip(),
+                            errors="coerce")
+    valid = caseids.notna().to_numpy()
+    caseids, primaryids = caseids.to_numpy()[valid].astype(np.int64), keys[valid]
+    order = np.lexsort((primaryids, caseids))
+    caseids[order].tofile(build_dir / "caseid_keys.bin")
+    primaryids[order].tofile(build_dir / "caseid_primaryids.bin")
+
+
+def build_case_store(processed_dir: Path, store_dir: Path = None, tables=None,
+                     chunksize: int = CHUNK_SIZE) -> dict:
+    """
+    Build the case store for every merged CSV in `processed_dir`.
+
+    Args:
+        processed_dir (Path): Directory containing merged_<table>.csv files.
+        store_dir (Path): Store root, defaults to processed_dir / 'case_store'.
+        tables: Tables to build (default all present).
+        chunksize (int): Rows read per chunk.
+
+    Returns:
+        dict: table → meta.json contents.
+    """
+    processed_dir = Path(processed_dir)
+    store_dir = Path(store_dir or processed_dir / "case_store")
+    built = {}
+    for table in tables or TABLES:
+        csv_path = processed_dir / f"merged_{table.lower()}.csv"
+        if csv_path.exists():
+            built[table] = build_table_store(csv_path, table, store_dir, chunksize)
+        else:
+            logging.warning(f"[case_store] {csv_path.name} not found — {table} not stored")
+    return built
+
+
+# ---------------- Lookups ---------------- #
+class _TableStore:
+    """Memory-mapped arrays of one stored table, opened on first use."""
+
+    def __init__(self, table_dir: Path):
+        self.dir = table_dir
+        self.meta = json.loads((table_dir / "meta.json").read_text())
+        self.columns = self.meta["columns"]
+        self.index_ids = _memmap(table_dir / "index_ids.bin", np.int64)
+        self.index_starts = _memmap(table_dir / "index_starts.bin", np.int64)
+        self._data, self._offsets = {}, {}
+
+    def column(self, name: str) -> tuple:
+        if name not in self._data:
+            self._data[name] = _memmap(_column_file(self.dir, name, "data"), np.uint8)
+            dtype = self.meta["offset_types"][name]
+            self._offsets[name] = _memmap(_column_file(self.dir, name, "offsets"), np.dtype(dtype))
+        return self._data[name], self._offsets[name]
+
+    def rows_for(self, primaryids: np.ndarray) -> np.ndarray:
+        """Row numbers of all rows whose primaryid is in `primaryids`, in primaryid order."""
+        ids = np.unique(primaryids)
+        pos = np.searchsorted(self.index_ids, ids)
+        found = pos < len(self.index_ids)
+        found[found] = self.index_ids[pos[found]] == ids[found]
+        pos = pos[found]
+        starts, ends = self.index_starts[pos], self.index_starts[pos + 1]
+        lengths = ends - starts
+        if not lengths.sum():
+            return np.empty(0, dtype=np.int64)
+        return np.repeat(starts - _exclusive_cumsum(lengths), lengths) + np.arange(lengths.sum())
+
+    def frame(self, rows: np.ndarray, columns=None) -> pd.DataFrame:
+        """Decode the given rows into a DataFrame of strings."""
+        out = {}
+        for name in columns or self.columns:
+            data, offsets = self.column(name)
+            starts, ends = offsets[rows].astype(np.int64), offsets[rows + 1].astype(np.int64)
+            buffer = _gather(data, starts, ends).tobytes()
+            lengths = ends - starts
+            out[name] = _decode(buffer, np.append(_exclusive_cumsum(lengths), lengths.sum()))
+        return pd.DataFrame(out, columns=list(columns or self.columns))
+
+
+class CaseStore:
+    """
+    Read-only access to a built case store.
+
+    Example:
+        store = CaseStore("data/processed/case_store")
+        store.case(1001234561)["DRUG"]          # all DRUG rows of one report
+        store.lookup(ids, tables=["REAC"])      # batched, thousands of ids
+    """
+
+    def __init__(self, store_dir):
+        self.dir = Path(store_dir)
+        self.tables = {}
+        for table in TABLES:
+            if (self.dir / table / "meta.json").exists():
+                self.tables[table] = _TableStore(self.dir / table)
+        if not self.tables:
+            raise FileNotFoundError(f"No case store tables in {self.dir} (run the transform stage first)")
+
+    def _selected(self, tables) -> list:
+        selected = [t.upper() for t in tables] if tables else list(self.tables)
+        missing = [t for t in selected if t not in self.tables]
+        if missing:
+            raise KeyError(f"Tables not in the case store: {missing}")
+        return selected
+
+    def lookup(self, primaryids, tables=None, columns=None) -> dict:
+        """
+        All rows of the given reports.
+
+        Args:
+            primaryids: One primaryid or an iterable of them (int or numeric str).
+            tables: Tables to read (default all stored tables).
+            columns: Optional column subset, applied to every table that has the columns.
+
+        Returns:
+            dict: table → DataFrame of string columns, rows ordered by primaryid.
+        """
+        ids = np.atleast_1d(np.asarray(primaryids, dtype=np.int64))
+        result = {}
+        for table in self._selected(tables):
+            store = self.tables[table]
+            cols = [c for c in columns if c in store.columns] if columns else None
+            result[table] = store.frame(store.rows_for(ids), cols)
+        return result
+
+    def case(self, primaryid, tables=None) -> dict:
+        """All rows of one report (see lookup)."""
+        return self.lookup([primaryid], tables)
+
+    def primaryids_for_cases(self, caseids) -> np.ndarray:
+        """Every primaryid (all versions) of the given caseids, from the DEMO caseid index."""
+        if "DEMO" not in self.tables:
+            raise KeyError("caseid lookups need the DEMO table in the case store")
+        keys = _memmap(self.dir / "DEMO" / "caseid_keys.bin", np.int64)
+        primaryids = _memmap(self.dir / "DEMO" / "caseid_primaryids.bin", np.int64)
+        caseids = np.unique(np.atleast_1d(np.asarray(caseids, dtype=np.int64)))
+        starts, ends = np.searchsorted(keys, caseids, "left"), np.searchsorted(keys, caseids, "right")
+        if not (ends - starts).sum():
+            return np.empty(0, dtype=np.int64)
+        return np.concatenate([primaryids[s:e] for s, e in zip(starts, ends)])
+
+    def lookup_cases(self, caseids, tables=None, columns=None) -> dict:
+        """All rows of every version of the given caseids (see lookup)."""
+        return self.lookup(self.primaryids_for_cases(caseids), tables, columns)
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m etl.case_store",
+                                     description="Print every stored row of FAERS reports")
+    parser.add_argument("ids", nargs="+", type=int, help="primaryids (or caseids with --caseid)")
+    parser.add_argument("--caseid", action="store_true", help="treat ids as caseids (all versions)")
+    parser.add_argument("--tables", type=lambda v: [t for t in v.split(",") if t], default=None)
+    parser.add_argument("--store-dir", type=Path, default=Path.cwd() / "data" / "processed" / "case_store")
+    args = parser.parse_args(argv)
+
+    store = CaseStore(args.store_dir)
+    rows = store.lookup_cases(args.ids, args.tables) if args.caseid else store.lookup(args.ids, args.tables)
+    with pd.option_context("display.max_columns", None, "display.width", 200):
+        for table, df in rows.items():
+            print(f"\n== {table} ({len(df)} rows)")
+            if len(df):
+                print(df.to_string(index=False))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
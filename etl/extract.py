@@ -10,16 +10,21 @@ Features:
 - Skips files that already exist to avoid redundant downloads.
 - Retries network requests up to 3 times on failure.
 - Logs progress and warnings for easy debugging.
+- Records download time and bytes per quarter in the run report.
+- Can extract from local FAERS ZIPs instead of downloading (benchmarks, offline runs).
+- No work at import time: `requests` is imported by the download itself and
+  directories are created only when files are written.
 
 Date: 2026-02-05
 """
 
 import logging
 from pathlib import Path
-import requests
 import zipfile
 import io
+import shutil
 import time
+from etl.instrumentation import stage
 
 # ---------------- Logging Configuration ----------------
 logging.basicConfig(level=logging.INFO, format="%(message)s")
@@ -27,7 +32,6 @@ logging.basicConfig(level=logging.INFO, format="%(message)s")
 # ---------------- Directory Setup ----------------
 BASE_DIR = Path.cwd()  # Repository root
 RAW_DIR = BASE_DIR / "data" / "raw"
-RAW_DIR.mkdir(parents=True, exist_ok=True)
 
 # ---------------- FAERS ZIP URLs ----------------
 FAERS_URLS = {
@@ -40,7 +44,36 @@ FAERS_TABLES = ["DEMO25Q", "DRUG25Q", "REAC25Q",
                 "OUTC25Q", "RPSR25Q", "INDI25Q", "THER25Q"]
 
 
-def download_faers_data(raw_dir: Path):
+def extract_faers_zip(zip_source, raw_dir: Path) -> list:
+    """
+    Extract the FAERS tables listed in FAERS_TABLES from one quarterly ZIP.
+
+    Args:
+        zip_source: Path or binary file-like object of a FAERS ASCII ZIP.
+        raw_dir (Path): Directory where the .txt files are written.
+
+    Returns:
+        list[Path]: Paths of extracted or already existing FAERS .txt files.
+    """
+    extracted = []
+    with zipfile.ZipFile(zip_source) as z:
+        logging.info(f"ZIP contents: {z.namelist()}")
+        for f in z.namelist():
+            fname = f.split("/")[-1]
+            # Only extract relevant FAERS tables
+            if fname.endswith(".txt") and any(fname.startswith(t) for t in FAERS_TABLES):
+                out_path = raw_dir / fname
+                if not out_path.exists():
+                    with z.open(f) as src, open(out_path, "wb") as out:
+                        shutil.copyfileobj(src, out, length=1024 * 1024)
+                    logging.info(f"Downloaded '{fname}'")
+                else:
+                    logging.info(f"File '{fname}' already exists. Skipping.")
+                extracted.append(out_path)
+    return extracted
+
+
+def download_faers_data(raw_dir: Path, zip_dir: Path = None):
     """
     Download and extract FAERS ZIP files for 2025 Q1 and Q2.
 
@@ -53,6 +86,8 @@ def download_faers_data(raw_dir: Path):
 
     Args:
         raw_dir (Path): Directory where raw FAERS .txt files will be saved.
+        zip_dir (Path): Optional directory of local FAERS_ASCII_*.zip files to
+            extract instead of downloading.
 
     Returns:
         list[Path]: Paths of downloaded or existing FAERS .txt files.
@@ -70,44 +105,81 @@ def download_faers_data(raw_dir: Path):
 
     downloaded_files = []
 
+    # ---------------- Local ZIPs (no network) ----------------
+    if zip_dir is not None:
+        for zip_path in sorted(Path(zip_dir).glob("FAERS_ASCII_*.zip")):
+            with stage("extract", table=zip_path.stem) as st:
+                st.add(n_bytes=zip_path.stat().st_size)
+                downloaded_files.extend(extract_faers_zip(zip_path, raw_dir))
+        return downloaded_files
+
     # ---------------- Loop Over Quarters ----------------
-    for quarter, url in FAERS_URLS.items():
-        logging.info(f"Downloading {quarter} ...")
-
-        for attempt in range(3):
-            try:
-                # Stream download to handle large files
-                with requests.get(url, stream=True, timeout=120, verify=False) as r:
-                    r.raise_for_status()
-                    buffer = io.BytesIO()
-                    for chunk in r.iter_content(chunk_size=8192):
-                        buffer.write(chunk)
-                    buffer.seek(0)
-
-                    # Extract ZIP in memory
-                    with zipfile.ZipFile(buffer) as z:
-                        logging.info(f"ZIP contents: {z.namelist()}")
-                        for f in z.namelist():
-                            fname = f.split("/")[-1]
-                            # Only extract relevant FAERS tables
-                            if fname.endswith(".txt") and any(fname.startswith(t) for t in FAERS_TABLES):
-                                out_path = raw_dir / fname
-                                if not out_path.exists():
-                                    with z.open(f) as src, open(out_path, "wb") as out:
-                                        out.write(src.read())
-                                    logging.info(f"Downloaded '{fname}'")
-                                else:
-                                    logging.info(f"File '{fname}' already exists. Skipping.")
-                                downloaded_files.append(out_path)
-                break  # Success, exit retry loop
-
-            except requests.exceptions.RequestException as e:
-                logging.warning(f"Attempt {attempt+1} failed: {e}")
-                if attempt < 2:
-                    logging.info("Retrying in 5 seconds...")
-                    time.sleep(5)
-                else:
-                    logging.error(f"Failed to download {quarter} after 3 attempts")
-                    raise
+    for quarter in FAERS_URLS:
+        downloaded_files.extend(download_quarter(quarter, raw_dir))
 
     return downloaded_files
+
+
+def quarter_files(quarter: str, raw_dir: Path) -> list:
+    """Expected TXT paths for one quarter, e.g. Q1_2025 → DEMO25Q1.txt, DRUG25Q1.txt, ..."""
+    return [raw_dir / f"{t}{quarter[1]}.txt" for t in FAERS_TABLES]
+
+
+def download_quarter(quarter: str, raw_dir: Path, zip_dir: Path = None) -> list:
+    """
+    Download (or extract from a local ZIP) and unpack one FAERS quarter.
+
+    Skips the quarter if all of its tables already exist in `raw_dir`, so it
+    can run as an independent task in the pipeline DAG.
+
+    Args:
+        quarter (str): Key of FAERS_URLS, e.g. 'Q1_2025'.
+        raw_dir (Path): Directory where raw FAERS .txt files will be saved.
+        zip_dir (Path): Optional directory holding the quarter's FAERS_ASCII_*.zip.
+
+    Returns:
+        list[Path]: Paths of downloaded or existing FAERS .txt files.
+
+    Raises:
+        requests.exceptions.RequestException: If all retries fail.
+    """
+    raw_dir.mkdir(parents=True, exist_ok=True)
+    url = FAERS_URLS[quarter]
+
+    expected = quarter_files(quarter, raw_dir)
+    if all(p.exists() for p in expected):
+        logging.info(f"All {quarter} FAERS TXT files already exist — skipping download")
+        return expected
+
+    import requests
+
+    if zip_dir is not None:
+        zip_path = Path(zip_dir) / url.rsplit("/", 1)[-1]
+        with stage("extract", table=quarter) as st:
+            st.add(n_bytes=zip_path.stat().st_size)
+            return extract_faers_zip(zip_path, raw_dir)
+
+    logging.info(f"Downloading {quarter} ...")
+    for attempt in range(3):
+        try:
+            # Stream download to handle large files
+            with stage("extract", table=quarter) as st, \
+                    requests.get(url, stream=True, timeout=120, verify=False) as r:
+                r.raise_for_status()
+                buffer = io.BytesIO()
+                for chunk in r.iter_content(chunk_size=8192):
+                    buffer.write(chunk)
+                st.add(n_bytes=buffer.tell())
+                buffer.seek(0)
+
+                # Extract ZIP in memory
+                return extract_faers_zip(buffer, raw_dir)
+
+        except requests.exceptions.RequestException as e:
+            logging.warning(f"Attempt {attempt+1} failed: {e}")
+            if attempt < 2:
+                logging.info("Retrying in 5 seconds...")
+                time.sleep(5)
+            else:
+                logging.error(f"Failed to download {quarter} after 3 attempts")
+                raise
@@ -0,0 +1,194 @@
+"""
+Incremental MERGE-Based Loading Keyed by primaryid
+
+This script loads only new or changed source partitions of a processed FAERS
+CSV into Snowflake instead of dropping and reloading the whole table.
+
+Features:
+- Partitions rows by `source_quarter` and fingerprints each partition with a
+  content hash (load_ts excluded, so re-running a transform is a no-op).
+- Compares hashes with a LOAD_WATERMARK table to find new/changed/removed partitions.
+- Writes only changed partitions into a transient staging table.
+- MERGEs staging into the target on every non-audit column (null-safe, since
+  THER dates and durations are often blank), so rows that share a key but
+  differ elsewhere are all kept, as in a full refresh. Exact copies collapse
+  to one row and are counted in the log. Rows that disappeared from a changed
+  partition are deleted, and the watermarks are updated.
+- Full refresh (drop and recreate via load_csv_to_snowflake) remains available.
+
+Date: 2026-02-05
+"""
+
+import hashlib
+import logging
+import pandas as pd
+from snowflake.connector.pandas_tools import write_pandas
+from etl.load import load_csv_to_snowflake
+from etl.schema import resolve_schema, columns_ddl, coerce_to_schema
+
+PARTITION_COLUMN = "source_quarter"
+WATERMARK_TABLE = "LOAD_WATERMARK"
+HASH_EXCLUDE = {"load_ts"}  # audit columns: ignored by partition hashes and MERGE keys
+CHUNK_SIZE = 100_000
+
+
+def _quote(value) -> str:
+    """Render a SQL string literal."""
+    return "'" + str(value).replace("'", "''") + "'"
+
+
+def partition_hashes(csv_path, chunksize: int = CHUNK_SIZE) -> dict:
+    """
+    Fingerprint each source partition of a processed CSV in one streaming pass.
+
+    Args:
+        csv_path: Path to the processed CSV.
+        chunksize (int): Rows read per chunk.
+
+    Returns:
+        dict: partition → {"hash": hex digest, "rows": row count}.
+    """
+    hashers, rows = {}, {}
+    for chunk in pd.read_csv(csv_path, dtype=str, chunksize=chunksize, keep_default_na=False):
+        content = chunk.drop(columns=[c for c in chunk.columns if c in HASH_EXCLUDE])
+        row_hashes = pd.util.hash_pandas_object(content, index=False).to_numpy()
+        keys = chunk[PARTITION_COLUMN] if PARTITION_COLUMN in chunk.columns else pd.Series("ALL", index=chunk.index)
+        for part, positions in keys.groupby(keys, sort=False).indices.items():
+            hashers.setdefault(part, hashlib.blake2b(digest_size=16)).update(row_hashes[positions].tobytes())
+            rows[part] = rows.get(part, 0) + len(positions)
+    return {part: {"hash": h.hexdigest(), "rows": rows[part]} for part, h in hashers.items()}
+
+
+def _read_watermarks(cs, schema: str, table: str) -> dict:
+    cs.execute(f"SELECT PARTITION_KEY, CONTENT_HASH FROM {schema}.{WATERMARK_TABLE} "
+               f"WHERE TABLE_NAME = {_quote(table)}")
+    return {part: content_hash for part, content_hash in cs.fetchall()}
+
+
+def _write_watermarks(cs, schema: str, table: str, hashes: dict, partitions):
+    """Replace watermark rows for `partitions` with their new hashes."""
+    if not partitions:
+        return
+    in_list = ", ".join(_quote(p) for p in partitions)
+    cs.execute(f"DELETE FROM {schema}.{WATERMARK_TABLE} "
+               f"WHERE TABLE_NAME = {_quote(table)} AND PARTITION_KEY IN ({in_list})")
+    values = ", ".join(
+        f"({_quote(table)}, {_quote(p)}, {_quote(hashes[p]['hash'])}, {hashes[p]['rows']}, CURRENT_TIMESTAMP)"
+        for p in partitions if p in hashes
+    )
+    if values:
+        cs.execute(f"INSERT INTO {schema}.{WATERMARK_TABLE} "
+                   f"(TABLE_NAME, PARTITION_KEY, CONTENT_HASH, ROW_COUNT, LOADED_AT) VALUES {values}")
+
+
+def load_csv_incremental(csv_path, table: str, conn, table_schema: dict = None,
+                         full_refresh: bool = False, chunksize: int = CHUNK_SIZE) -> dict:
+    """
+    Load only new or changed partitions of a processed CSV and MERGE them into the target.
+
+    Args:
+        csv_path: Path to the processed CSV.
+        table (str): Target table name (e.g. DRUG).
+        conn: Active Snowflake (or compatible) connection.
+        table_schema (dict): Column → type mapping; resolved via etl.schema if None.
+        full_refresh (bool): Drop and reload the whole table, then reset watermarks.
+        chunksize (int): Rows read per chunk.
+
+    Returns:
+        dict: mode, partitions_loaded, partitions_removed, rows_staged and
+        rows_deduplicated (exact copies collapsed by the MERGE).
+    """
+    db, schema = conn.database, conn.schema
+    table = table.upper()
+    table_schema = table_schema or resolve_schema(csv_path, table)
+    keys = [c for c in table_schema if c.lower() not in HASH_EXCLUDE]
+    hashes = partition_hashes(csv_path, chunksize)
+
+    cs = conn.cursor()
+    try:
+        cs.execute(f"CREATE SCHEMA IF NOT EXISTS {db}.{schema}")
+        cs.execute(f"CREATE TABLE IF NOT EXISTS {schema}.{WATERMARK_TABLE} ("
+                   f"TABLE_NAME VARCHAR, PARTITION_KEY VARCHAR, CONTENT_HASH VARCHAR, "
+                   f"ROW_COUNT BIGINT, LOADED_AT TIMESTAMP)")
+
+        # ---------------- Full refresh ---------------- #
+        if full_refresh:
+            rows = load_csv_to_snowflake(csv_path, table, conn, table_schema=table_schema)
+            cs.execute(f"DELETE FROM {schema}.{WATERMARK_TABLE} WHERE TABLE_NAME = {_quote(table)}")
+            _write_watermarks(cs, schema, table, hashes, list(hashes))
+            return {"mode": "full", "partitions_loaded": sorted(hashes),
+                    "partitions_removed": [], "rows_staged": rows, "rows_deduplicated": 0}
+
+        # ---------------- Detect changed partitions ---------------- #
+        cs.execute(f"CREATE TABLE IF NOT EXISTS {schema}.{table} ({columns_ddl(table_schema)})")
+        previous = _read_watermarks(cs, schema, table)
+        changed = sorted(p for p, h in hashes.items() if previous.get(p) != h["hash"])
+        removed = sorted(p for p in previous if p not in hashes)
+        result = {"mode": "incremental", "partitions_loaded": changed,
+                  "partitions_removed": removed, "rows_staged": 0, "rows_deduplicated": 0}
+
+        if removed:
+            in_list = ", ".join(_quote(p) for p in removed)
+            cs.execute(f"DELETE FROM {schema}.{table} WHERE {PARTITION_COLUMN.upper()} IN ({in_list})")
+            cs.execute(f"DELETE FROM {schema}.{WATERMARK_TABLE} "
+                       f"WHERE TABLE_NAME = {_quote(table)} AND PARTITION_KEY IN ({in_list})")
+
+        if not changed:
+            logging.info(f"{table}: no new or changed partitions — nothing to load")
+            return result
+        logging.info(f"{table}: loading changed partitions {changed}")
+
+        # ---------------- Stage changed partitions ---------------- #
+        stage = f"{table}_STAGE"
+        cs.execute(f"CREATE OR REPLACE TRANSIENT TABLE {schema}.{stage} ({columns_ddl(table_schema)})")
+        for df in pd.read_csv(csv_path, chunksize=chunksize, dtype=str, low_memory=False):
+            if PARTITION_COLUMN in df.columns:
+                df = df[df[PARTITION_COLUMN].isin(changed)]
+            if df.empty:
+                continue
+            df = coerce_to_schema(df, table_schema)
+            df.columns = [col.upper() for col in df.columns]
+            success, _, nrows, _ = write_pandas(conn=conn, df=df, table_name=stage, database=db,
+                                                schema=schema, auto_create_table=False,
+                                                overwrite=False, use_logical_type=True)
+            if not success:
+                raise RuntimeError(f"Failed to stage {table} chunk")
+            result["rows_staged"] += nrows
+
+        # ---------------- MERGE into target ---------------- #
+        cols = [c.upper() for c in table_schema]
+        key_cols = [k.upper() for k in keys]
+        on_sql = " AND ".join(f"t.{k} IS NOT DISTINCT FROM s.{k}" for k in key_cols)
+        order_col = "LOAD_TS" if "LOAD_TS" in cols else key_cols[0]
+        row_number = f"ROW_NUMBER() OVER (PARTITION BY {', '.join(key_cols)} ORDER BY {order_col} DESC)"
+        in_list = ", ".join(_quote(p) for p in changed)
+
+        if PARTITION_COLUMN.upper() in cols:
+            # Rows dropped from a changed partition are deleted from the target
+            cs.execute(
+                f"DELETE FROM {schema}.{table} AS t WHERE t.{PARTITION_COLUMN.upper()} IN ({in_list}) "
+                f"AND NOT EXISTS (SELECT 1 FROM {schema}.{stage} s WHERE {on_sql})"
+            )
+
+        # A target row may match only one source row, so exact copies are merged once
+        cs.execute(f"SELECT COUNT(*) FROM (SELECT 1 FROM {schema}.{stage} QUALIFY {row_number} > 1)")
+        result["rows_deduplicated"] = cs.fetchall()[0][0]
+        if result["rows_deduplicated"]:
+            logging.warning(f"{table}: {result['rows_deduplicated']} exact duplicate rows collapsed by the MERGE")
+
+        update_sql = ", ".join(f"{c} = s.{c}" for c in cols if c not in key_cols)
+        cs.execute(
+            f"MERGE INTO {schema}.{table} t "
+            f"USING (SELECT * FROM {schema}.{stage} "
+            f"QUALIFY {row_number} = 1) s "
+            f"ON {on_sql} "
+            + (f"WHEN MATCHED THEN UPDATE SET {update_sql} " if update_sql else "")
+            + f"WHEN NOT MATCHED THEN INSERT ({', '.join(cols)}) VALUES ({', '.join('s.' + c for c in cols)})"
+        )
+        cs.execute(f"DROP TABLE IF EXISTS {schema}.{stage}")
+
+        _write_watermarks(cs, schema, table, hashes, changed)
+        logging.info(f"{table}: merged {result['rows_staged']} staged rows from {len(changed)} partitions")
+        return result
+    finally:
+        cs.close()
@@ -0,0 +1,283 @@
+"""
+Per-Stage Pipeline Instrumentation and Run Report
+
+This module times pipeline stages and writes a machine-readable run report
+so runs can be archived by CI and compared against previous runs.
+
+Features:
+- stage(name, table=None) context manager recording wall time, CPU time
+  (including child processes such as dbt), rows, bytes and throughput.
+- Per-stage peak RSS sampled by a background thread while any stage is open,
+  plus the process-wide high-water mark from `resource`.
+- Stages nest and may run concurrently (per-table loads); CPU time is
+  process-wide, so concurrent stages share it.
+- write_report() dumps all stages, per-stage totals and extra sections
+  (e.g. dbt model timings) to JSON; compare_reports() diffs two reports.
+
+Date: 2026-02-05
+"""
+
+import json
+import logging
+import os
+import platform
+import sys
+import threading
+import time
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from pathlib import Path
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+RSS_SAMPLE_INTERVAL = 0.1  # seconds between RSS samples while a stage is open
+_PAGE_SIZE = os.sysconf("SC_PAGE_SIZE") if hasattr(os, "sysconf") else 4096
+
+
+# ---------------- Memory Probes ----------------
+
+def peak_rss_bytes() -> int:
+    """Process-wide peak resident set size so far (0 if unavailable)."""
+    if resource is None:
+        return 0
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak if sys.platform == "darwin" else peak * 1024  # macOS reports bytes, Linux KB
+
+
+def current_rss_bytes() -> int:
+    """Current resident set size, falling back to the peak where /proc is unavailable."""
+    try:
+        with open("/proc/self/statm", "r") as f:
+            return int(f.read().split()[1]) * _PAGE_SIZE
+    except (OSError, ValueError, IndexError):
+        return peak_rss_bytes()
+
+
+def _children_cpu_seconds() -> float:
+    """CPU time of reaped child processes (dbt, etc.)."""
+    if resource is None:
+        return 0.0
+    usage = resource.getrusage(resource.RUSAGE_CHILDREN)
+    return usage.ru_utime + usage.ru_stime
+
+
+def _mb(n_bytes: int) -> float:
+    return round(n_bytes / 1e6, 1)
+
+
+# ---------------- Stage Metrics ----------------
+
+class Stage:
+    """Counters for one timed stage; yielded by RunRecorder.stage()."""
+
+    def __init__(self, name: str, table: str = None):
+        self.name = name
+        self.table = table
+        self.rows = 0
+        self.bytes = 0
+        self.details = {}
+        self.status = "running"
+        self.started_at = datetime.now(timezone.utc).isoformat(timespec="seconds")
+        self.rss_start = current_rss_bytes()
+        self.peak_rss = self.rss_start
+        self._wall_start = time.perf_counter()
+        self._cpu_start = time.process_time() + _children_cpu_seconds()
+        self.wall_seconds = 0.0
+        self.cpu_seconds = 0.0
+
+    def add(self, rows: int = 0, n_bytes: int = 0):
+        """Count rows and bytes processed by this stage."""
+        self.rows += int(rows)
+        self.bytes += int(n_bytes)
+
+    def sample(self, rss: int):
+        self.peak_rss = max(self.peak_rss, rss)
+
+    def finish(self, status: str):
+        self.wall_seconds = time.perf_counter() - self._wall_start
+        self.cpu_seconds = time.process_time() + _children_cpu_seconds() - self._cpu_start
+        self.sample(current_rss_bytes())
+        self.status = status
+
+    def to_dict(self) -> dict:
+        wall = self.wall_seconds
+        return {
+            "stage": self.name,
+            "table": self.table,
+            "status": self.status,
+            "started_at": self.started_at,
+            "wall_seconds": round(wall, 3),
+            "cpu_seconds": round(self.cpu_seconds, 3),
+            "rows": self.rows,
+            "bytes": self.bytes,
+            "rows_per_sec": round(self.rows / wall, 1) if wall else 0.0,
+            "mb_per_sec": round(self.bytes / 1e6 / wall, 2) if wall else 0.0,
+            "rss_start_mb": _mb(self.rss_start),
+            "peak_rss_mb": _mb(self.peak_rss),
+            **({"details": self.details} if self.details else {}),
+        }
+
+
+class RunRecorder:
+    """Collects Stage records for one pipeline run."""
+
+    def __init__(self, sample_interval: float = RSS_SAMPLE_INTERVAL):
+        self.sample_interval = sample_interval
+        self.started_at = datetime.now(timezone.utc).isoformat(timespec="seconds")
+        self.stages = []
+        self.extra = {}
+        self._open = set()
+        self._lock = threading.Lock()
+        self._sampler = None
+        self._wall_start = time.perf_counter()
+        self._cpu_start = time.process_time() + _children_cpu_seconds()
+
+    # ---------------- RSS sampler ---------------- #
+    def _sample_loop(self):
+        while True:
+            with self._lock:
+                if not self._open:
+                    self._sampler = None
+                    return
+                open_stages = list(self._open)
+            rss = current_rss_bytes()
+            for st in open_stages:
+                st.sample(rss)
+            time.sleep(self.sample_interval)
+
+    @contextmanager
+    def stage(self, name: str, table: str = None):
+        """
+        Time a block of work and record it as a stage.
+
+        Args:
+            name (str): Stage name (extract, transform, validate, load, dbt, ...).
+            table (str): Optional FAERS table for per-table stages.
+
+        Yields:
+            Stage: Call `.add(rows=..., n_bytes=...)` to count processed data.
+        """
+        st = Stage(name, table)
+        with self._lock:
+            self._open.add(st)
+            if self._sampler is None and self.sample_interval:
+                self._sampler = threading.Thread(target=self._sample_loop, daemon=True,
+                                                 name="rss-sampler")
+                self._sampler.start()
+        try:
+            yield st
+            st.finish("ok")
+        except BaseException:
+            st.finish("error")
+            raise
+        finally:
+            with self._lock:
+                self._open.discard(st)
+                self.stages.append(st)
+            label = f"{name}[{table}]" if table else name
+            logging.info(f"[timing] {label}: {st.wall_seconds:.1f}s wall, {st.cpu_seconds:.1f}s cpu, "
+                         f"{st.rows} rows, peak RSS {_mb(st.peak_rss)} MB ({st.status})")
+
+    def report(self) -> dict:
+        """Build the run report: run metadata, every stage and per-stage totals."""
+        with self._lock:
+            stages = [st.to_dict() for st in self.stages]
+
+        totals = {}
+        for st in stages:
+            if st["table"] is None:
+                continue
+            t = totals.setdefault(st["stage"], {"tables": 0, "rows": 0, "bytes": 0,
+                                                "table_seconds": 0.0, "peak_rss_mb": 0.0})
+            t["tables"] += 1
+            t["rows"] += st["rows"]
+            t["bytes"] += st["bytes"]
+            t["table_seconds"] = round(t["table_seconds"] + st["wall_seconds"], 3)
+            t["peak_rss_mb"] = max(t["peak_rss_mb"], st["peak_rss_mb"])
+
+        return {
+            "started_at": self.started_at,
+            "finished_at": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+            "wall_seconds": round(time.perf_counter() - self._wall_start, 3),
+            "cpu_seconds": round(time.process_time() + _children_cpu_seconds() - self._cpu_start, 3),
+            "peak_rss_mb": _mb(peak_rss_bytes()),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "cpu_count": os.cpu_count(),
+            "success": all(st["status"] == "ok" for st in stages),
+            "stages": stages,
+            "table_totals": totals,
+            **self.extra,
+        }
+
+    def write_report(self, path) -> dict:
+        """Write the run report as JSON and return it."""
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        report = self.report()
+        with open(path, "w") as f:
+            json.dump(report, f, indent=2)
+        logging.info(f"Run report written to {path} ({len(report['stages'])} stages, "
+                     f"{report['wall_seconds']:.1f}s, peak RSS {report['peak_rss_mb']} MB)")
+        return report
+
+
+# ---------------- Default Recorder ----------------
+_recorder = RunRecorder()
+
+
+def get_recorder() -> RunRecorder:
+    """The recorder used by stage() across the pipeline modules."""
+    return _recorder
+
+
+def reset_recorder(sample_interval: float = RSS_SAMPLE_INTERVAL) -> RunRecorder:
+    """Start a fresh run (e.g. at the beginning of run_etl or in tests)."""
+    global _recorder
+    _recorder = RunRecorder(sample_interval)
+    return _recorder
+
+
+def stage(name: str, table: str = None):
+    """Record a stage on the default recorder; see RunRecorder.stage."""
+    return _recorder.stage(name, table)
+
+
+def compare_reports(previous: dict, current: dict, threshold: float = 0.2) -> list:
+    """
+    Compare stage wall times and peak RSS between two run reports.
+
+    Args:
+        previous (dict): Baseline run report (e.g. the last archived CI run).
+        current (dict): Report for this run.
+        threshold (float): Relative wall-time increase flagged as a regression.
+
+    Returns:
+        list[dict]: stage, table, previous/current seconds and RSS, change and
+        a `regression` flag, for stages present in both reports.
+    """
+    def keyed(report):
+        return {(st["stage"], st["table"]): st for st in report.get("stages", [])}
+
+    before, after = keyed(previous), keyed(current)
+    rows = []
+    for key, cur in after.items():
+        prev = before.get(key)
+        if prev is None:
+            continue
+        change = (cur["wall_seconds"] - prev["wall_seconds"]) / prev["wall_seconds"] \
+            if prev["wall_seconds"] else 0.0
+        rows.append({
+            "stage": key[0],
+            "table": key[1],
+            "previous_seconds": prev["wall_seconds"],
+            "current_seconds": cur["wall_seconds"],
+            "change": round(change, 3),
+            "previous_peak_rss_mb": prev["peak_rss_mb"],
+            "current_peak_rss_mb": cur["peak_rss_mb"],
+            "regression": change > threshold,
+        })
+    return rows
@@ -2,74 +2,450 @@
 Load Large CSV into Snowflake with Chunked Memory-Efficient Inserts
 
 This script loads a large CSV into a Snowflake table using chunking
-and the Snowflake `write_pandas` utility.
+and the Snowflake `write_pandas` utility, or alternatively through
+compressed staged files and a single COPY INTO.
 
 Features:
 - Drops and recreates the target table on the first chunk.
 - Appends subsequent chunks to avoid memory issues.
+- Parses the next chunks in a background thread while the current one uploads,
+  with a bounded queue capping in-flight chunks, and reports per-stage utilization.
 - Uses write_pandas for efficient bulk insert.
-- Logs progress per chunk and total rows loaded.
+- Logs progress per chunk against the cached source row count.
 - Column names are uppercased for Snowflake conventions.
+- Creates typed columns (NUMBER, FLOAT, DATE, TIMESTAMP_NTZ, VARCHAR(n)) from a
+  declared or inferred schema and coerces each chunk to match.
+- Staged path: splits the CSV into gzip/zstd parts, PUTs them to the table
+  stage in parallel threads and loads them with one COPY INTO per table
+  (ON_ERROR=SKIP_FILE), returning per-file load results; failed parts are
+  logged and raised together as a CopyLoadError that carries every file's result.
+- Loads several tables concurrently over a connection pool, largest first,
+  and reports rows/sec per table (also recorded as per-table run report stages).
 
 Date: 2026-02-05
 """
 
 import pandas as pd
 import logging
+import gzip
+import tempfile
+import time
+import queue
+import threading
+from pathlib import Path
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from snowflake.connector.pandas_tools import write_pandas
+from etl.row_count import count_rows
+from etl.schema import resolve_schema, columns_ddl, coerce_to_schema
+from etl.instrumentation import stage
 
 
-def load_csv_to_snowflake(csv_path, table: str, conn):
+def _recreate_table(conn, table: str, table_schema: dict):
+    """Create the schema if needed and drop/recreate the target table with typed columns."""
+    db = conn.database
+    schema = conn.schema
+    cs = conn.cursor()
+
+    # Initialize schema and recreate target table structure
+    cs.execute(f"CREATE SCHEMA IF NOT EXISTS {db}.{schema}")
+    cs.execute(f"DROP TABLE IF EXISTS {schema}.{table}")
+
+    cs.execute(f"CREATE TABLE {schema}.{table} ({columns_ddl(table_schema)})")
+    cs.close()
+
+
+class CopyLoadError(RuntimeError):
+    """COPY INTO skipped one or more staged parts; `results` holds every part's outcome."""
+
+    def __init__(self, table: str, results: list):
+        failed = [r for r in results if r["status"] != "LOADED"]
+        super().__init__(f"COPY INTO {table}: {len(failed)} of {len(results)} files not loaded "
+                         f"(first error: {failed[0]['first_error']})")
+        self.table = table
+        self.results = results
+
+
+class _ProducerError:
+    """Carries an exception from the parse thread to the upload loop."""
+
+    def __init__(self, exc: BaseException):
+        self.exc = exc
+
+
+_DONE = object()  # end-of-stream marker on the chunk queue
+
+
+def _parse_chunks(csv_path, table_schema: dict, chunk_size: int, chunks: queue.Queue,
+                  stop: threading.Event, timings: dict):
+    """
+    Producer: parse and normalize CSV chunks ahead of the uploader.
+
+    Blocks on the bounded queue when the uploader falls behind, so at most
+    `maxsize` parsed chunks are held in memory.
+    """
+    def put(item) -> bool:
+        start = time.perf_counter()
+        while not stop.is_set():
+            try:
+                chunks.put(item, timeout=0.1)
+                timings["parse_blocked"] += time.perf_counter() - start
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    try:
+        df_iterator = pd.read_csv(csv_path, chunksize=chunk_size, dtype=str, low_memory=False)
+        while True:
+            start = time.perf_counter()
+            df = next(df_iterator, None)
+            if df is None:
+                break
+            df = coerce_to_schema(df, table_schema)
+            df.columns = [col.upper() for col in df.columns]
+            timings["parse"] += time.perf_counter() - start
+            if not put(df):
+                return
+        put(_DONE)
+    except BaseException as e:
+        put(_ProducerError(e))
+
+
+def load_csv_to_snowflake(csv_path, table: str, conn, table_schema: dict = None,
+                          chunk_size: int = 100_000, max_inflight_chunks: int = 2,
+                          stats: dict = None):
     """
     Memory-efficiently load a large CSV into a Snowflake table using chunking.
 
+    Parsing and type coercion run ahead in a background thread while the
+    calling thread uploads with write_pandas, so CPU and network overlap.
+    A bounded queue caps the number of parsed chunks held in memory.
+
     Args:
         csv_path: Path to the CSV file to be loaded.
         table: Target table name in Snowflake.
         conn: Active Snowflake connection object.
+        table_schema: Column → type mapping; resolved via etl.schema if None.
+        chunk_size: Rows per parsed chunk / write_pandas call.
+        max_inflight_chunks: Parsed chunks allowed to wait for upload.
+        stats: Optional dict filled with per-stage seconds and utilization.
 
     Returns:
         int: Total number of rows successfully inserted.
     """
     db = conn.database
     schema = conn.schema
-    cs = conn.cursor()
-
-    # Initialize schema and recreate target table structure
-    cs.execute(f"CREATE SCHEMA IF NOT EXISTS {db}.{schema}")
-    cs.execute(f"DROP TABLE IF EXISTS {schema}.{table}")
-
-    # Read header only to define table columns
-    header_df = pd.read_csv(csv_path, nrows=0)
-    header_df.columns = [col.upper() for col in header_df.columns]
-    columns_sql = ", ".join([f"{col} STRING" for col in header_df.columns])
-    cs.execute(f"CREATE TABLE {schema}.{table} ({columns_sql})")
-    cs.close()
+    table_schema = table_schema or resolve_schema(csv_path, table)
+    _recreate_table(conn, table, table_schema)
 
     # Load CSV in chunks to prevent memory issues
+    expected_rows = count_rows(csv_path, header=True, quoted=True)
     total_rows = 0
-    chunk_size = 100_000
-    df_iterator = pd.read_csv(csv_path, chunksize=chunk_size, low_memory=False)
-
-    for i, df in enumerate(df_iterator):
-        df.columns = [col.upper() for col in df.columns]
-        
-        # Write DataFrame to Snowflake; ignore fourth return value (metadata) 
-        success, nchunks, nrows, _ = write_pandas(
-            conn=conn,
-            df=df,
-            table_name=table,
-            database=db,
-            schema=schema,
-            auto_create_table=False,
-            overwrite=False
-        )
+    timings = {"parse": 0.0, "parse_blocked": 0.0, "upload": 0.0, "upload_starved": 0.0}
+    chunks = queue.Queue(maxsize=max(1, max_inflight_chunks))
+    stop = threading.Event()
+    producer = threading.Thread(
+        target=_parse_chunks,
+        args=(csv_path, table_schema, chunk_size, chunks, stop, timings),
+        name=f"parse-{table}",
+        daemon=True
+    )
+
+    wall_start = time.perf_counter()
+    producer.start()
+    try:
+        i = 0
+        while True:
+            wait_start = time.perf_counter()
+            df = chunks.get()
+            timings["upload_starved"] += time.perf_counter() - wait_start
+            if df is _DONE:
+                break
+            if isinstance(df, _ProducerError):
+                raise df.exc
+
+            # Write DataFrame to Snowflake; ignore fourth return value (metadata)
+            upload_start = time.perf_counter()
+            success, nchunks, nrows, _ = write_pandas(
+                conn=conn,
+                df=df,
+                table_name=table,
+                database=db,
+                schema=schema,
+                auto_create_table=False,
+                overwrite=False,
+                use_logical_type=True
+            )
+            timings["upload"] += time.perf_counter() - upload_start
+            i += 1
 
-        if success:
-            total_rows += nrows
-            logging.info(f"Chunk {i + 1} loaded: {nrows} rows. Total: {total_rows}")
-        else:
-            logging.error(f"Failed to load chunk {i + 1}")
+            if success:
+                total_rows += nrows
+                logging.info(f"Chunk {i} loaded: {nrows} rows. Total: {total_rows}/{expected_rows}")
+            else:
+                logging.error(f"Failed to load chunk {i}")
+            del df
+    finally:
+        stop.set()
+        producer.join()
 
+    wall = time.perf_counter() - wall_start
+    utilization = {
+        "wall_seconds": wall,
+        **{f"{k}_seconds": v for k, v in timings.items()},
+        "parse_utilization": timings["parse"] / wall if wall else 0.0,
+        "upload_utilization": timings["upload"] / wall if wall else 0.0,
+        "bottleneck": "upload" if timings["parse_blocked"] > timings["upload_starved"] else "parse",
+    }
+    if stats is not None:
+        stats.update(utilization)
+
+    logging.info(
+        f"{table} stage utilization: parse {utilization['parse_utilization']:.0%} "
+        f"(blocked {timings['parse_blocked']:.1f}s), upload {utilization['upload_utilization']:.0%} "
+        f"(starved {timings['upload_starved']:.1f}s) → bottleneck: {utilization['bottleneck']}"
+    )
     logging.info(f"Final load complete. Total rows inserted: {total_rows}")
     return total_rows
+
+
+# ---------------- Staged COPY INTO Load Path ----------------
+
+COMPRESSION_EXT = {"gzip": ".gz", "zstd": ".zst"}
+
+
+def _open_compressed(path: Path, compression: str):
+    """Open a binary writer for the requested compression codec."""
+    if compression == "gzip":
+        return gzip.open(path, "wb", compresslevel=6)
+    if compression == "zstd":
+        try:
+            import zstandard
+        except ImportError as e:
+            raise ImportError("compression='zstd' requires the 'zstandard' package") from e
+        return zstandard.ZstdCompressor(level=3).stream_writer(open(path, "wb"), closefd=True)
+    raise ValueError(f"Unsupported compression: {compression}")
+
+
+def split_csv_to_parts(csv_path, out_dir: Path, table: str, rows_per_part: int = 1_000_000,
+                       compression: str = "gzip"):
+    """
+    Split a CSV into compressed parts, repeating the header in every part.
+
+    Rows are cut on record boundaries: a line that leaves a double-quoted
+    field open is kept together with the following line(s).
+
+    Args:
+        csv_path: Path to the processed CSV.
+        out_dir: Directory for the compressed parts.
+        table: Table name used to prefix part file names.
+        rows_per_part: Maximum data rows per part.
+        compression: 'gzip' or 'zstd'.
+
+    Returns:
+        list[dict]: One entry per part with file, path, rows, raw_bytes and bytes.
+    """
+    ext = COMPRESSION_EXT.get(compression)
+    if ext is None:
+        raise ValueError(f"Unsupported compression: {compression}")
+
+    parts = []
+    writer = None
+
+    def close_part():
+        writer.close()
+        part = parts[-1]
+        part["bytes"] = part["path"].stat().st_size
+
+    with open(csv_path, "rb") as src:
+        header = src.readline()
+        in_quotes = False
+        for line in src:
+            if writer is None or (not in_quotes and parts[-1]["rows"] >= rows_per_part):
+                if writer is not None:
+                    close_part()
+                path = out_dir / f"{table.lower()}_part{len(parts):04d}.csv{ext}"
+                writer = _open_compressed(path, compression)
+                writer.write(header)
+                parts.append({"file": path.name, "path": path, "rows": 0, "raw_bytes": len(header)})
+
+            writer.write(line)
+            parts[-1]["raw_bytes"] += len(line)
+            if line.count(b'"') % 2:
+                in_quotes = not in_quotes
+            if not in_quotes:
+                parts[-1]["rows"] += 1
+
+    if writer is not None:
+        close_part()
+    return parts
+
+
+def _put_part(conn, part: dict, stage: str, compression: str) -> dict:
+    """PUT one compressed part to the table stage on its own cursor."""
+    cs = conn.cursor()
+    try:
+        cs.execute(
+            f"PUT 'file://{part['path'].as_posix()}' @{stage} "
+            f"AUTO_COMPRESS=FALSE SOURCE_COMPRESSION={compression.upper()} PARALLEL=4 OVERWRITE=TRUE"
+        )
+        row = cs.fetchone()
+        # PUT returns (source, target, source_size, target_size, source_compression, target_compression, status, message)
+        return {"put_status": row[6] if row and len(row) > 6 else "UNKNOWN"}
+    finally:
+        cs.close()
+
+
+def stage_csv_to_snowflake(csv_path, table: str, conn, rows_per_part: int = 1_000_000,
+                           compression: str = "gzip", parallel: int = 4, work_dir=None,
+                           table_schema: dict = None):
+    """
+    Load a CSV into Snowflake via compressed parts, parallel PUT and one COPY INTO.
+
+    Args:
+        csv_path: Path to the CSV file to be loaded.
+        table: Target table name in Snowflake.
+        conn: Active Snowflake connection object.
+        rows_per_part: Maximum data rows per compressed part.
+        compression: 'gzip' or 'zstd'.
+        parallel: Number of concurrent PUT threads.
+        work_dir: Directory for the compressed parts (a temp dir if None).
+        table_schema: Column → type mapping; resolved via etl.schema if None.
+
+    Returns:
+        list[dict]: Per-file results with file, rows, raw_bytes, bytes, put_status,
+        status, rows_loaded, errors_seen and first_error.
+
+    Raises:
+        CopyLoadError: A part was not loaded; raised after all parts are reported,
+        with the per-file results attached.
+    """
+    schema = conn.schema
+    stage = f"{schema}.%{table}"
+    _recreate_table(conn, table, table_schema or resolve_schema(csv_path, table))
+
+    with tempfile.TemporaryDirectory(dir=work_dir) as tmp:
+        parts = split_csv_to_parts(csv_path, Path(tmp), table, rows_per_part, compression)
+        raw_mb = sum(p["raw_bytes"] for p in parts) / 1e6
+        staged_mb = sum(p["bytes"] for p in parts) / 1e6
+        logging.info(f"{table}: {len(parts)} {compression} parts, {raw_mb:.1f} MB → {staged_mb:.1f} MB")
+        if not parts:
+            # Header-only CSV: the table is recreated empty; FILES=() would be invalid SQL
+            logging.info(f"COPY INTO {table} skipped: no data rows")
+            return []
+
+        # Upload parts concurrently; each thread uses its own cursor
+        with ThreadPoolExecutor(max_workers=max(1, parallel)) as pool:
+            put_results = list(pool.map(lambda p: _put_part(conn, p, stage, compression), parts))
+        for part, put in zip(parts, put_results):
+            part.update(put)
+            part.pop("path")
+
+    # Single COPY INTO for all staged parts
+    files_sql = ", ".join(f"'{p['file']}'" for p in parts)
+    cs = conn.cursor()
+    try:
+        cs.execute(
+            f"COPY INTO {schema}.{table} FROM @{stage} FILES=({files_sql}) "
+            f"FILE_FORMAT=(TYPE=CSV SKIP_HEADER=1 FIELD_OPTIONALLY_ENCLOSED_BY='\"' "
+            f"COMPRESSION={compression.upper()}) ON_ERROR=SKIP_FILE PURGE=TRUE"
+        )
+        columns = [d[0].lower() for d in cs.description]
+        copy_rows = {}
+        for row in cs.fetchall():
+            result = dict(zip(columns, row))
+            copy_rows[Path(str(result.get("file", ""))).name] = result
+    finally:
+        cs.close()
+
+    # SKIP_FILE loads the good parts and reports the bad ones, so report everything before raising
+    total_rows, failed = 0, 0
+    for part in parts:
+        result = copy_rows.get(part["file"], {})
+        part["status"] = result.get("status", "NOT_LOADED")
+        part["rows_loaded"] = int(result.get("rows_loaded") or 0)
+        part["errors_seen"] = int(result.get("errors_seen") or 0)
+        part["first_error"] = result.get("first_error")
+        total_rows += part["rows_loaded"]
+        if part["status"] != "LOADED":
+            failed += 1
+            logging.error(f"{table}: {part['file']} {part['status']} — "
+                          f"{part['errors_seen']} errors, first: {part['first_error']}")
+
+    logging.info(f"COPY INTO {table} complete. Total rows loaded: {total_rows}")
+    if failed:
+        raise CopyLoadError(table, parts)
+    return parts
+
+
+# ---------------- Concurrent Multi-Table Loading ----------------
+
+def load_table_from_pool(csv_path, pool, loader=load_csv_to_snowflake):
+    """
+    Load one processed CSV on a connection borrowed from `pool`.
+
+    Args:
+        csv_path: merged_<table>.csv path.
+        pool: Connection pool exposing a `connection()` context manager.
+        loader (callable): loader(csv_path=..., table=..., conn=...) returning rows loaded.
+
+    Returns:
+        tuple: (table name, {"rows", "bytes", "seconds", "rows_per_sec"}).
+    """
+    table = Path(csv_path).stem.replace("merged_", "").upper()
+    with pool.connection() as conn, stage("load", table=table) as st:
+        start = time.perf_counter()
+        rows = loader(csv_path=csv_path, table=table, conn=conn)
+        seconds = time.perf_counter() - start
+        st.add(rows=rows, n_bytes=Path(csv_path).stat().st_size)
+    return table, {
+        "rows": rows,
+        "bytes": Path(csv_path).stat().st_size,
+        "seconds": seconds,
+        "rows_per_sec": rows / seconds if seconds else 0.0,
+    }
+
+
+def load_tables_concurrently(csv_files, pool, max_workers: int = 3, loader=load_csv_to_snowflake):
+    """
+    Load several processed CSVs concurrently, largest files first.
+
+    Each worker borrows a connection from `pool` for the duration of one table,
+    so concurrency is bounded by both `max_workers` and the pool size.
+
+    Args:
+        csv_files: Iterable of merged_*.csv paths.
+        pool: Connection pool exposing a `connection()` context manager.
+        max_workers (int): Maximum number of tables loaded at once.
+        loader (callable): loader(csv_path=..., table=..., conn=...) returning rows loaded.
+
+    Returns:
+        dict: Table name → {"rows", "bytes", "seconds", "rows_per_sec"}.
+
+    Raises:
+        Exception: The first table load failure, after all other loads finish.
+    """
+    csv_files = sorted(csv_files, key=lambda p: Path(p).stat().st_size, reverse=True)
+
+    results, errors = {}, []
+    wall_start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=max(1, max_workers)) as executor:
+        futures = {executor.submit(load_table_from_pool, p, pool, loader): p for p in csv_files}
+        for future in as_completed(futures):
+            try:
+                table, stats = future.result()
+            except Exception as e:
+                logging.error(f"Failed to load {Path(futures[future]).name}: {e}")
+                errors.append(e)
+                continue
+            results[table] = stats
+            logging.info(f"{table} loaded: {stats['rows']} rows in {stats['seconds']:.1f}s "
+                         f"({stats['rows_per_sec']:,.0f} rows/sec)")
+
+    wall = time.perf_counter() - wall_start
+    total_rows = sum(s["rows"] for s in results.values())
+    logging.info(f"Loaded {len(results)} tables, {total_rows} rows in {wall:.1f}s "
+                 f"with up to {max_workers} concurrent loads")
+    if errors:
+        raise errors[0]
+    return results
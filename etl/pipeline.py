@@ -1,12 +1,29 @@
 """
 FDA ETL Pipeline Runner
 
-This script orchestrates the end-to-end FDA FAERS ETL workflow:
+This script orchestrates the end-to-end FDA FAERS ETL workflow as a
+per-table task DAG, so each table flows to its next stage as soon as its
+own dependencies finish:
 - Extracts raw FAERS ZIP data from FDA servers
 - Transforms and merges raw tables into processed CSVs
 - Validates processed data using Great Expectations
-- Optionally loads processed CSVs into Snowflake
-- Executes local dbt transformations and tests
+- Checks child-table primaryids against DEMO (referential integrity)
+- Optionally loads processed CSVs into Snowflake, or into a local DuckDB
+  warehouse (WAREHOUSE_BACKEND=duckdb) when no credentials are available
+- Executes local dbt transformations and tests with a single threaded
+  `dbt build`, recording per-model timings from run_results.json
+- Skips `dbt deps` while packages.yml / package-lock.yml are unchanged and,
+  given a saved manifest, builds only modified models and models downstream
+  of the source tables reloaded in this run
+- Times every stage (wall/CPU time, rows, bytes, peak RSS) and writes a JSON
+  run report to logs/run_report.json, optionally compared to a baseline report
+- Writes each merged table to a primaryid-indexed columnar case store
+  (data/processed/case_store) for fast report lookups
+- Reports each task's wait for a free worker and the DAG's critical path
+- Checkpoints every task to logs/run_state.json; `--resume` skips tasks whose
+  inputs and outputs are unchanged and restarts at the first failed task
+- Runs a subset of stages / tables / quarters (see etl/cli.py); pandas, GX and
+  the warehouse drivers are imported only by the tasks that need them
 
 Designed for reproducible local runs and CI/CD integration.
 
@@ -18,12 +35,16 @@ import logging
 import warnings
 import os
 import subprocess
+import json
+import hashlib
+import shutil
 
-from etl.extract import download_faers_data
-from validation.extract_gx import validate_all_texts
-from etl.transform import merge_and_transform_one_by_one
-from etl.load import load_csv_to_snowflake
-from db.snowflake_conn import get_snowflake_connection
+from functools import partial
+
+from etl.extract import download_quarter, quarter_files, FAERS_URLS, FAERS_TABLES
+from etl.scheduler import TaskScheduler
+from etl.run_state import RunState
+from etl.instrumentation import stage, get_recorder, compare_reports
 
 logging.basicConfig(level=logging.INFO, format="%(message)s")
 warnings.filterwarnings("ignore")
@@ -31,99 +52,397 @@ warnings.filterwarnings("ignore")
 # ----------------------------------------
 # Setup directories
 # ----------------------------------------
+# Directories are created by the stages that write to them, not at import time
 BASE_DIR = Path.cwd()
 RAW_DIR = BASE_DIR / "data" / "raw"
-RAW_DIR.mkdir(parents=True, exist_ok=True)
-
 PROCESSED_DIR = BASE_DIR / "data" / "processed"
-PROCESSED_DIR.mkdir(parents=True, exist_ok=True)
-
 LOGS_DIR = BASE_DIR / "logs"
-LOGS_DIR.mkdir(parents=True, exist_ok=True)
 
-TESTS_DIR = BASE_DIR / "tests"
-TESTS_DIR.mkdir(parents=True, exist_ok=True)
+DBT_PROFILES_DIR = BASE_DIR / "fda_dbt" / "profiles"
+DBT_TARGET_DIR = BASE_DIR / "target"
+DBT_PACKAGES_DIR = BASE_DIR / "dbt_packages"
+DBT_STATE_DIR = BASE_DIR / "dbt_state"  # last successful manifest.json + latest run_results.json
+DBT_PACKAGE_FILES = [BASE_DIR / "packages.yml", BASE_DIR / "package-lock.yml"]
+DBT_SOURCE = "fda"
+RUN_REPORT_PATH = LOGS_DIR / "run_report.json"
+RUN_STATE_PATH = LOGS_DIR / "run_state.json"
+
+PIPELINE_STAGES = ["extract", "transform", "validate", "load", "dbt"]
+TABLES = sorted({t[:4] for t in FAERS_TABLES})
+
+
+def resolve_tables(names=None) -> list:
+    """
+    Normalize table names ('drug' → 'DRUG'); None means every FAERS table.
+
+    Raises:
+        ValueError: For names that are not FAERS tables.
+    """
+    if not names:
+        return list(TABLES)
+    tables = [n.strip().upper() for n in names]
+    unknown = sorted(set(tables) - set(TABLES))
+    if unknown:
+        raise ValueError(f"Unknown tables {unknown}; expected any of {TABLES}")
+    return tables
+
+
+def resolve_quarters(names=None) -> list:
+    """
+    Normalize quarters to FAERS_URLS keys; accepts 'Q1_2025', '25Q1' or '2025Q1'.
+
+    Raises:
+        ValueError: For quarters that are not in FAERS_URLS.
+    """
+    if not names:
+        return list(FAERS_URLS)
+    aliases = {}
+    for key in FAERS_URLS:
+        q, year = key.split("_")
+        aliases.update({key.upper(): key, f"{year[2:]}{q}": key, f"{year}{q}": key})
+    quarters, unknown = [], []
+    for n in names:
+        key = aliases.get(n.strip().upper())
+        (quarters if key else unknown).append(key or n)
+    if unknown:
+        raise ValueError(f"Unknown quarters {unknown}; expected any of {list(FAERS_URLS)}")
+    return quarters
+
+
+def build_etl_dag(scheduler: TaskScheduler, raw_dir: Path = RAW_DIR, processed_dir: Path = PROCESSED_DIR,
+                  backend=None, zip_dir: Path = None, stages=None, tables=None,
+                  quarters=None) -> TaskScheduler:
+    """
+    Register the per-quarter / per-table pipeline tasks on a scheduler.
+
+    extract:<quarter> → transform:<TABLE> (needs every quarter) → validate:<TABLE>
+    → load:<TABLE> (if a backend is given) → dbt (needs every load).
+    Each transform is followed by case_store:<TABLE>, part of the transform
+    stage, which writes the table to the case store (CASE_STORE=0 skips it).
+    referential_integrity runs once all transforms are done. Each task declares
+    the files it reads and writes so a resumed run can skip unchanged work.
+    Dependencies on stages that are not selected are dropped, so e.g. a
+    'validate' run checks whatever merged CSVs are already on disk.
 
+    Args:
+        scheduler (TaskScheduler): Scheduler to add tasks to.
+        raw_dir (Path): Raw FAERS TXT directory.
+        processed_dir (Path): Merged CSV directory.
+        backend (WarehouseBackend): Load target, or None to skip loading.
+        zip_dir (Path): Local FAERS ZIP directory instead of downloading.
+        stages: Stages to run (subset of PIPELINE_STAGES), default all.
+        tables: FAERS tables to process, default all; referential
+            integrity only runs when every table is selected.
+        quarters: FAERS_URLS keys to extract, default all.
 
-def run_etl():
+    Returns:
+        TaskScheduler: The same scheduler, for chaining.
     """
-    Execute the full FDA ETL pipeline:
-    1. Extract raw FAERS data
-    2. Transform and merge into processed CSVs
-    3. Validate processed data via Great Expectations
-    4. Optionally load into Snowflake
-    5. Run local dbt transformations and tests
+    from etl.transform import transform_group
+    from etl.case_store import build_table_store
+    from validation.extract_gx import validate_table, FAERS_ROW_COUNTS, GX_OUTPUT_DIR
+    from validation.referential_integrity import validate_referential_integrity, GX_OUTPUT_DIR as RI_OUTPUT_DIR
+
+    stages = set(stages or PIPELINE_STAGES)
+    store_dir = processed_dir / "case_store"
+    build_store = os.environ.get("CASE_STORE", "1") != "0"
+    all_tables = not tables or set(resolve_tables(tables)) == set(TABLES)
+
+    def add(name, fn, deps=(), stage=None, **kwargs) -> str:
+        if stage in stages:
+            scheduler.add(name, fn, deps=[d for d in deps if d in scheduler.tasks], stage=stage, **kwargs)
+        return name
+
+    extracts = [
+        add(f"extract:{q}", partial(download_quarter, q, raw_dir, zip_dir), stage="extract", table=q,
+            outputs=partial(quarter_files, q, raw_dir))
+        for q in resolve_quarters(quarters)
+    ]
+
+    # Largest tables first so the long chains start early
+    tables = sorted(resolve_tables(tables), key=lambda t: -FAERS_ROW_COUNTS.get(t, (0, 0))[1])
+    transforms, finals = [], []
+    for table in tables:
+        csv_path = processed_dir / f"merged_{table.lower()}.csv"
+        csv_only = partial(list, [csv_path])
+        transform = add(f"transform:{table}", partial(transform_group, table, raw_dir, processed_dir),
+                        deps=extracts, stage="transform", table=table,
+                        inputs=partial(_sorted_glob, raw_dir, f"{table}*.txt"), outputs=csv_only)
+        validate = add(f"validate:{table}", partial(validate_table, csv_path),
+                       deps=[transform], stage="validate", table=table,
+                       inputs=csv_only, outputs=partial(list, [GX_OUTPUT_DIR / f"gx_{table}.json"]))
+        if build_store:
+            add(f"case_store:{table}", partial(build_table_store, csv_path, table, store_dir),
+                deps=[transform], stage="transform", table=table, inputs=csv_only,
+                outputs=partial(list, [store_dir / table / "meta.json"]))
+        transforms.append(transform)
+        finals.append(validate)
+        if backend is not None:
+            finals[-1] = add(f"load:{table}", partial(backend.load_file, csv_path),
+                             deps=[validate, transform], stage="load", table=table, inputs=csv_only)
+
+    if all_tables:
+        finals.append(add("referential_integrity", partial(validate_referential_integrity, processed_dir),
+                          deps=transforms, stage="validate",
+                          inputs=partial(_sorted_glob, processed_dir, "merged_*.csv"),
+                          outputs=partial(list, [RI_OUTPUT_DIR / "gx_REFERENTIAL_INTEGRITY.json"])))
+    def dbt_task():
+        # Sources changed unless their load was reused from the run state; unknown without a load stage
+        loads = [scheduler.tasks[f"load:{t}"] for t in tables if f"load:{t}" in scheduler.tasks]
+        changed = [t.table for t in loads if not t.cached] if loads else None
+        return run_dbt(force=True, changed_tables=changed)
+
+    add("dbt", dbt_task, deps=finals, stage="dbt")
+    return scheduler
+
+
+def _sorted_glob(directory: Path, pattern: str) -> list:
+    return sorted(Path(directory).glob(pattern))
+
+
+def run_etl(raw_dir: Path = RAW_DIR, processed_dir: Path = PROCESSED_DIR, zip_dir: Path = None,
+            max_workers: int = None, resume: bool = False, stages=None, tables=None,
+            quarters=None) -> dict:
     """
-    # ---------------- Extract ---------------- #
-    downloaded_files = download_faers_data(raw_dir=RAW_DIR)
-    logging.info(f"Extract complete. Files: {[f.name for f in downloaded_files]}")
+    Execute the full FDA ETL pipeline as a per-table task DAG:
+    1. Extract raw FAERS data (one task per quarter)
+    2. Transform and merge each table group into a processed CSV
+    3. Validate each table via Great Expectations, plus referential integrity
+    4. Optionally load each table into the selected warehouse backend (Snowflake or DuckDB)
+    5. Run dbt transformations and tests once every table is loaded
+
+    Each table moves to its next stage as soon as its own dependencies finish.
+    Parallelism is bounded by PIPELINE_WORKERS (default 4), TRANSFORM_CONCURRENCY
+    (default 2) and LOAD_CONCURRENCY (default 3).
+
+    Args:
+        resume (bool): Reuse tasks recorded as complete in logs/run_state.json
+            whose inputs and outputs are unchanged; failed tasks re-run.
+        stages: Stages to run. By default load runs only with
+            WAREHOUSE_BACKEND=duckdb or RUN_SNOWFLAKE_LOAD=1, and dbt only with
+            RUN_DBT=1; naming a stage explicitly always runs it.
+        tables: FAERS tables to process (default all).
+        quarters: Quarters to extract (default all).
 
-    # ---------------- Transform ---------------- #
-    merge_and_transform_one_by_one(RAW_DIR, PROCESSED_DIR)
+    Returns:
+        dict: The scheduler report (per-task timings, waits and critical path).
+    """
+    max_workers = max_workers or int(os.environ.get("PIPELINE_WORKERS", "4"))
+    zip_dir = zip_dir or os.environ.get("FAERS_ZIP_DIR")
+    limits = {
+        "transform": int(os.environ.get("TRANSFORM_CONCURRENCY", "2")),
+        "load": int(os.environ.get("LOAD_CONCURRENCY", "3")),
+        "dbt": 1,
+    }
 
-    # ---------------- Validation ---------------- #
-    validate_all_texts(PROCESSED_DIR)
-    logging.info("Great Expectations validation complete.")
+    backend_name = os.environ.get("WAREHOUSE_BACKEND", "snowflake").lower()
+    if stages is None:
+        stages = ["extract", "transform", "validate"]
+        if backend_name == "duckdb" or os.environ.get("RUN_SNOWFLAKE_LOAD") == "1":
+            stages.append("load")
+        else:
+            logging.info("Warehouse load skipped (RUN_SNOWFLAKE_LOAD not set, WAREHOUSE_BACKEND != duckdb)")
+        if os.environ.get("RUN_DBT") == "1":
+            stages.append("dbt")
+        else:
+            logging.info("DBT run skipped (RUN_DBT not set)")
 
-    # ---------------- Load to Snowflake ---------------- #
-    if os.environ.get("RUN_SNOWFLAKE_LOAD") == "1":
-        logging.info("Snowflake load enabled. Connecting...")
-        conn = get_snowflake_connection()
-        logging.info("Connected to Snowflake")
+    backend = None
+    if "load" in stages:
+        from etl.warehouse import get_backend
 
-        try:
-            for csv_file in PROCESSED_DIR.glob("merged_*.csv"):
-                table_name = csv_file.stem.replace("merged_", "").upper()
-                logging.info(f"Loading {csv_file.name} → {table_name}")
+        logging.info(f"Warehouse load enabled ({backend_name}). Connecting...")
+        backend = get_backend(backend_name)
 
-                rows_inserted = load_csv_to_snowflake(
-                    conn=conn,
-                    csv_path=csv_file,
-                    table=table_name
-                )
-                logging.info(f"{table_name} loaded, rows inserted: {rows_inserted}")
+    state = RunState(RUN_STATE_PATH, resume=resume,
+                     config={"backend": backend_name if backend is not None else None})
+    scheduler = TaskScheduler(max_workers=max_workers, limits=limits, state=state)
+    build_etl_dag(scheduler, Path(raw_dir), Path(processed_dir), backend=backend,
+                  zip_dir=Path(zip_dir) if zip_dir else None, stages=stages, tables=tables,
+                  quarters=quarters)
+    try:
+        with stage("pipeline"):
+            scheduler.run()
 
-            # Optional verification
-            cs = conn.cursor()
-            for table in ["DEMO", "DRUG", "INDI", "OUTC", "REAC", "RPSR", "THER"]:
-                cs.execute(f"SELECT COUNT(*) FROM {table}")
-                logging.info(f"{table} rows: {cs.fetchone()[0]}")
-            cs.close()
+        # Optional verification
+        if backend is not None:
+            for table, rows in backend.table_counts().items():
+                logging.info(f"{table} rows: {rows}")
+    finally:
+        get_recorder().extra["scheduler"] = scheduler.report()
+        if backend is not None:
+            backend.close()
+    return scheduler.report()
 
-        finally:
-            conn.close()
-            logging.info("Snowflake connection closed")
-    else:
-        logging.info("Snowflake load skipped (RUN_SNOWFLAKE_LOAD not set)")
 
-def run_dbt():
+def dbt_target_args() -> list:
     """
-    Run dbt dependencies, models, and tests.
-    Controlled by environment variable RUN_DBT for CI/CD.
+    Extra dbt CLI arguments for the selected warehouse backend.
+
+    The DuckDB backend uses the repo's fda_dbt/profiles/profiles.yml 'duckdb'
+    target; Snowflake keeps the default ~/.dbt/profiles.yml written by CI.
     """
-    if os.environ.get("RUN_DBT") != "1":
+    if os.environ.get("WAREHOUSE_BACKEND", "snowflake").lower() == "duckdb":
+        return ["--profiles-dir", str(DBT_PROFILES_DIR), "--target", "duckdb"]
+    return []
+
+
+def collect_dbt_timings(run_results_path: Path = None) -> list:
+    """
+    Read per-node timings from dbt's run_results.json.
+
+    Args:
+        run_results_path (Path): Defaults to target/run_results.json.
+
+    Returns:
+        list[dict]: unique_id, resource_type, status and execution_time per
+        node, slowest first.
+    """
+    run_results_path = run_results_path or DBT_TARGET_DIR / "run_results.json"
+    if not run_results_path.exists():
+        return []
+    with open(run_results_path, "r") as f:
+        results = json.load(f).get("results", [])
+    timings = [
+        {
+            "unique_id": r["unique_id"],
+            "resource_type": r["unique_id"].split(".", 1)[0],
+            "status": r["status"],
+            "execution_time": r.get("execution_time", 0.0),
+        }
+        for r in results
+    ]
+    return sorted(timings, key=lambda t: t["execution_time"], reverse=True)
+
+
+def dbt_packages_hash() -> str:
+    """sha256 of packages.yml + package-lock.yml (missing files hash as empty)."""
+    digest = hashlib.sha256()
+    for path in DBT_PACKAGE_FILES:
+        digest.update(path.name.encode())
+        digest.update(path.read_bytes() if path.exists() else b"")
+    return digest.hexdigest()
+
+
+def dbt_deps_needed() -> bool:
+    """True unless dbt_packages/ was installed from the current package files."""
+    marker = DBT_PACKAGES_DIR / ".packages_hash"
+    return not (marker.exists() and marker.read_text().strip() == dbt_packages_hash())
+
+
+def dbt_selection(changed_tables=None) -> list:
+    """
+    `dbt build` selection arguments for a state-based partial build.
+
+    Args:
+        changed_tables: FAERS tables reloaded in this run, or None if unknown.
+
+    Returns:
+        list[str]: Empty (full build) if there is no saved manifest or the
+        changed sources are unknown; otherwise modified models, nodes that
+        errored or failed in the previous build, and everything downstream
+        of those and of the changed sources.
+    """
+    if os.environ.get("DBT_FULL_BUILD") == "1":
+        return []
+    if changed_tables is None or not (DBT_STATE_DIR / "manifest.json").exists():
+        return []
+    selectors = ["state:modified+"]
+    if (DBT_STATE_DIR / "run_results.json").exists():
+        selectors += ["result:error+", "result:fail+"]
+    selectors += [f"source:{DBT_SOURCE}.{t.lower()}+" for t in sorted(changed_tables)]
+    return ["--select", *selectors, "--state", str(DBT_STATE_DIR)]
+
+
+def run_dbt(force: bool = False, changed_tables=None):
+    """
+    Install dbt packages if needed, then build (run + test) the selected models.
+
+    Controlled by environment variable RUN_DBT for CI/CD unless `force` is set.
+    DBT_THREADS sets dbt's thread count (default 4); DBT_FULL_BUILD=1 ignores
+    the saved manifest state.
+
+    Args:
+        force (bool): Run even if RUN_DBT is not set.
+        changed_tables: FAERS tables reloaded in this run; None builds everything
+            when there is no way to tell which sources changed.
+    """
+    if not force and os.environ.get("RUN_DBT") != "1":
         logging.info("DBT run skipped (RUN_DBT not set)")
         return
 
     try:
-        # 1. ALWAYS install dependencies first
-        logging.info("Installing dbt dependencies...")
-        subprocess.run(["dbt", "deps"], check=True)
-
-        # 2. Run the models
-        logging.info("Starting dbt transformations...")
-        subprocess.run(["dbt", "run"], check=True)
-
-        # 3. Run the tests
-        logging.info("Starting dbt tests...")
-        subprocess.run(["dbt", "test"], check=True)
-        
-        logging.info("DBT run and tests completed successfully.")
+        # 1. Install dependencies only when the package lock changed
+        if dbt_deps_needed():
+            logging.info("Installing dbt dependencies...")
+            with stage("dbt_deps"):
+                subprocess.run(["dbt", "deps"], check=True)
+            (DBT_PACKAGES_DIR / ".packages_hash").write_text(dbt_packages_hash())
+        else:
+            logging.info("dbt packages up to date — skipping dbt deps")
+
+        # 2. Build models and run their tests in DAG order
+        selection = dbt_selection(changed_tables)
+        threads = os.environ.get("DBT_THREADS", "4")
+        logging.info(f"Starting dbt build ({threads} threads, "
+                     f"{'selection: ' + ' '.join(selection[1:-2]) if selection else 'full build'})...")
+        with stage("dbt_build") as st:
+            try:
+                subprocess.run(["dbt", "build", "--threads", threads, *selection, *dbt_target_args()],
+                               check=True)
+            finally:
+                timings = collect_dbt_timings()
+                st.details["models"] = sum(t["resource_type"] == "model" for t in timings)
+                st.details["tests"] = sum(t["resource_type"] == "test" for t in timings)
+                st.details["selection"] = " ".join(selection[1:-2]) or "all"
+                if (DBT_TARGET_DIR / "run_results.json").exists():
+                    DBT_STATE_DIR.mkdir(parents=True, exist_ok=True)
+                    shutil.copy2(DBT_TARGET_DIR / "run_results.json", DBT_STATE_DIR / "run_results.json")
+                LOGS_DIR.mkdir(parents=True, exist_ok=True)
+                with open(LOGS_DIR / "dbt_model_timings.json", "w") as f:
+                    json.dump(timings, f, indent=2)
+                get_recorder().extra["dbt_models"] = timings
+
+        for t in [t for t in timings if t["resource_type"] == "model"][:5]:
+            logging.info(f"  {t['unique_id']}: {t['execution_time']:.2f}s ({t['status']})")
+
+        # 3. Save the manifest as the comparison state for the next build
+        DBT_STATE_DIR.mkdir(parents=True, exist_ok=True)
+        shutil.copy2(DBT_TARGET_DIR / "manifest.json", DBT_STATE_DIR / "manifest.json")
+
+        logging.info("DBT build completed successfully.")
     except subprocess.CalledProcessError as e:
         logging.error(f"DBT execution failed: {e}")
         raise
 
+
+def write_run_report(path: Path = RUN_REPORT_PATH, baseline: Path = None) -> dict:
+    """
+    Write the JSON run report and compare it with a baseline report if given.
+
+    Args:
+        path (Path): Output file, defaults to logs/run_report.json.
+        baseline (Path): Previous run report; defaults to RUN_REPORT_BASELINE if set.
+
+    Returns:
+        dict: The run report (with a `comparison` section when a baseline exists).
+    """
+    recorder = get_recorder()
+    baseline = baseline or os.environ.get("RUN_REPORT_BASELINE")
+    if baseline and Path(baseline).exists():
+        with open(baseline, "r") as f:
+            comparison = compare_reports(json.load(f), recorder.report())
+        recorder.extra["comparison"] = comparison
+        for c in comparison:
+            if c["regression"]:
+                label = f"{c['stage']}[{c['table']}]" if c["table"] else c["stage"]
+                logging.warning(f"Slower than baseline: {label} {c['previous_seconds']:.1f}s → "
+                                f"{c['current_seconds']:.1f}s ({c['change']:+.0%})")
+    return recorder.write_report(path)
+
+
 if __name__ == "__main__":
-    run_etl()
-    run_dbt()
-    logging.info("--- Full ETL pipeline complete ---")
+    import sys
+    from etl.cli import main
+
+    sys.exit(main(["run", *sys.argv[1:]]))
@@ -0,0 +1,114 @@
+"""
+Fast Row Counting for Large FAERS Files
+
+This module counts rows in large delimited files without decoding them.
+The file is memory-mapped and newlines are counted at the byte level in
+large blocks, which is far cheaper than iterating text lines in Python.
+
+Features:
+- Memory-maps the file and counts b"\\n" per 8 MB block.
+- Optional quote-aware mode so newlines inside quoted CSV fields are not counted.
+- Counts a final line that has no trailing newline.
+- Caches counts in a JSON sidecar keyed by file size and mtime, so repeated
+  validations and load progress reporting get counts instantly.
+
+Date: 2026-02-05
+"""
+
+import json
+import logging
+import mmap
+from pathlib import Path
+
+BLOCK_SIZE = 8 * 1024 * 1024  # bytes scanned per block
+SIDECAR_SUFFIX = ".rowcount.json"
+
+
+def _count_lines(mm) -> int:
+    """Count physical lines in a memory-mapped file."""
+    lines = 0
+    size = len(mm)
+    for start in range(0, size, BLOCK_SIZE):
+        lines += mm[start:start + BLOCK_SIZE].count(b"\n")
+    if size and mm[size - 1:size] != b"\n":
+        lines += 1  # last line without trailing newline
+    return lines
+
+
+def _count_records(mm) -> int:
+    """Count CSV records, ignoring newlines inside double-quoted fields."""
+    records = 0
+    in_quotes = False
+    size = len(mm)
+    for start in range(0, size, BLOCK_SIZE):
+        block = mm[start:start + BLOCK_SIZE]
+        if b'"' not in block and not in_quotes:
+            records += block.count(b"\n")
+            continue
+        # Even-indexed parts are outside quotes when the block starts unquoted.
+        # An escaped quote ("") toggles twice, so parity stays correct.
+        for part in block.split(b'"'):
+            if not in_quotes:
+                records += part.count(b"\n")
+            in_quotes = not in_quotes
+        in_quotes = not in_quotes  # split() yields one more part than quotes
+    if size and mm[size - 1:size] != b"\n":
+        records += 1
+    return records
+
+
+def _sidecar_path(path: Path) -> Path:
+    return path.with_name(path.name + SIDECAR_SUFFIX)
+
+
+def _read_cache(path: Path, stat) -> dict:
+    """Return cached counts if the sidecar matches the file's size and mtime."""
+    sidecar = _sidecar_path(path)
+    try:
+        with open(sidecar, "r") as f:
+            cache = json.load(f)
+    except (OSError, ValueError):
+        return {}
+    if cache.get("size") != stat.st_size or cache.get("mtime_ns") != stat.st_mtime_ns:
+        return {}
+    return cache.get("counts", {})
+
+
+def _write_cache(path: Path, stat, counts: dict):
+    sidecar = _sidecar_path(path)
+    try:
+        with open(sidecar, "w") as f:
+            json.dump({"size": stat.st_size, "mtime_ns": stat.st_mtime_ns, "counts": counts}, f)
+    except OSError as e:
+        logging.warning(f"Could not write row count cache '{sidecar.name}': {e}")
+
+
+def count_rows(path, header: bool = True, quoted: bool = False, use_cache: bool = True) -> int:
+    """
+    Count data rows in a delimited text file.
+
+    Args:
+        path: Path to the file.
+        header: If True, the first record is a header and is not counted.
+        quoted: If True, newlines inside double-quoted fields do not end a row.
+        use_cache: Read and write the size/mtime keyed sidecar cache.
+
+    Returns:
+        int: Number of data rows.
+    """
+    path = Path(path)
+    stat = path.stat()
+    key = "records" if quoted else "lines"
+
+    counts = _read_cache(path, stat) if use_cache else {}
+    if key not in counts:
+        if stat.st_size == 0:
+            counts[key] = 0
+        else:
+            with open(path, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                counts[key] = _count_records(mm) if quoted else _count_lines(mm)
+        if use_cache:
+            _write_cache(path, stat, counts)
+
+    total = counts[key]
+    return max(total - 1, 0) if header else total
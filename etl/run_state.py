@@ -0,0 +1,108 @@
+"""
+Checkpointed Run State for Resumable Pipeline Runs
+
+This module records which pipeline tasks completed, together with
+fingerprints of the files they read and wrote, so a `--resume` run can skip
+finished work whose inputs are unchanged and restart at the failed task.
+
+Features:
+- File fingerprints are (size, mtime_ns), the same cheap check used by the
+  row-count and schema sidecars; missing files fingerprint as None.
+- A task is reusable only if it succeeded last time, its current input and
+  output fingerprints match the recorded ones, and none of its upstream
+  tasks re-ran in this run.
+- State is written atomically to logs/run_state.json after every task, so
+  a crash mid-run still leaves an accurate checkpoint.
+- A run configuration (e.g. the warehouse backend) is stored with the state;
+  resuming under a different configuration starts fresh.
+
+Date: 2026-02-05
+"""
+
+import json
+import logging
+import os
+from datetime import datetime, timezone
+from pathlib import Path
+
+STATE_VERSION = 1
+
+
+def fingerprint(paths) -> dict:
+    """Map each path to [size, mtime_ns], or None if it does not exist."""
+    prints = {}
+    for p in paths:
+        try:
+            stat = Path(p).stat()
+            prints[str(p)] = [stat.st_size, stat.st_mtime_ns]
+        except FileNotFoundError:
+            prints[str(p)] = None
+    return prints
+
+
+class RunState:
+    """Persistent task → {status, inputs, outputs} store backing --resume."""
+
+    def __init__(self, path, resume: bool = False, config: dict = None):
+        self.path = Path(path)
+        self.resume = resume
+        self.config = config or {}
+        self.tasks = {}
+        if self.path.exists():
+            try:
+                with open(self.path, "r") as f:
+                    data = json.load(f)
+                if data.get("version") != STATE_VERSION:
+                    logging.warning("Run state version changed — starting fresh")
+                elif data.get("config", {}) != self.config:
+                    logging.warning(f"Run configuration changed {data.get('config')} → {self.config} "
+                                    f"— starting fresh")
+                else:
+                    # Kept without --resume too, so single-stage runs add to one checkpoint
+                    self.tasks = data.get("tasks", {})
+            except ValueError:
+                logging.warning(f"Ignoring unreadable run state '{self.path.name}' — starting fresh")
+        if not resume:
+            logging.info("Fresh run: previous results not reused (use --resume to skip completed tasks)")
+
+    def is_complete(self, name: str, inputs, outputs) -> bool:
+        """
+        Whether `name` can be skipped: it succeeded before and its files are unchanged.
+
+        Args:
+            name (str): Task name.
+            inputs: Paths the task reads.
+            outputs: Paths the task writes; all must still exist.
+
+        Returns:
+            bool: True if the recorded result is still valid.
+        """
+        if not self.resume:
+            return False
+        entry = self.tasks.get(name)
+        if not entry or entry.get("status") != "done":
+            return False
+        current_outputs = fingerprint(outputs)
+        if any(v is None for v in current_outputs.values()):
+            return False
+        return entry.get("inputs") == fingerprint(inputs) and entry.get("outputs") == current_outputs
+
+    def record(self, name: str, status: str, inputs=(), outputs=(), seconds: float = 0.0,
+               error: str = None):
+        """Store a task outcome and checkpoint the state file."""
+        self.tasks[name] = {
+            "status": status,
+            "inputs": fingerprint(inputs),
+            "outputs": fingerprint(outputs) if status == "done" else {},
+            "seconds": round(seconds, 3),
+            "finished_at": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+            **({"error": error} if error else {}),
+        }
+        self.save()
+
+    def save(self):
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = self.path.with_suffix(self.path.suffix + ".tmp")
+        with open(tmp, "w") as f:
+            json.dump({"version": STATE_VERSION, "config": self.config, "tasks": self.tasks}, f, indent=2)
+        os.replace(tmp, self.path)
@@ -0,0 +1,248 @@
+"""
+Task DAG Scheduler for Per-Table Pipeline Stages
+
+This module runs pipeline work as a dependency graph of small tasks
+(extract quarter → transform group → validate table → load table → dbt)
+instead of stage-wide barriers, so each table moves to its next stage as
+soon as its own dependencies are done.
+
+Features:
+- TaskScheduler.add() registers a task with its dependencies; dependencies
+  must be added first, so the graph is acyclic by construction.
+- Bounded parallelism: a global worker cap plus optional per-stage limits
+  (e.g. at most 2 concurrent transforms to bound memory).
+- Failed tasks skip their downstream tasks; independent branches keep running
+  and the first failure is re-raised once the graph drains.
+- Records ready/start/finish times per task, the time each task waited for a
+  worker after its dependencies completed, and the critical path.
+- Optional run-state checkpointing: with a RunState, tasks whose recorded
+  inputs/outputs are unchanged (and whose upstream tasks did not re-run) are
+  skipped, and every outcome is checkpointed as it happens.
+
+Date: 2026-02-05
+"""
+
+import logging
+import time
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+
+
+class Task:
+    """One unit of work in the DAG."""
+
+    def __init__(self, name: str, fn, deps=(), stage: str = None, table: str = None,
+                 inputs=None, outputs=None):
+        self.name = name
+        self.fn = fn
+        self.deps = list(deps)
+        self.stage = stage
+        self.table = table
+        self.inputs = inputs    # callable → paths read, for run-state fingerprints
+        self.outputs = outputs  # callable → paths written
+        self.cached = False     # reused from a previous run's state
+        self.status = "pending"  # pending → running → done / failed / skipped
+        self.result = None
+        self.error = None
+        self.ready_at = None
+        self.started_at = None
+        self.finished_at = None
+
+    @property
+    def seconds(self) -> float:
+        if self.started_at is None or self.finished_at is None:
+            return 0.0
+        return self.finished_at - self.started_at
+
+    @property
+    def wait_seconds(self) -> float:
+        if self.ready_at is None or self.started_at is None:
+            return 0.0
+        return self.started_at - self.ready_at
+
+
+class TaskScheduler:
+    """Runs registered tasks on a thread pool as soon as their dependencies complete."""
+
+    def __init__(self, max_workers: int = 4, limits: dict = None, state=None):
+        self.max_workers = max(1, max_workers)
+        self.limits = limits or {}
+        self.state = state
+        self.tasks = {}
+        self._start = None
+        self._end = None
+
+    def add(self, name: str, fn, deps=(), stage: str = None, table: str = None,
+            inputs=None, outputs=None) -> str:
+        """
+        Register a task.
+
+        Args:
+            name (str): Unique task name, e.g. 'load:DRUG'.
+            fn (callable): Called with no arguments; its return value is kept.
+            deps: Names of tasks that must finish successfully first.
+            stage (str): Stage label used for per-stage limits and reporting.
+            table (str): Optional FAERS table or quarter the task works on.
+            inputs (callable): Returns the paths the task reads (run-state fingerprints).
+            outputs (callable): Returns the paths the task writes.
+
+        Returns:
+            str: The task name (convenient for building dependency lists).
+        """
+        if name in self.tasks:
+            raise ValueError(f"Duplicate task '{name}'")
+        missing = [d for d in deps if d not in self.tasks]
+        if missing:
+            raise ValueError(f"Task '{name}' depends on unknown tasks {missing}")
+        self.tasks[name] = Task(name, fn, deps, stage, table, inputs, outputs)
+        return name
+
+    @staticmethod
+    def _paths(task: Task, kind: str) -> list:
+        getter = getattr(task, kind)
+        return list(getter()) if getter else []
+
+    def _reusable(self, task: Task) -> bool:
+        """A task is skipped if the run state says it is complete and no upstream task re-ran."""
+        if self.state is None or any(not self.tasks[d].cached for d in task.deps):
+            return False
+        return self.state.is_complete(task.name, self._paths(task, "inputs"), self._paths(task, "outputs"))
+
+    def _checkpoint(self, task: Task):
+        if self.state is None or task.cached:
+            return
+        self.state.record(task.name, task.status, self._paths(task, "inputs"),
+                          self._paths(task, "outputs"), task.seconds,
+                          error=repr(task.error) if task.error else None)
+
+    def _now(self) -> float:
+        return time.perf_counter() - self._start
+
+    def run(self) -> dict:
+        """
+        Execute the DAG.
+
+        Returns:
+            dict: Task name → return value for tasks that completed.
+
+        Raises:
+            Exception: The first task failure, after all runnable tasks finish.
+        """
+        self._start = time.perf_counter()
+        pending = dict(self.tasks)
+        running = {}
+        errors = []
+
+        with ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="dag") as executor:
+            while pending or running:
+                # ---------------- Propagate failures and mark ready tasks ---------------- #
+                for task in list(pending.values()):
+                    dep_status = [self.tasks[d].status for d in task.deps]
+                    if any(s in ("failed", "skipped") for s in dep_status):
+                        task.status = "skipped"
+                        del pending[task.name]
+                        logging.warning(f"[dag] skipping {task.name}: an upstream task failed")
+                    elif task.ready_at is None and all(s == "done" for s in dep_status):
+                        task.ready_at = max((self.tasks[d].finished_at for d in task.deps), default=0.0)
+
+                # ---------------- Submit ready tasks within limits ---------------- #
+                reused = False
+                for task in [t for t in pending.values() if t.ready_at is not None]:
+                    if self._reusable(task):
+                        task.status, task.cached = "done", True
+                        task.started_at = task.finished_at = self._now()
+                        del pending[task.name]
+                        reused = True
+                        logging.info(f"[dag] {task.name}: unchanged since last run — skipped")
+                        continue
+                    if len(running) >= self.max_workers:
+                        break
+                    limit = self.limits.get(task.stage)
+                    if limit and sum(t.stage == task.stage for t in running.values()) >= limit:
+                        continue
+                    task.status = "running"
+                    task.started_at = self._now()
+                    running[executor.submit(task.fn)] = task
+                    del pending[task.name]
+
+                if not running:
+                    if reused:
+                        continue  # reused tasks may have unblocked their dependents
+                    if pending:
+                        raise RuntimeError(f"Unschedulable tasks: {sorted(pending)}")
+                    break
+
+                done, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in done:
+                    task = running.pop(future)
+                    task.finished_at = self._now()
+                    try:
+                        task.result = future.result()
+                        task.status = "done"
+                    except Exception as e:
+                        task.status = "failed"
+                        task.error = e
+                        errors.append(e)
+                        logging.error(f"[dag] {task.name} failed: {e}")
+                    self._checkpoint(task)
+
+        self._end = self._now()
+        self.log_summary()
+        if errors:
+            raise errors[0]
+        return {name: t.result for name, t in self.tasks.items() if t.status == "done"}
+
+    def critical_path(self) -> list:
+        """
+        Chain of tasks that determined the total run time.
+
+        Walks back from the last task to finish, each time following the
+        dependency that finished last.
+        """
+        finished = [t for t in self.tasks.values() if t.finished_at is not None]
+        if not finished:
+            return []
+        task = max(finished, key=lambda t: t.finished_at)
+        path = [task]
+        while task.deps:
+            task = max((self.tasks[d] for d in task.deps), key=lambda t: t.finished_at or 0.0)
+            path.append(task)
+        return path[::-1]
+
+    def report(self) -> dict:
+        """Per-task timings, the critical path and total wait time, for the run report."""
+        path = self.critical_path()
+        return {
+            "max_workers": self.max_workers,
+            "limits": self.limits,
+            "makespan_seconds": round(self._end or 0.0, 3),
+            "critical_path": [t.name for t in path],
+            "critical_path_seconds": round(sum(t.seconds for t in path), 3),
+            "critical_path_wait_seconds": round(sum(t.wait_seconds for t in path), 3),
+            "total_wait_seconds": round(sum(t.wait_seconds for t in self.tasks.values()), 3),
+            "tasks": [
+                {
+                    "name": t.name,
+                    "stage": t.stage,
+                    "table": t.table,
+                    "status": t.status,
+                    "cached": t.cached,
+                    "deps": t.deps,
+                    "ready_at": round(t.ready_at, 3) if t.ready_at is not None else None,
+                    "started_at": round(t.started_at, 3) if t.started_at is not None else None,
+                    "finished_at": round(t.finished_at, 3) if t.finished_at is not None else None,
+                    "seconds": round(t.seconds, 3),
+                    "wait_seconds": round(t.wait_seconds, 3),
+                }
+                for t in self.tasks.values()
+            ],
+        }
+
+    def log_summary(self):
+        path = self.critical_path()
+        logging.info(f"[dag] {len(self.tasks)} tasks in {self._end:.1f}s; critical path "
+                     f"{sum(t.seconds for t in path):.1f}s running + {sum(t.wait_seconds for t in path):.1f}s "
+                     f"waiting: " + " → ".join(f"{t.name} ({t.seconds:.1f}s)" for t in path))
+        waits = sorted(self.tasks.values(), key=lambda t: t.wait_seconds, reverse=True)
+        for t in waits[:3]:
+            if t.wait_seconds >= 0.1:
+                logging.info(f"[dag]   {t.name} waited {t.wait_seconds:.1f}s for a free worker")
@@ -0,0 +1,234 @@
+"""
+Typed Table Schemas for Loaded FAERS Tables
+
+This module derives typed Snowflake DDL for the processed FAERS CSVs instead
+of creating every column as STRING.
+
+Features:
+- Declared per-table column types (DECLARED_SCHEMAS) for columns with known semantics.
+- Streaming type inference over the processed CSV for all other columns:
+  NUMBER(38,0), FLOAT, DATE, TIMESTAMP_NTZ or VARCHAR(n).
+- Coerces pandas chunks to the resolved types so writes match the DDL.
+- Renders the same schema as DuckDB types for the local warehouse backend.
+- Persists the resolved schema as a JSON artifact keyed by the source file's
+  size and mtime (reused without re-inference) and logs drift between runs.
+
+Date: 2026-02-05
+"""
+
+import json
+import logging
+from pathlib import Path
+import pandas as pd
+
+INFER_CHUNK_SIZE = 500_000
+MAX_INT_DIGITS = 18  # fits int64 for pandas writes
+
+INT_RE = r"[+-]?(?:0|[1-9]\d*)"  # leading zeros (codes like NDA numbers) stay text
+LEADING_ZERO_RE = r"[+-]?0\d"
+DATE_RE = r"\d{4}-\d{2}-\d{2}"
+TIMESTAMP_RE = r"\d{4}-\d{2}-\d{2}(?:[ T]\d{2}:\d{2}:\d{2}(?:\.\d+)?)?"
+
+# ---------------- Declared Column Types ----------------
+# Applied on top of inference. transform.py writes DEMO dates via
+# pd.to_datetime and age/wt via pd.to_numeric; FAERS THER/DRUG dates
+# may be partial (YYYY or YYYYMM), so they are kept as text.
+DECLARED_COMMON = {"load_ts": "TIMESTAMP_NTZ"}
+
+DECLARED_SCHEMAS = {
+    "DEMO": {
+        "age": "FLOAT",
+        "wt": "FLOAT",
+        "event_dt": "DATE",
+        "mfr_dt": "DATE",
+        "init_fda_dt": "DATE",
+        "fda_dt": "DATE",
+        "rept_dt": "DATE",
+    },
+    "DRUG": {"exp_dt": "VARCHAR(16)"},
+    "THER": {"start_dt": "VARCHAR(16)", "end_dt": "VARCHAR(16)"},
+}
+
+
+# Snowflake base type → DuckDB type for the local warehouse backend
+DUCKDB_TYPES = {
+    "NUMBER": "BIGINT",
+    "FLOAT": "DOUBLE",
+    "DATE": "DATE",
+    "TIMESTAMP_NTZ": "TIMESTAMP",
+    "VARCHAR": "VARCHAR",
+}
+
+
+def base_type(col_type: str) -> str:
+    """Return the type name without length/precision, e.g. VARCHAR(64) → VARCHAR."""
+    return col_type.split("(")[0].upper()
+
+
+def _varchar(max_len: int) -> str:
+    """VARCHAR sized to the next power of two (min 16) to leave headroom."""
+    length = 16
+    while length < max_len:
+        length *= 2
+    return f"VARCHAR({min(length, 16_777_216)})"
+
+
+def infer_schema(csv_path, chunksize: int = INFER_CHUNK_SIZE) -> dict:
+    """
+    Infer column types for a processed CSV in one streaming pass.
+
+    A column keeps the most specific type consistent with every non-empty
+    value seen: NUMBER(38,0) ⊂ FLOAT, DATE ⊂ TIMESTAMP_NTZ, otherwise VARCHAR(n).
+
+    Args:
+        csv_path: Path to the processed CSV.
+        chunksize (int): Rows read per chunk.
+
+    Returns:
+        dict: Column name → Snowflake type, in file column order.
+    """
+    stats = {}
+    for chunk in pd.read_csv(csv_path, dtype=str, chunksize=chunksize, keep_default_na=False):
+        for col in chunk.columns:
+            st = stats.setdefault(col, {"int": True, "float": True, "date": True, "ts": True, "len": 0})
+            values = chunk[col].str.strip()
+            values = values[values != ""]
+            if values.empty:
+                continue
+
+            st["len"] = max(st["len"], int(chunk[col].str.len().max()))
+            if st["int"]:
+                st["int"] = bool(values.str.fullmatch(INT_RE).all()) and \
+                    int(values.str.lstrip("+-").str.len().max()) <= MAX_INT_DIGITS
+            if st["float"] and not st["int"]:
+                st["float"] = not values.str.match(LEADING_ZERO_RE).any() and \
+                    bool(pd.to_numeric(values, errors="coerce").notna().all())
+            if st["ts"]:
+                st["ts"] = bool(values.str.fullmatch(TIMESTAMP_RE).all()) and \
+                    bool(pd.to_datetime(values, errors="coerce", format="ISO8601").notna().all())
+            st["date"] = st["date"] and st["ts"] and bool(values.str.fullmatch(DATE_RE).all())
+
+    # Header-only files still get a column list
+    if not stats:
+        stats = {col: {"int": False, "float": False, "date": False, "ts": False, "len": 0}
+                 for col in pd.read_csv(csv_path, nrows=0).columns}
+
+    inferred = {}
+    for col, st in stats.items():
+        if st["len"] == 0:
+            inferred[col] = _varchar(0)  # all empty: no evidence for a narrower type
+        elif st["int"]:
+            inferred[col] = "NUMBER(38,0)"
+        elif st["float"]:
+            inferred[col] = "FLOAT"
+        elif st["date"]:
+            inferred[col] = "DATE"
+        elif st["ts"]:
+            inferred[col] = "TIMESTAMP_NTZ"
+        else:
+            inferred[col] = _varchar(st["len"])
+    return inferred
+
+
+def schema_path(csv_path, table: str) -> Path:
+    """Location of the schema JSON artifact for a processed CSV."""
+    return Path(csv_path).parent / "schemas" / f"{table.upper()}.json"
+
+
+def diff_schemas(old: dict, new: dict) -> dict:
+    """
+    Compare two column → type mappings.
+
+    Returns:
+        dict: added, removed and changed ({col: [old, new]}) columns.
+    """
+    return {
+        "added": [c for c in new if c not in old],
+        "removed": [c for c in old if c not in new],
+        "changed": {c: [old[c], new[c]] for c in new if c in old and old[c] != new[c]},
+    }
+
+
+def resolve_schema(csv_path, table: str, declared: dict = None) -> dict:
+    """
+    Resolve the typed schema for a table and persist it as a JSON artifact.
+
+    Declared types override inferred ones. If the artifact already describes
+    the same source file (size and mtime), it is reused without a new pass.
+    Otherwise the schema is inferred, compared to the previous artifact and
+    any drift is logged.
+
+    Args:
+        csv_path: Path to the processed CSV.
+        table (str): Table name (e.g. DEMO).
+        declared (dict): Column → type overrides (defaults to DECLARED_SCHEMAS).
+
+    Returns:
+        dict: Column name → Snowflake type, in file column order.
+    """
+    csv_path = Path(csv_path)
+    stat = csv_path.stat()
+    source = {"file": csv_path.name, "size": stat.st_size, "mtime_ns": stat.st_mtime_ns}
+    artifact = schema_path(csv_path, table)
+    if declared is None:
+        declared = {**DECLARED_COMMON, **DECLARED_SCHEMAS.get(table.upper(), {})}
+
+    previous = None
+    if artifact.exists():
+        try:
+            with open(artifact, "r") as f:
+                previous = json.load(f)
+        except ValueError:
+            logging.warning(f"Ignoring unreadable schema artifact '{artifact.name}'")
+
+    if previous and previous.get("source") == source and previous.get("declared") == declared:
+        return previous["columns"]
+
+    columns = infer_schema(csv_path)
+    for col, col_type in declared.items():
+        if col in columns:
+            columns[col] = col_type
+
+    drift = None
+    if previous:
+        drift = diff_schemas(previous.get("columns", {}), columns)
+        if any(drift.values()):
+            logging.warning(f"Schema drift in {table.upper()}: {drift}")
+
+    artifact.parent.mkdir(parents=True, exist_ok=True)
+    with open(artifact, "w") as f:
+        json.dump({"table": table.upper(), "source": source, "declared": declared,
+                   "columns": columns, "drift": drift}, f, indent=2)
+    return columns
+
+
+def columns_ddl(table_schema: dict) -> str:
+    """Render 'COL TYPE, ...' for CREATE TABLE with uppercased column names."""
+    return ", ".join(f"{col.upper()} {col_type}" for col, col_type in table_schema.items())
+
+
+def to_duckdb_type(col_type: str) -> str:
+    """Map a Snowflake column type to its DuckDB equivalent (VARCHAR length is dropped)."""
+    return DUCKDB_TYPES.get(base_type(col_type), "VARCHAR")
+
+
+def coerce_to_schema(df: pd.DataFrame, table_schema: dict) -> pd.DataFrame:
+    """
+    Convert a string-typed chunk to the resolved column types.
+
+    Unparseable values become nulls, matching the transform stage's errors='coerce'.
+    """
+    for col, col_type in table_schema.items():
+        if col not in df.columns:
+            continue
+        kind = base_type(col_type)
+        if kind == "NUMBER":
+            df[col] = pd.to_numeric(df[col], errors="coerce").astype("Int64")
+        elif kind == "FLOAT":
+            df[col] = pd.to_numeric(df[col], errors="coerce").astype("float64")
+        elif kind == "DATE":
+            dates = pd.to_datetime(df[col], errors="coerce", format="ISO8601")
+            df[col] = dates.dt.date.where(dates.notna(), None)
+        elif kind == "TIMESTAMP_NTZ":
+            df[col] = pd.to_datetime(df[col], errors="coerce", format="ISO8601")
+    return df
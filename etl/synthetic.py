@@ -0,0 +1,359 @@
+"""
+Seeded Synthetic FAERS Data Generator
+
+This script writes realistic, `$`-delimited FAERS ASCII files (and the FDA
+quarterly ZIP layout) at a configurable scale, so the chunked extract,
+transform, validation and load paths can be exercised and benchmarked
+without downloading the real 11.5M-row extracts.
+
+Features:
+- Same file names and columns as the FDA exports (DEMO25Q1.txt, ...), for
+  DEMO, DRUG, REAC, OUTC, RPSR, INDI and THER.
+- Referentially consistent: every child row's primaryid/caseid belongs to a
+  DEMO report; primaryid = caseid followed by the case version.
+- Realistic shape: ~14 rows per report across tables, Zipf-distributed drug
+  names and reactions, follow-up case versions in the same or next quarter,
+  a small rate of exact duplicate rows, and 1–3 INDI / THER rows per drug
+  sequence (several indications or therapy periods for one drug).
+- Deterministic for a given seed; generated in blocks of cases with
+  vectorized numpy, so 10M+ rows fit in bounded memory.
+
+Date: 2026-02-05
+"""
+
+import logging
+import zipfile
+from pathlib import Path
+import numpy as np
+import pandas as pd
+
+# ---------------- FAERS Columns ----------------
+TABLE_COLUMNS = {
+    "DEMO": ["primaryid", "caseid", "caseversion", "i_f_code", "event_dt", "mfr_dt", "init_fda_dt",
+             "fda_dt", "rept_cod", "auth_num", "mfr_num", "mfr_sndr", "lit_ref", "age", "age_cod",
+             "age_grp", "sex", "e_sub", "wt", "wt_cod", "rept_dt", "to_mfr", "occp_cod",
+             "reporter_country", "occr_country"],
+    "DRUG": ["primaryid", "caseid", "drug_seq", "role_cod", "drugname", "prod_ai", "val_vbm", "route",
+             "dose_vbm", "cum_dose_chr", "cum_dose_unit", "dechal", "rechal", "lot_num", "exp_dt",
+             "nda_num", "dose_amt", "dose_unit", "dose_form", "dose_freq"],
+    "REAC": ["primaryid", "caseid", "pt", "drug_rec_act"],
+    "OUTC": ["primaryid", "caseid", "outc_cod"],
+    "RPSR": ["primaryid", "caseid", "rpsr_cod"],
+    "INDI": ["primaryid", "caseid", "indi_drug_seq", "indi_pt"],
+    "THER": ["primaryid", "caseid", "dsg_drug_seq", "start_dt", "end_dt", "dur", "dur_cod"],
+}
+
+# Mean rows per report, matching the 2025 Q1–Q2 extracts (~11.5M rows, ~14 per DEMO row)
+ROWS_PER_REPORT = {"DEMO": 1.0, "DRUG": 4.5, "REAC": 3.5, "INDI": 2.8, "THER": 1.4, "OUTC": 0.8, "RPSR": 0.05}
+# Share of referenced drugs with 1, 2 or 3 INDI (indications) / THER (therapy periods) rows
+ROWS_PER_DRUG = {"INDI": np.array([0.6, 0.3, 0.1]), "THER": np.array([0.75, 0.2, 0.05])}
+
+# ---------------- Value Vocabularies ----------------
+ANTIDEPRESSANTS = ["SERTRALINE", "FLUOXETINE", "CITALOPRAM", "ESCITALOPRAM", "VENLAFAXINE",
+                   "DULOXETINE", "BUPROPION", "TRAZODONE", "AMITRIPTYLINE"]
+COMMON_DRUGS = ["ASPIRIN", "METFORMIN", "ATORVASTATIN", "LISINOPRIL", "HUMIRA", "DUPIXENT",
+                "OZEMPIC", "PREDNISONE", "OMEPRAZOLE", "LEVOTHYROXINE", "INSULIN GLARGINE",
+                "ACETAMINOPHEN", "IBUPROFEN", "AMLODIPINE", "GABAPENTIN", "METHOTREXATE"]
+COMMON_PTS = ["Nausea", "Fatigue", "Headache", "Drug ineffective", "Off label use", "Diarrhoea",
+              "Dizziness", "Death", "Pain", "Vomiting", "Rash", "Dyspnoea", "Insomnia", "Anxiety",
+              "Depression", "Product dose omission issue", "Weight increased", "Pruritus"]
+COMMON_INDICATIONS = ["Depression", "Product used for unknown indication", "Hypertension",
+                      "Rheumatoid arthritis", "Type 2 diabetes mellitus", "Pain", "Anxiety",
+                      "Psoriasis", "Atopic dermatitis", "Multiple sclerosis"]
+N_DRUG_NAMES = 5_000
+N_PTS = 3_000
+N_INDICATIONS = 1_500
+
+COUNTRIES = np.array(["US", "GB", "CA", "DE", "FR", "JP", "BR", "IT", "ES", "AU", "IN", "CN"])
+COUNTRY_WEIGHTS = np.array([0.55, 0.07, 0.06, 0.05, 0.05, 0.05, 0.04, 0.03, 0.03, 0.03, 0.02, 0.02])
+OUTC_CODES = np.array(["OT", "HO", "DE", "LT", "DS", "RI", "CA"])
+OUTC_WEIGHTS = np.array([0.50, 0.28, 0.10, 0.05, 0.04, 0.02, 0.01])
+RPSR_CODES = np.array(["FGN", "CSM", "HP"])  # the set dim_reporter accepts
+ROLE_CODES = np.array(["PS", "SS", "C", "I"])
+ROUTES = np.array(["ORAL", "SUBCUTANEOUS", "INTRAVENOUS", "TOPICAL", "UNKNOWN", ""])
+DOSE_UNITS = np.array(["MG", "ML", "UG", "G", ""])
+DOSE_FREQS = np.array(["QD", "BID", "TID", "QW", "PRN", ""])
+DOSE_FORMS = np.array(["TABLET", "CAPSULE", "INJECTION", "SOLUTION", ""])
+SEXES = np.array(["F", "M", ""])
+OCCUPATIONS = np.array(["CN", "MD", "HP", "PH", "LW"])
+
+BLOCK_SIZE = 250_000  # cases generated per block
+
+
+def _vocabulary(common: list, size: int, prefix: str) -> np.ndarray:
+    """Real high-frequency names followed by synthetic long-tail names."""
+    tail = [f"{prefix} {i:05d}" for i in range(size - len(common))]
+    return np.array(common + tail, dtype=object)
+
+
+def _zipf_weights(size: int, exponent: float = 1.1) -> np.ndarray:
+    weights = 1.0 / np.arange(1, size + 1) ** exponent
+    return weights / weights.sum()
+
+
+DRUG_NAMES = _vocabulary(ANTIDEPRESSANTS + COMMON_DRUGS, N_DRUG_NAMES, "DRUG")
+PTS = _vocabulary(COMMON_PTS, N_PTS, "Reaction")
+INDICATIONS = _vocabulary(COMMON_INDICATIONS, N_INDICATIONS, "Indication")
+DRUG_WEIGHTS = _zipf_weights(N_DRUG_NAMES)
+PT_WEIGHTS = _zipf_weights(N_PTS)
+INDICATION_WEIGHTS = _zipf_weights(N_INDICATIONS)
+
+
+def cases_for_rows(total_rows: int, followup_rate: float = 0.15) -> int:
+    """Number of cases that yields roughly `total_rows` rows across all tables."""
+    rows_per_case = sum(ROWS_PER_REPORT.values()) * (1 + followup_rate)
+    return max(1, int(round(total_rows / rows_per_case)))
+
+
+def _format_dates(values: np.ndarray) -> np.ndarray:
+    """datetime64 days → YYYYMMDD strings (object array)."""
+    return np.char.replace(np.datetime_as_string(values, unit="D"), "-", "").astype(object)
+
+
+def _dates(rng, n: int, start: str, days: int, blank_rate: float = 0.0) -> np.ndarray:
+    """YYYYMMDD strings uniformly spread over `days` days from `start`."""
+    out = _format_dates(np.datetime64(start) + rng.integers(0, days, n).astype("timedelta64[D]"))
+    if blank_rate:
+        out[rng.random(n) < blank_rate] = ""
+    return out
+
+
+def _quarter_start(quarter: str) -> str:
+    """25Q2 → 2025-04-01"""
+    year, q = 2000 + int(quarter[:2]), int(quarter[-1])
+    return f"{year}-{3 * (q - 1) + 1:02d}-01"
+
+
+def _child_rows(rng, reports: pd.DataFrame, mean: float, at_least_one: bool,
+                max_counts: np.ndarray = None) -> pd.DataFrame:
+    """Repeat report keys by a Poisson count per report; adds a 1-based `seq` per report."""
+    lam = mean - 1 if at_least_one else mean
+    counts = rng.poisson(lam, len(reports)) + (1 if at_least_one else 0)
+    if max_counts is not None:
+        counts = np.minimum(counts, max_counts)
+    idx = np.repeat(np.arange(len(reports)), counts)
+    rows = reports.iloc[idx][["primaryid", "caseid", "quarter"]].reset_index(drop=True)
+    starts = np.repeat(np.cumsum(counts) - counts, counts)
+    rows["seq"] = np.arange(len(rows)) - starts + 1
+    return rows
+
+
+def _per_drug_rows(rng, rows: pd.DataFrame, weights: np.ndarray) -> pd.DataFrame:
+    """Repeat each referenced drug 1–len(weights) times; adds a 0-based `period` per drug."""
+    counts = rng.choice(np.arange(1, len(weights) + 1), len(rows), p=weights)
+    out = rows.iloc[np.repeat(np.arange(len(rows)), counts)].reset_index(drop=True)
+    out["period"] = np.arange(len(out)) - np.repeat(np.cumsum(counts) - counts, counts)
+    return out
+
+
+def _with_duplicates(rng, df: pd.DataFrame, rate: float) -> pd.DataFrame:
+    """Append exact copies of a random `rate` fraction of rows (FAERS ships some)."""
+    if not rate or df.empty:
+        return df
+    dupes = df[rng.random(len(df)) < rate]
+    return pd.concat([df, dupes]).sort_values("primaryid", kind="stable")
+
+
+def _generate_block(rng, first_case: int, n_cases: int, quarters: list,
+                    followup_rate: float) -> dict:
+    """Generate every table for cases [first_case, first_case + n_cases)."""
+    # ---------------- Reports (case versions) ---------------- #
+    caseids = 10_000_000 + first_case + np.arange(n_cases)
+    versions = 1 + (rng.random(n_cases) < followup_rate) + (rng.random(n_cases) < followup_rate / 5)
+    case_idx = np.repeat(np.arange(n_cases), versions)
+    version = np.arange(len(case_idx)) - np.repeat(np.cumsum(versions) - versions, versions) + 1
+    first_quarter = rng.integers(0, len(quarters), n_cases)[case_idx]
+    quarter_idx = np.minimum(first_quarter + (version > 1) * rng.integers(0, 2, len(case_idx)),
+                             len(quarters) - 1)
+
+    n = len(case_idx)
+    reports = pd.DataFrame({
+        "caseid": caseids[case_idx].astype(str),
+        "caseversion": version.astype(str),
+        "quarter": np.array(quarters, dtype=object)[quarter_idx],
+    })
+    reports["primaryid"] = reports["caseid"] + reports["caseversion"]
+
+    # ---------------- DEMO ---------------- #
+    ages = rng.gamma(6.0, 9.0, n).clip(0, 105).round().astype(int).astype(str).astype(object)
+    ages[rng.random(n) < 0.3] = ""
+    weights = rng.normal(78, 20, n).clip(3, 250).round(1).astype(str).astype(object)
+    weights[rng.random(n) < 0.7] = ""
+    fda_dt = np.empty(n, dtype=object)
+    for q in quarters:
+        mask = (reports["quarter"] == q).to_numpy()
+        fda_dt[mask] = _dates(rng, int(mask.sum()), _quarter_start(q), 90)
+    demo = pd.DataFrame({
+        "primaryid": reports["primaryid"],
+        "caseid": reports["caseid"],
+        "caseversion": reports["caseversion"],
+        "i_f_code": np.where(version == 1, "I", "F"),
+        "event_dt": _dates(rng, n, "2023-01-01", 800, blank_rate=0.4),
+        "mfr_dt": _dates(rng, n, "2024-06-01", 300, blank_rate=0.3),
+        "init_fda_dt": _dates(rng, n, "2024-06-01", 300),
+        "fda_dt": fda_dt,
+        "rept_cod": rng.choice(np.array(["EXP", "PER", "DIR", "5DAY"]), n, p=[0.75, 0.2, 0.04, 0.01]),
+        "auth_num": "",
+        "mfr_num": np.char.add("MFR-", rng.integers(0, 10**9, n).astype(str)).astype(object),
+        "mfr_sndr": rng.choice(np.array(["PFIZER", "ABBVIE", "NOVARTIS", "FDA-CTU", "LILLY"]), n),
+        "lit_ref": "",
+        "age": ages,
+        "age_cod": np.where(ages == "", "", "YR"),
+        "age_grp": "",
+        "sex": rng.choice(SEXES, n, p=[0.58, 0.37, 0.05]),
+        "e_sub": "Y",
+        "wt": weights,
+        "wt_cod": np.where(weights == "", "", "KG"),
+        "rept_dt": _dates(rng, n, "2024-10-01", 270),
+        "to_mfr": "",
+        "occp_cod": rng.choice(OCCUPATIONS, n, p=[0.45, 0.25, 0.2, 0.08, 0.02]),
+        "reporter_country": rng.choice(COUNTRIES, n, p=COUNTRY_WEIGHTS),
+        "occr_country": rng.choice(COUNTRIES, n, p=COUNTRY_WEIGHTS),
+        "quarter": reports["quarter"],
+    })
+
+    # ---------------- DRUG ---------------- #
+    drug = _child_rows(rng, reports, ROWS_PER_REPORT["DRUG"], at_least_one=True)
+    m = len(drug)
+    drugs_per_report = reports["primaryid"].map(drug["primaryid"].value_counts()).to_numpy()
+    names = rng.choice(DRUG_NAMES, m, p=DRUG_WEIGHTS)
+    drug = drug.assign(
+        drug_seq=drug["seq"].astype(str),
+        role_cod=np.where(drug["seq"] == 1, "PS", rng.choice(ROLE_CODES[1:], m, p=[0.3, 0.65, 0.05])),
+        drugname=names,
+        prod_ai=names,
+        val_vbm=rng.choice(np.array(["1", "2"]), m, p=[0.9, 0.1]),
+        route=rng.choice(ROUTES, m),
+        dose_vbm="",
+        cum_dose_chr="",
+        cum_dose_unit="",
+        dechal=rng.choice(np.array(["Y", "N", "U", "D", ""]), m),
+        rechal=rng.choice(np.array(["Y", "N", "U", "D", ""]), m),
+        lot_num="",
+        exp_dt="",
+        nda_num=rng.choice(np.array(["019839", "020031", "021427", "125057", ""]), m),
+        dose_amt=rng.choice(np.array(["10", "20", "50", "100", ""]), m),
+        dose_unit=rng.choice(DOSE_UNITS, m),
+        dose_form=rng.choice(DOSE_FORMS, m),
+        dose_freq=rng.choice(DOSE_FREQS, m),
+    )
+
+    # ---------------- REAC / OUTC / RPSR ---------------- #
+    reac = _child_rows(rng, reports, ROWS_PER_REPORT["REAC"], at_least_one=True)
+    reac = reac.assign(pt=rng.choice(PTS, len(reac), p=PT_WEIGHTS), drug_rec_act="")
+
+    outc = _child_rows(rng, reports, ROWS_PER_REPORT["OUTC"], at_least_one=False)
+    outc = outc.assign(outc_cod=rng.choice(OUTC_CODES, len(outc), p=OUTC_WEIGHTS))
+
+    rpsr = reports[rng.random(n) < ROWS_PER_REPORT["RPSR"]].reset_index(drop=True)
+    rpsr = rpsr.assign(rpsr_cod=rng.choice(RPSR_CODES, len(rpsr)))
+
+    # ---------------- INDI / THER (reference DRUG sequence numbers) ---------------- #
+    # A referenced drug gets 1–3 rows: distinct indications, or consecutive therapy periods
+    indi_rows_per_drug = (ROWS_PER_DRUG["INDI"] * np.arange(1, 4)).sum()
+    indi = _child_rows(rng, reports, ROWS_PER_REPORT["INDI"] / indi_rows_per_drug, at_least_one=False,
+                       max_counts=drugs_per_report)
+    indi = indi.assign(first_indication=rng.choice(N_INDICATIONS, len(indi), p=INDICATION_WEIGHTS))
+    indi = _per_drug_rows(rng, indi, ROWS_PER_DRUG["INDI"])
+    indication = (indi["first_indication"] - indi["period"]) % N_INDICATIONS
+    indi = indi.assign(indi_drug_seq=indi["seq"].astype(str), indi_pt=INDICATIONS[indication.to_numpy()])
+
+    ther_rows_per_drug = (ROWS_PER_DRUG["THER"] * np.arange(1, 4)).sum()
+    ther = _child_rows(rng, reports, ROWS_PER_REPORT["THER"] / ther_rows_per_drug, at_least_one=False,
+                       max_counts=drugs_per_report)
+    ther = ther.assign(first_day=rng.integers(0, 1200, len(ther)))
+    ther = _per_drug_rows(rng, ther, ROWS_PER_DRUG["THER"])
+    k = len(ther)
+    # Periods start ≥ 90 days apart, so start months stay distinct even for partial dates
+    period = ther["period"].to_numpy()
+    start = (np.datetime64("2022-01-01") + (ther["first_day"].to_numpy() + period * 120
+                                            + rng.integers(0, 30, k)).astype("timedelta64[D]"))
+    single = ther.groupby(["primaryid", "seq"], sort=False)["period"].transform("max").to_numpy() == 0
+    start_dt = _format_dates(start)
+    start_dt[single & (rng.random(k) < 0.3)] = ""  # only single-period drugs lack a start date
+    end_dt = _format_dates(start + rng.integers(14, 90, k).astype("timedelta64[D]"))
+    end_dt[rng.random(k) < 0.6] = ""
+    ther = ther.assign(
+        dsg_drug_seq=ther["seq"].astype(str),
+        start_dt=start_dt,
+        end_dt=end_dt,
+        dur=np.where(rng.random(k) < 0.8, "", rng.integers(1, 365, k).astype(str)),
+        dur_cod="",
+    )
+    # Partial dates (YYYY / YYYYMM) are common in THER
+    partial = rng.random(k) < 0.1
+    ther.loc[partial, "start_dt"] = ther.loc[partial, "start_dt"].str[:6]
+
+    return {"DEMO": demo, "DRUG": drug, "REAC": reac, "OUTC": outc,
+            "RPSR": rpsr, "INDI": indi, "THER": ther}
+
+
+def generate_faers(out_dir: Path, n_cases: int, quarters=("25Q1", "25Q2"), seed: int = 42,
+                   followup_rate: float = 0.15, duplicate_rate: float = 0.002,
+                   block_size: int = BLOCK_SIZE) -> dict:
+    """
+    Write synthetic FAERS ASCII files (e.g. DEMO25Q1.txt) for `n_cases` cases.
+
+    Args:
+        out_dir (Path): Directory for the `$`-delimited TXT files.
+        n_cases (int): Number of distinct caseids (reports include follow-up versions).
+        quarters: Quarters to spread reports over, oldest first.
+        seed (int): Random seed; output is identical for the same seed and block_size.
+        followup_rate (float): Share of cases with a second (or third) version.
+        duplicate_rate (float): Share of rows written twice as exact duplicates.
+        block_size (int): Cases generated per block (bounds memory).
+
+    Returns:
+        dict: File name → rows written (excluding header).
+    """
+    out_dir = Path(out_dir)
+    out_dir.mkdir(parents=True, exist_ok=True)
+    quarters = list(quarters)
+    for table in TABLE_COLUMNS:
+        for q in quarters:
+            (out_dir / f"{table}{q}.txt").unlink(missing_ok=True)
+
+    written = {f"{table}{q}.txt": 0 for table in TABLE_COLUMNS for q in quarters}
+    for block_no, first_case in enumerate(range(0, n_cases, block_size)):
+        rng = np.random.default_rng([seed, block_no])
+        tables = _generate_block(rng, first_case, min(block_size, n_cases - first_case),
+                                 quarters, followup_rate)
+        for table, df in tables.items():
+            df = _with_duplicates(rng, df, duplicate_rate)
+            for q, part in df.groupby("quarter", sort=False):
+                name = f"{table}{q}.txt"
+                path = out_dir / name
+                part[TABLE_COLUMNS[table]].to_csv(path, sep="$", index=False,
+                                                  header=not path.exists(), mode="a")
+                written[name] += len(part)
+        logging.info(f"Generated cases {first_case:,}–{min(first_case + block_size, n_cases):,} "
+                     f"({sum(written.values()):,} rows so far)")
+
+    # Quarters with no rows in the first block still need a header
+    for name, rows in written.items():
+        path = out_dir / name
+        if not path.exists():
+            table = name[:4]
+            path.write_text("$".join(TABLE_COLUMNS[table]) + "\n")
+    return written
+
+
+def write_faers_zips(raw_dir: Path, zip_dir: Path, quarters=("25Q1", "25Q2")) -> list:
+    """
+    Package generated TXT files like the FDA exports: FAERS_ASCII_2025Q1.zip with ASCII/*.txt.
+
+    Returns:
+        list[Path]: Paths of the written ZIP files.
+    """
+    zip_dir = Path(zip_dir)
+    zip_dir.mkdir(parents=True, exist_ok=True)
+    zips = []
+    for q in quarters:
+        path = zip_dir / f"FAERS_ASCII_20{q}.zip"
+        with zipfile.ZipFile(path, "w", compression=zipfile.ZIP_DEFLATED, compresslevel=1) as z:
+            for table in TABLE_COLUMNS:
+                txt = Path(raw_dir) / f"{table}{q}.txt"
+                if txt.exists():
+                    z.write(txt, arcname=f"ASCII/{txt.name}")
+        zips.append(path)
+    return zips
@@ -14,6 +14,9 @@ Features:
 - Merges and outputs transformed CSVs to a specified output directory.
 - Streams large files in chunks for memory efficiency.
 - Adds load timestamps and ensures consistent column naming and types.
+- Tags every row with its source quarter (e.g. 25Q1) for incremental loads.
+- Records per-table time, rows, bytes and peak memory in the run report.
+- Writes each merged CSV atomically (temp file + rename) for resumable runs.
 
 Date: 2026-02-05
 """
@@ -21,8 +24,10 @@ Date: 2026-02-05
 import pandas as pd
 from pathlib import Path
 import logging
+import os
 from datetime import datetime
 import gc
+from etl.instrumentation import stage
 
 logging.basicConfig(level=logging.INFO, format="%(message)s")
 
@@ -107,20 +112,43 @@ def merge_and_transform_one_by_one(raw_dir: Path, output_dir: Path):
     """
     output_dir.mkdir(parents=True, exist_ok=True)
 
-    # Remove old merged outputs
-    for f in output_dir.glob("merged_*.csv"):
-        f.unlink()
-
     all_files = list(raw_dir.glob("*.txt"))
     table_prefixes = set(f.stem[:-4] for f in all_files)
 
+    # Remove stale merged outputs of groups no longer present; the rest are replaced per group
+    current = {f"merged_{p.lower()}" for p in table_prefixes}
+    for f in output_dir.glob("merged_*.csv"):
+        if f.stem not in current:
+            f.unlink()
+
     for prefix in table_prefixes:
-        logging.info(f">>> Processing Group: {prefix}")
-        out_file = output_dir / f"merged_{prefix.lower()}.csv"
-        first_chunk = True
+        transform_group(prefix, raw_dir, output_dir)
+
 
-        for f in raw_dir.glob(f"{prefix}*.txt"):
+def transform_group(prefix: str, raw_dir: Path, output_dir: Path) -> Path:
+    """
+    Stream every quarter file of one table group (e.g. DEMO25Q1/DEMO25Q2.txt)
+    through its transform into merged_<prefix>.csv.
+
+    Independent of other groups, so groups can run as parallel DAG tasks.
+    Output is written to a temporary file and renamed when complete, so an
+    interrupted run never leaves a partial merged CSV behind.
+
+    Returns:
+        Path: The merged output CSV.
+    """
+    output_dir.mkdir(parents=True, exist_ok=True)
+    logging.info(f">>> Processing Group: {prefix}")
+    out_file = output_dir / f"merged_{prefix.lower()}.csv"
+    tmp_file = out_file.with_suffix(".csv.tmp")
+    tmp_file.unlink(missing_ok=True)
+    first_chunk = True
+
+    with stage("transform", table=prefix.upper()) as st:
+        for f in sorted(raw_dir.glob(f"{prefix}*.txt")):
             logging.info(f"  Streaming {f.name}...")
+            source_quarter = f.stem[len(prefix):]  # DEMO25Q1 → 25Q1
+            st.add(n_bytes=f.stat().st_size)
 
             chunk_iter = pd.read_csv(f, sep="$", dtype=str, low_memory=True, chunksize=100_000)
 
@@ -131,11 +159,16 @@ def merge_and_transform_one_by_one(raw_dir: Path, output_dir: Path):
                     chunk = transform_drug(chunk)
                 else:
                     chunk = transform_generic(chunk, prefix)
+                chunk["source_quarter"] = source_quarter
 
-                chunk.to_csv(out_file, mode='a', index=False, header=first_chunk)
+                chunk.to_csv(tmp_file, mode='a', index=False, header=first_chunk)
                 first_chunk = False
+                st.add(rows=len(chunk))
 
                 del chunk
                 gc.collect()
 
-        logging.info(f"Successfully finalized: {out_file.name}")
+    if tmp_file.exists():
+        os.replace(tmp_file, out_file)
+    logging.info(f"Successfully finalized: {out_file.name}")
+    return out_file
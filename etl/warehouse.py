@@ -0,0 +1,218 @@
+"""
+Pluggable Warehouse Backends for the Load Stage
+
+This script hides the target warehouse behind a small interface so the load
+stage (and dbt) can run against Snowflake in CI or a local DuckDB file offline.
+
+Features:
+- WarehouseBackend interface: load_tables(), table_counts(), close().
+- SnowflakeBackend: pooled, concurrent loads via load_tables_concurrently,
+  honouring LOAD_MODE / SNOWFLAKE_LOAD_METHOD.
+- DuckDBBackend: loads processed CSV/Parquet outputs natively with DuckDB's
+  reader into ETL_TESTING.FDA using the typed schema from etl.schema. Each
+  operation opens and closes its own connection, so the file lock is released
+  between loads and dbt-duckdb can open the warehouse in the same run.
+- get_backend() selects a backend by name (WAREHOUSE_BACKEND).
+
+Date: 2026-02-05
+"""
+
+import logging
+import os
+import threading
+import time
+from contextlib import contextmanager
+from pathlib import Path
+
+from etl.schema import resolve_schema, to_duckdb_type
+from etl.instrumentation import stage
+
+FAERS_TABLES = ["DEMO", "DRUG", "INDI", "OUTC", "REAC", "RPSR", "THER"]
+
+
+def _table_name(path) -> str:
+    """merged_drug.csv → DRUG"""
+    return Path(path).stem.replace("merged_", "").upper()
+
+
+class WarehouseBackend:
+    """Interface for a warehouse that receives the processed FAERS tables."""
+
+    name = "base"
+
+    def load_tables(self, files) -> dict:
+        """Load processed files; return table → {"rows", "bytes", "seconds", "rows_per_sec"}."""
+        raise NotImplementedError
+
+    def load_file(self, path) -> dict:
+        """Load one processed file (safe to call from parallel tasks); return its stats."""
+        raise NotImplementedError
+
+    def table_counts(self, tables=FAERS_TABLES) -> dict:
+        """Return table → row count for loaded tables."""
+        raise NotImplementedError
+
+    def close(self):
+        """Release connections."""
+
+
+class SnowflakeBackend(WarehouseBackend):
+    """Snowflake target using a connection pool and concurrent table loads."""
+
+    name = "snowflake"
+
+    def __init__(self, concurrency: int = None):
+        from db.snowflake_conn import SnowflakeConnectionPool
+
+        self.concurrency = concurrency or int(os.environ.get("LOAD_CONCURRENCY", "3"))
+        self.pool = SnowflakeConnectionPool(size=self.concurrency)
+
+    @staticmethod
+    def load_table(csv_path, table: str, conn) -> int:
+        """
+        Load one table and return the rows loaded.
+
+        LOAD_MODE=incremental merges only changed source quarters (FULL_REFRESH=1
+        reloads the table and resets its watermarks); otherwise the table is
+        recreated with the method selected by SNOWFLAKE_LOAD_METHOD.
+        """
+        from etl.load import load_csv_to_snowflake, stage_csv_to_snowflake
+        from etl.incremental import load_csv_incremental
+
+        logging.info(f"Loading {Path(csv_path).name} → {table}")
+        if os.environ.get("LOAD_MODE") == "incremental":
+            result = load_csv_incremental(conn=conn, csv_path=csv_path, table=table,
+                                          full_refresh=os.environ.get("FULL_REFRESH") == "1")
+            return result["rows_staged"]
+        if os.environ.get("SNOWFLAKE_LOAD_METHOD") == "copy":
+            file_results = stage_csv_to_snowflake(conn=conn, csv_path=csv_path, table=table)
+            return sum(r["rows_loaded"] for r in file_results)
+        return load_csv_to_snowflake(conn=conn, csv_path=csv_path, table=table)
+
+    def load_file(self, path) -> dict:
+        from etl.load import load_table_from_pool
+
+        return load_table_from_pool(path, self.pool, loader=self.load_table)[1]
+
+    def load_tables(self, files) -> dict:
+        from etl.load import load_tables_concurrently
+
+        logging.info(f"Loading into Snowflake with up to {self.concurrency} connections...")
+        return load_tables_concurrently(files, pool=self.pool, max_workers=self.concurrency,
+                                        loader=self.load_table)
+
+    def table_counts(self, tables=FAERS_TABLES) -> dict:
+        counts = {}
+        with self.pool.connection() as conn:
+            cs = conn.cursor()
+            for table in tables:
+                cs.execute(f"SELECT COUNT(*) FROM {table}")
+                counts[table] = cs.fetchone()[0]
+            cs.close()
+        return counts
+
+    def close(self):
+        self.pool.close()
+        logging.info("Snowflake connections closed")
+
+
+class DuckDBBackend(WarehouseBackend):
+    """Local DuckDB target; the file is named ETL_TESTING.duckdb to match dbt sources."""
+
+    name = "duckdb"
+
+    def __init__(self, path=None, schema: str = "FDA"):
+        from db.duckdb_conn import DEFAULT_DUCKDB_PATH
+
+        self.path = Path(path or os.environ.get("DUCKDB_PATH", DEFAULT_DUCKDB_PATH))
+        self.schema = schema
+        self._lock = threading.Lock()  # one writer at a time; DuckDB parallelizes each load internally
+        with self.connection() as conn:
+            conn.execute(f"CREATE SCHEMA IF NOT EXISTS {schema}")
+
+    @contextmanager
+    def connection(self):
+        """
+        Open a short-lived connection to the warehouse file.
+
+        DuckDB locks the file for as long as a connection is open, so no
+        connection is kept between operations; otherwise dbt-duckdb could not
+        open the warehouse while this process is alive.
+        """
+        from db.duckdb_conn import get_duckdb_connection
+
+        conn = get_duckdb_connection(self.path)
+        try:
+            yield conn
+        finally:
+            conn.close()
+
+    def load_table(self, path, table: str) -> int:
+        """Create or replace one table from a processed CSV or Parquet file; return rows."""
+        path = Path(path)
+        target = f"{self.schema}.{table}"
+        with self.connection() as conn:
+            if path.suffix == ".parquet":
+                conn.execute(f"CREATE OR REPLACE TABLE {target} AS SELECT * FROM read_parquet(?)",
+                             [str(path)])
+            else:
+                columns = {col.upper(): to_duckdb_type(col_type)
+                           for col, col_type in resolve_schema(path, table).items()}
+                columns_sql = ", ".join(f"'{col}': '{col_type}'" for col, col_type in columns.items())
+                conn.execute(
+                    f"CREATE OR REPLACE TABLE {target} AS SELECT * FROM read_csv(?, header = true, "
+                    f"columns = {{{columns_sql}}}, quote = '\"', escape = '\"', nullstr = '')",
+                    [str(path)]
+                )
+            return conn.execute(f"SELECT COUNT(*) FROM {target}").fetchone()[0]
+
+    def load_file(self, path) -> dict:
+        table = _table_name(path)
+        with self._lock, stage("load", table=table) as st:
+            start = time.perf_counter()
+            rows = self.load_table(path, table)
+            seconds = time.perf_counter() - start
+            st.add(rows=rows, n_bytes=Path(path).stat().st_size)
+        stats = {
+            "rows": rows,
+            "bytes": Path(path).stat().st_size,
+            "seconds": seconds,
+            "rows_per_sec": rows / seconds if seconds else 0.0,
+        }
+        logging.info(f"{table} loaded into DuckDB: {rows} rows in {seconds:.1f}s "
+                     f"({stats['rows_per_sec']:,.0f} rows/sec)")
+        return stats
+
+    def load_tables(self, files) -> dict:
+        return {_table_name(path): self.load_file(path)
+                for path in sorted(files, key=lambda p: Path(p).stat().st_size, reverse=True)}
+
+    def table_counts(self, tables=FAERS_TABLES) -> dict:
+        with self._lock, self.connection() as conn:
+            existing = {r[0].upper() for r in conn.execute(
+                "SELECT table_name FROM information_schema.tables WHERE table_schema = ?", [self.schema]
+            ).fetchall()}
+            return {t: conn.execute(f"SELECT COUNT(*) FROM {self.schema}.{t}").fetchone()[0]
+                    for t in tables if t in existing}
+
+    def close(self):
+        """Nothing to release: connections are closed after each operation."""
+
+
+BACKENDS = {"snowflake": SnowflakeBackend, "duckdb": DuckDBBackend}
+
+
+def get_backend(name: str = None, **kwargs) -> WarehouseBackend:
+    """
+    Create a warehouse backend by name.
+
+    Args:
+        name (str): 'snowflake' or 'duckdb'; defaults to WAREHOUSE_BACKEND or 'snowflake'.
+
+    Returns:
+        WarehouseBackend: Connected backend instance.
+    """
+    name = (name or os.environ.get("WAREHOUSE_BACKEND", "snowflake")).lower()
+    if name not in BACKENDS:
+        raise ValueError(f"Unknown warehouse backend '{name}'. Choose from {sorted(BACKENDS)}")
+    return BACKENDS[name](**kwargs)
@@ -0,0 +1,21 @@
+{#
+    Incremental helpers for the clean and marts layers.
+
+    Incremental models rebuild whole reports: they select every row of each
+    primaryid that has a row loaded after the model's latest load_ts, and
+    replace those reports with delete+insert on primaryid. A report that was
+    partially re-merged upstream is therefore never left half-updated.
+#}
+
+{% macro load_watermark() -%}
+    (select coalesce(max(load_ts), cast('1900-01-01' as timestamp)) from {{ this }})
+{%- endmacro %}
+
+{% macro changed_primaryids(relations) -%}
+    {%- for relation in relations %}
+    select primaryid from {{ relation }} where load_ts > {{ load_watermark() }}
+    {%- if not loop.last %}
+    union
+    {%- endif %}
+    {%- endfor %}
+{%- endmacro %}
@@ -1,13 +1,22 @@
-{{ config(materialized='table') }}
+{{ config(materialized='incremental', unique_key='primaryid') }}
 
+-- FAERS repeats some rows across load chunks and quarter files (load_ts/source_quarter differ);
+-- keep the latest row per business key so each surrogate key identifies one row
 with src as (
     select *
     from {{ ref('stg_fda_outc') }}
+    {% if is_incremental() %}
+    where primaryid in ({{ changed_primaryids([ref('stg_fda_outc')]) }})
+    {% endif %}
+    qualify row_number() over (
+        partition by primaryid, outc_cod
+        order by load_ts desc
+    ) = 1
 ),
 
 final as (
     select
-        row_number() over(order by primaryid) as outc_sk,
+        {{ dbt_utils.generate_surrogate_key(['primaryid', 'outc_cod']) }} as outc_sk,
         *
     from src
 )
@@ -11,23 +11,20 @@
 --   This provides a small, meaningful overview of the patient distribution
 --
 -- Logic:
---   1. Age is categorized into three groups:
+--   1. Age is categorized into three groups in fact_case:
 --        - Pediatric (<18)
 --        - Adult (18–64)
 --        - Elderly (65+)
---   2. Counts are based on DISTINCT caseid to avoid double-counting patients.
+--   2. Counts come from agg_case_demographics (one row per case, latest
+--      version), so summing num_cases counts each patient once.
 --   3. Null ages are excluded from the analysis.
 --   4. Results are ordered by age_group and descending patient counts.
 
 select
-    case
-        when age < 18 then 'Pediatric'
-        when age >= 65 then 'Elderly'
-        else 'Adult'
-    end as age_group,  -- categorized age group
-    sex,               -- patient sex
-    count(distinct caseid) as num_patients  -- unique patient count
-from {{ ref('fact_adverse_events') }}  -- source fact table (already cleaned)
-where age is not null
+    age_group,                         -- categorized age group
+    sex,                               -- patient sex
+    sum(num_cases) as num_patients     -- unique patient count
+from {{ ref('agg_case_demographics') }}  -- pre-aggregated case counts
+where age_group is not null
 group by age_group, sex
 order by age_group, num_patients desc
@@ -11,15 +11,16 @@
 --   Provides a global overview of where reports are most frequently submitted.
 --
 -- Logic:
---   1. Counts DISTINCT caseid to ensure each report is counted only once.
+--   1. Sums pre-aggregated case counts (one row per case, latest version),
+--      so each report is counted only once.
 --   2. Excludes rows where occr_country is null.
 --   3. Aggregates by country and sorts descending to get the top reporters.
 --   4. Limits output to 10 countries for concise EDA visualization.
 
 select
     occr_country,                      -- country where the adverse event occurred
-    count(distinct caseid) as num_reports  -- number of unique reports per country
-from {{ ref('fact_adverse_events') }}  -- cleaned fact table
+    sum(num_cases) as num_reports      -- number of unique reports per country
+from {{ ref('agg_case_demographics') }}  -- pre-aggregated case counts
 where occr_country is not null         -- exclude missing countries
 group by occr_country                   -- aggregate by country
 order by num_reports desc               -- sort by number of reports descending
@@ -12,26 +12,21 @@
 --
 -- Logic:
 --   1. Only selected top antidepressants are included.
---   2. Counts are based on DISTINCT caseid to avoid double-counting.
+--   2. Counts are distinct cases (latest version) from agg_drug_outcome_cases.
 --   3. Only outcomes DE, LT, HO, DS are considered.
---   4. Final result shows the maximum number of DS cases per drug.
+--   4. Final result shows the number of cases per drug and outcome.
 
 
     select
-        d.drugname,
-        o.outc_cod as outcome_category,
-        count(distinct d.caseid) as total_cases
-    from {{ source('marts', 'dim_drug') }} d
-    join {{ source('marts', 'dim_outcome') }} o
-        on d.caseid = o.caseid
-    where d.drugname in (
+        drugname,
+        outc_cod as outcome_category,
+        num_cases as total_cases
+    from {{ ref('agg_drug_outcome_cases') }}
+    where drugname in (
         'SERTRALINE', 'FLUOXETINE', 'CITALOPRAM', 'ESCITALOPRAM',
         'VENLAFAXINE', 'DULOXETINE','BUPROPION', 'TRAZODONE','AMITRIPTYLINE'
     )
-      and o.outc_cod in ('DE', 'LT', 'HO', 'DS')
-    group by
-        d.drugname,
-        o.outc_cod
+      and outc_cod in ('DE', 'LT', 'HO', 'DS')
     order by
-        d.drugname,
+        drugname,
         total_cases desc
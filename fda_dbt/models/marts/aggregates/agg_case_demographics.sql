@@ -0,0 +1,12 @@
+{{ config(materialized='table') }}
+
+-- Case counts per demographic slice. fact_case has one row per caseid, so the
+-- counts are additive: EDA models sum them over any subset of these columns.
+select
+    age_group,
+    sex,
+    reporter_country,
+    occr_country,
+    count(*) as num_cases
+from {{ ref('fact_case') }}
+group by age_group, sex, reporter_country, occr_country
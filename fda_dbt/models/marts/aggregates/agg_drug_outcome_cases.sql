@@ -0,0 +1,37 @@
+{{ config(materialized='table') }}
+
+-- Distinct cases per drug name and outcome, counted on each case's latest version
+with case_drugs as (
+
+    select distinct
+        f.caseid,
+        dd.drugname
+    from {{ ref('fact_case') }} f
+    join {{ ref('bridge_case_drug') }} bd
+        on f.primaryid = bd.primaryid
+    join {{ ref('dim_drug') }} dd
+        on bd.drug_key = dd.drug_key
+
+),
+
+case_outcomes as (
+
+    select distinct
+        f.caseid,
+        bo.outc_cod
+    from {{ ref('fact_case') }} f
+    join {{ ref('bridge_case_outcome') }} bo
+        on f.primaryid = bo.primaryid
+
+)
+
+select
+    cd.drugname,
+    co.outc_cod,
+    count(*) as num_cases,
+    -- Build time, read by the Streamlit dashboard to invalidate its cache
+    cast('{{ run_started_at.strftime("%Y-%m-%d %H:%M:%S") }}' as timestamp) as dbt_built_at
+from case_drugs cd
+join case_outcomes co
+    on cd.caseid = co.caseid
+group by cd.drugname, co.outc_cod
@@ -0,0 +1,21 @@
+{{ config(materialized='incremental', unique_key='primaryid') }}
+
+with base as (
+
+    select
+        drug_sk,
+        primaryid,
+        caseid,
+        drug_seq,
+        role_cod,
+        {{ dbt_utils.generate_surrogate_key(['drugname', 'prod_ai']) }} as drug_key,
+        load_ts
+    from {{ ref('clean_fda_drug') }}
+    {% if is_incremental() %}
+    where primaryid in ({{ changed_primaryids([ref('clean_fda_drug')]) }})
+    {% endif %}
+
+)
+
+select *
+from base
@@ -0,0 +1,19 @@
+{{ config(materialized='incremental', unique_key='primaryid') }}
+
+with base as (
+
+    select
+        outc_sk,
+        primaryid,
+        caseid,
+        outc_cod,
+        load_ts
+    from {{ ref('clean_fda_outc') }}
+    {% if is_incremental() %}
+    where primaryid in ({{ changed_primaryids([ref('clean_fda_outc')]) }})
+    {% endif %}
+
+)
+
+select *
+from base
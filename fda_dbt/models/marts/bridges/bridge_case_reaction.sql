@@ -0,0 +1,20 @@
+{{ config(materialized='incremental', unique_key='primaryid') }}
+
+with base as (
+
+    select
+        reac_sk,
+        primaryid,
+        caseid,
+        {{ dbt_utils.generate_surrogate_key(['pt']) }} as reaction_key,
+        drug_rec_act,
+        load_ts
+    from {{ ref('clean_fda_reac') }}
+    {% if is_incremental() %}
+    where primaryid in ({{ changed_primaryids([ref('clean_fda_reac')]) }})
+    {% endif %}
+
+)
+
+select *
+from base
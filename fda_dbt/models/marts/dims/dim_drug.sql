@@ -1,16 +1,18 @@
-{{ config(materialized='table') }}
+{{ config(materialized='incremental', unique_key='drug_key') }}
 
+-- One row per distinct drug (name + active ingredient); case links live in bridge_case_drug
 with base as (
 
     select
-        primaryid,
-        caseid,
-        drug_seq,
-        role_cod,
+        {{ dbt_utils.generate_surrogate_key(['drugname', 'prod_ai']) }} as drug_key,
         drugname,
         prod_ai,
-        row_number() over(partition by primaryid, caseid, drug_seq order by drug_seq) as drug_sk
+        max(load_ts) as load_ts
     from {{ ref('clean_fda_drug') }}
+    {% if is_incremental() %}
+    where load_ts > {{ load_watermark() }}
+    {% endif %}
+    group by 1, 2, 3
 
 )
 
@@ -1,15 +1,17 @@
 {{ config(materialized='table') }}
 
-with base as (
-
-    select
-        primaryid,
-        caseid,
-        outc_cod,
-        row_number() over(partition by primaryid, caseid order by outc_cod) as outc_sk
-    from {{ ref('clean_fda_outc') }}
-
-)
-
-select *
-from base
+-- FAERS outcome codes; case links live in bridge_case_outcome
+select
+    outc_cod,
+    outcome_label,
+    outc_cod in ('DE', 'LT', 'HO', 'DS') as is_serious
+from (
+    values
+        ('DE', 'Death'),
+        ('LT', 'Life-Threatening'),
+        ('HO', 'Hospitalization'),
+        ('DS', 'Disability'),
+        ('CA', 'Congenital Anomaly'),
+        ('RI', 'Required Intervention'),
+        ('OT', 'Other Serious')
+) as outcomes (outc_cod, outcome_label)
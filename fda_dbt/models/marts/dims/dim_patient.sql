@@ -1,8 +1,9 @@
-{{ config(materialized='table') }}
+{{ config(materialized='incremental', unique_key='primaryid') }}
 
 with base as (
 
     select
+        case_sk as patient_sk,
         primaryid,
         caseid,
         caseversion,
@@ -10,8 +11,11 @@ with base as (
         sex,
         reporter_country,
         occr_country,
-        row_number() over(partition by primaryid, caseid order by caseversion) as patient_sk
+        load_ts
     from {{ ref('clean_fda_demo') }}
+    {% if is_incremental() %}
+    where primaryid in ({{ changed_primaryids([ref('clean_fda_demo')]) }})
+    {% endif %}
 
 )
 
@@ -1,16 +1,19 @@
-{{ config(materialized='table') }}
+{{ config(materialized='incremental', unique_key='reaction_key') }}
 
-with src as (
-    select *
-    from {{ ref('clean_fda_reac') }}
-),
+-- One row per distinct MedDRA preferred term; case links live in bridge_case_reaction
+with base as (
 
-final as (
     select
-        row_number() over(order by primaryid) as indi_sk,
-        *
-    from src
+        {{ dbt_utils.generate_surrogate_key(['pt']) }} as reaction_key,
+        pt,
+        max(load_ts) as load_ts
+    from {{ ref('clean_fda_reac') }}
+    {% if is_incremental() %}
+    where load_ts > {{ load_watermark() }}
+    {% endif %}
+    group by 1, 2
+
 )
 
 select *
-from final
+from base
@@ -1,13 +1,17 @@
-{{ config(materialized='table') }}
+{{ config(materialized='incremental', unique_key='primaryid') }}
 
 with base as (
 
     select
+        rpsr_sk,
         primaryid,
         caseid,
         rpsr_cod,
-        row_number() over(partition by primaryid, caseid order by rpsr_cod) as rpsr_sk
+        load_ts
     from {{ ref('clean_fda_rpsr') }}
+    {% if is_incremental() %}
+    where primaryid in ({{ changed_primaryids([ref('clean_fda_rpsr')]) }})
+    {% endif %}
 
 )
 
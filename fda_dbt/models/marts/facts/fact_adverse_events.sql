@@ -1,31 +0,0 @@
-{{ config(materialized='table') }}
-
-with base as (
-
-    select
-        p.patient_sk,
-        p.primaryid,
-        p.caseid,
-        p.caseversion,
-        p.age,
-        p.sex,
-        p.reporter_country,
-        p.occr_country,
-        d.drug_sk,
-        r.reac_sk,
-        o.outc_sk,
-        rp.rpsr_sk
-    from {{ ref('dim_patient') }} p
-    left join {{ ref('dim_drug') }} d
-        on p.primaryid = d.primaryid and p.caseid = d.caseid
-    left join {{ ref('dim_reaction') }} r
-        on p.primaryid = r.primaryid and p.caseid = r.caseid
-    left join {{ ref('dim_outcome') }} o
-        on p.primaryid = o.primaryid and p.caseid = o.caseid
-    left join {{ ref('dim_reporter') }} rp
-        on p.primaryid = rp.primaryid and p.caseid = rp.caseid
-
-)
-
-select *
-from base
@@ -0,0 +1,105 @@
+{{ config(materialized='incremental', unique_key='caseid') }}
+
+-- One row per FAERS case (caseid) from its latest report version, with per-case
+-- drug / reaction / outcome counts instead of a drug x reaction x outcome fan-out.
+-- Individual drugs, reactions and outcomes are reached through the bridge_case_* tables.
+with reports as (
+
+    select *
+    from {{ ref('dim_patient') }}
+    {% if is_incremental() %}
+    where caseid in (
+        select caseid
+        from {{ ref('dim_patient') }}
+        where primaryid in ({{ changed_primaryids([
+            ref('dim_patient'), ref('bridge_case_drug'), ref('bridge_case_reaction'), ref('bridge_case_outcome')
+        ]) }})
+    )
+    {% endif %}
+
+),
+
+latest as (
+
+    select *
+    from reports
+    qualify row_number() over(partition by caseid order by caseversion desc, primaryid desc) = 1
+
+),
+
+drugs as (
+
+    select
+        primaryid,
+        count(*) as n_drugs,
+        max(load_ts) as load_ts
+    from {{ ref('bridge_case_drug') }}
+    where primaryid in (select primaryid from latest)
+    group by primaryid
+
+),
+
+reactions as (
+
+    select
+        primaryid,
+        count(*) as n_reactions,
+        max(load_ts) as load_ts
+    from {{ ref('bridge_case_reaction') }}
+    where primaryid in (select primaryid from latest)
+    group by primaryid
+
+),
+
+outcomes as (
+
+    select
+        primaryid,
+        count(*) as n_outcomes,
+        max(case when outc_cod = 'DE' then 1 else 0 end) = 1 as has_death,
+        max(case when outc_cod = 'LT' then 1 else 0 end) = 1 as has_life_threatening,
+        max(case when outc_cod = 'HO' then 1 else 0 end) = 1 as has_hospitalization,
+        max(case when outc_cod = 'DS' then 1 else 0 end) = 1 as has_disability,
+        max(load_ts) as load_ts
+    from {{ ref('bridge_case_outcome') }}
+    where primaryid in (select primaryid from latest)
+    group by primaryid
+
+)
+
+select
+    l.patient_sk as case_sk,
+    l.caseid,
+    l.primaryid,
+    l.caseversion,
+    l.age,
+    case
+        when l.age is null then null
+        when l.age < 18 then 'Pediatric'
+        when l.age >= 65 then 'Elderly'
+        else 'Adult'
+    end as age_group,
+    l.sex,
+    l.reporter_country,
+    l.occr_country,
+    coalesce(d.n_drugs, 0) as n_drugs,
+    coalesce(r.n_reactions, 0) as n_reactions,
+    coalesce(o.n_outcomes, 0) as n_outcomes,
+    coalesce(o.has_death, false) as has_death,
+    coalesce(o.has_life_threatening, false) as has_life_threatening,
+    coalesce(o.has_hospitalization, false) as has_hospitalization,
+    coalesce(o.has_disability, false) as has_disability,
+    -- newest contributing row, so a child-only reload advances the watermark
+    greatest(
+        l.load_ts,
+        coalesce(d.load_ts, l.load_ts),
+        coalesce(r.load_ts, l.load_ts),
+        coalesce(o.load_ts, l.load_ts)
+    ) as load_ts
+from latest l
+left join drugs d
+    on l.primaryid = d.primaryid
+left join reactions r
+    on l.primaryid = r.primaryid
+left join outcomes o
+    on l.primaryid = o.primaryid
@@ -23,5 +23,7 @@ select
     to_mfr,
     occp_cod,
     reporter_country,
-    occr_country
+    occr_country,
+    source_quarter,
+    load_ts
 from {{ source('fda', 'demo') }}
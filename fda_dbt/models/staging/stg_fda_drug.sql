@@ -18,5 +18,7 @@ select
     dose_amt,
     dose_unit,
     dose_form,
-    dose_freq
+    dose_freq,
+    source_quarter,
+    load_ts
 from {{ source('fda', 'drug') }}
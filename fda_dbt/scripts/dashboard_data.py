@@ -0,0 +1,134 @@
+"""
+Data Access for the FAERS Streamlit Dashboard
+
+This module holds the warehouse queries behind `streamlit_app.py`, kept
+free of Streamlit so they can be tested and load-tested offline.
+
+Features:
+- Reads the dbt-materialized aggregate MARTS.agg_drug_outcome_cases with a
+  parameterized drug and outcome list (bound parameters, no SQL string
+  building), instead of re-running the drug × outcome aggregation.
+- last_build() returns the aggregate's dbt_built_at, so the app can key its
+  st.cache_data entries on the last dbt build and re-query only after one.
+- Two sources behind one interface: the active Snowpark session
+  (Snowflake-native Streamlit) or a local read-only DuckDB warehouse
+  (WAREHOUSE_BACKEND=duckdb), which lets the page run without Snowflake.
+  DuckDB is opened per query, because even a read-only connection locks the
+  file against dbt; a long-lived one would stop dbt from ever rebuilding it.
+- Every source counts the queries it sends, for per-session measurements.
+
+Date: 2026-02-05
+"""
+
+import abc
+import os
+import threading
+
+AGG_TABLE = "MARTS.agg_drug_outcome_cases"
+
+DEFAULT_DRUGS = (
+    "SERTRALINE", "FLUOXETINE", "CITALOPRAM", "ESCITALOPRAM", "VENLAFAXINE",
+    "DULOXETINE", "BUPROPION", "TRAZODONE", "AMITRIPTYLINE",
+)
+
+OUTCOME_LABELS = {
+    "DE": "Death",
+    "LT": "Life-Threatening",
+    "HO": "Hospitalization",
+    "DS": "Disability",
+}
+
+
+# ---------------- Sources ---------------- #
+class WarehouseSource(abc.ABC):
+    """Runs parameterized SQL and returns a DataFrame with lower-case columns."""
+
+    def __init__(self):
+        self.queries = 0
+        self._lock = threading.Lock()
+
+    def query(self, sql: str, params=()):
+        with self._lock:
+            self.queries += 1
+        df = self._fetch(sql, list(params))
+        df.columns = [c.lower() for c in df.columns]
+        return df
+
+    @abc.abstractmethod
+    def _fetch(self, sql: str, params: list):
+        """Run one query against the warehouse and return a pandas DataFrame."""
+
+
+class SnowflakeSource(WarehouseSource):
+    """The Snowpark session of a Snowflake-native Streamlit app."""
+
+    def __init__(self, session=None):
+        super().__init__()
+        if session is None:
+            from snowflake.snowpark.context import get_active_session
+            session = get_active_session()
+        self.session = session
+
+    def _fetch(self, sql: str, params: list):
+        return self.session.sql(sql, params=params).to_pandas()
+
+
+class DuckDBSource(WarehouseSource):
+    """A local DuckDB warehouse built with the dbt `duckdb` target, opened read-only per query."""
+
+    def __init__(self, path):
+        super().__init__()
+        self.path = str(path)
+
+    def _fetch(self, sql: str, params: list):
+        import duckdb
+
+        # Short-lived connection: the file lock is released as soon as the query returns,
+        # so dbt can rebuild the warehouse while the dashboard is running
+        with duckdb.connect(self.path, read_only=True) as conn:
+            return conn.execute(sql, params).df()
+
+
+def get_source() -> WarehouseSource:
+    """DuckDB when WAREHOUSE_BACKEND=duckdb (path from DUCKDB_PATH), otherwise Snowflake."""
+    if os.getenv("WAREHOUSE_BACKEND", "snowflake").lower() == "duckdb":
+        return DuckDBSource(os.getenv("DUCKDB_PATH", "data/warehouse/ETL_TESTING.duckdb"))
+    return SnowflakeSource()
+
+
+# ---------------- Queries ---------------- #
+def outcome_query(drugs, outcomes) -> tuple:
+    """
+    SQL and bound parameters for case counts per drug and outcome.
+
+    Args:
+        drugs: Drug names (as in dim_drug.drugname).
+        outcomes: Outcome codes, e.g. ('DE', 'HO').
+
+    Returns:
+        tuple: (sql, params) with one '?' placeholder per value.
+    """
+    drugs, outcomes = list(drugs), list(outcomes)
+    if not drugs or not outcomes:
+        raise ValueError("At least one drug and one outcome are required")
+    sql = f"""
+        SELECT drugname, outc_cod AS outcome_category, num_cases AS total_cases
+        FROM {AGG_TABLE}
+        WHERE drugname IN ({", ".join("?" * len(drugs))})
+          AND outc_cod IN ({", ".join("?" * len(outcomes))})
+        ORDER BY drugname, total_cases DESC
+    """
+    return sql, drugs + outcomes
+
+
+def load_outcomes(source: WarehouseSource, drugs=DEFAULT_DRUGS, outcomes=tuple(OUTCOME_LABELS)):
+    """Case counts per drug and outcome, with outcome codes replaced by their labels."""
+    df = source.query(*outcome_query(drugs, outcomes))
+    df["outcome_category"] = df["outcome_category"].map(OUTCOME_LABELS).fillna(df["outcome_category"])
+    return df
+
+
+def last_build(source: WarehouseSource) -> str:
+    """When dbt last rebuilt the aggregate (a one-row query used as the cache key)."""
+    df = source.query(f"SELECT MAX(dbt_built_at) AS built_at FROM {AGG_TABLE}")
+    return str(df["built_at"].iloc[0])
@@ -2,7 +2,7 @@
 FDA FAERS EDA Dashboard (Snowflake-native Streamlit)
 
 This script provides a lightweight demonstration of in-warehouse analytics for FDA FAERS datasets.
-It connects to the active Snowflake session using Snowpark, queries validated marts, and visualizes:
+It reads the dbt-materialized case aggregate (MARTS.agg_drug_outcome_cases) and visualizes:
 
 1. Reported Serious Outcomes for top antidepressants
    - Death (DE)
@@ -12,6 +12,12 @@ It connects to the active Snowflake session using Snowpark, queries validated ma
 
 Key Features:
 - Snowflake-native: runs entirely within Snowflake using Snowpark session.
+- Cached: query results are kept with st.cache_data, keyed on the aggregate's last dbt
+  build (checked every DASHBOARD_BUILD_CHECK_SECONDS, default 300), so reruns and new
+  sessions do not query the warehouse until dbt rebuilds it.
+- Drug and outcome lists are sidebar parameters bound into one query.
+- Local mode: WAREHOUSE_BACKEND=duckdb reads the DuckDB warehouse for offline load tests
+  (`streamlit run fda_dbt/scripts/streamlit_app.py`).
 - Multi-tab layout for separate EDA views.
 - Multi-color charts for better visual distinction.
 - Raw data tables shown below charts for verification.
@@ -19,10 +25,15 @@ Key Features:
 Date: 2026-02-05
 """
 
+import os
+
 import streamlit as st
-import pandas as pd
 import altair as alt
-from snowflake.snowpark.context import get_active_session
+
+import dashboard_data
+from dashboard_data import DEFAULT_DRUGS, OUTCOME_LABELS
+
+BUILD_CHECK_SECONDS = int(os.getenv("DASHBOARD_BUILD_CHECK_SECONDS", "300"))
 
 # -------------------------------------------------
 # CONFIG
@@ -43,173 +54,89 @@ st.markdown(
     unsafe_allow_html=True
 )
 
-# -------------------------------------------------
-# SNOWFLAKE SESSION
-# -------------------------------------------------
-session = get_active_session()
 
 # -------------------------------------------------
-# SQL QUERY
+# WAREHOUSE (Snowpark session, or DuckDB locally)
 # -------------------------------------------------
-query = """
-SELECT
-    d.drugname,
-    o.outc_cod AS outcome_category,
-    COUNT(DISTINCT d.caseid) AS total_cases
-FROM marts.dim_drug d
-JOIN marts.dim_outcome o
-    ON d.caseid = o.caseid
-WHERE d.drugname IN (
-    'SERTRALINE', 'FLUOXETINE', 'CITALOPRAM', 'ESCITALOPRAM',
-    'VENLAFAXINE', 'DULOXETINE','BUPROPION', 'TRAZODONE','AMITRIPTYLINE'
-)
-AND o.outc_cod IN ('DE', 'LT', 'HO', 'DS')
-GROUP BY d.drugname, o.outc_cod
-ORDER BY d.drugname, total_cases DESC
-"""
+@st.cache_resource
+def get_source():
+    return dashboard_data.get_source()
+
+
+@st.cache_data(ttl=BUILD_CHECK_SECONDS, show_spinner=False)
+def last_build():
+    return dashboard_data.last_build(get_source())
+
+
+@st.cache_data(max_entries=64, show_spinner=False)
+def load_outcomes(built_at, drugs, outcomes):
+    # built_at is only part of the cache key: a new dbt build means new entries
+    return dashboard_data.load_outcomes(get_source(), drugs, outcomes)
 
-df = session.sql(query).to_pandas()
-df.columns = [c.lower() for c in df.columns]
 
 # -------------------------------------------------
-# CLEAN LABELS
+# PARAMETERS
 # -------------------------------------------------
-outcome_labels = {
-    "DE": "Death",
-    "LT": "Life-Threatening",
-    "HO": "Hospitalization",
-    "DS": "Disability"
-}
-df["outcome_category"] = df["outcome_category"].map(outcome_labels)
+drugs = st.sidebar.multiselect("Antidepressants", DEFAULT_DRUGS, default=list(DEFAULT_DRUGS))
+outcomes = st.sidebar.multiselect("Outcomes", list(OUTCOME_LABELS), default=list(OUTCOME_LABELS),
+                                  format_func=OUTCOME_LABELS.get)
+if not drugs or not outcomes:
+    st.info("Select at least one antidepressant and one outcome.")
+    st.stop()
+
+built_at = last_build()
+df = load_outcomes(built_at, tuple(drugs), tuple(outcomes))
+st.caption(f"Data as of dbt build {built_at}")
+
 
 # -------------------------------------------------
-# CREATE TABS
+# CHARTS
 # -------------------------------------------------
-tab_all, tab_de, tab_lt, tab_hos, tab_ds = st.tabs([
-    "All Outcomes",
-    "Death Only",
-    "Life-Threatening Only",
-    "Hospitalization Only",
-    "Disability Only"])
-
-# -----------------------------
-# TAB 1: All Outcomes (Main)
-# -----------------------------
-with tab_all:
-    chart_all = (
-        alt.Chart(df)
+def bar_chart(data, color_field, color_title, tooltip):
+    return (
+        alt.Chart(data)
         .mark_bar()
         .encode(
             x=alt.X("drugname:N", title="Antidepressant"),
             y=alt.Y("total_cases:Q", title="Total Cases"),
             color=alt.Color(
-                "outcome_category:N",
-                title="Outcome",
+                f"{color_field}:N",
+                title=color_title,
                 scale=alt.Scale(scheme="tableau10")
             ),
-            tooltip=["drugname", "outcome_category", "total_cases"]
+            tooltip=tooltip
         )
         .properties(height=450)
     )
-    st.altair_chart(chart_all, use_container_width=True)
-    st.subheader("Patient Counts Table (All Outcomes)")
-    st.dataframe(df, use_container_width=True, hide_index=True)
 
-# -----------------------------
-# TAB 2: Death Only
-# -----------------------------
-with tab_de:
-    df_de = df[df["outcome_category"] == "Death"]
-    chart_de = (
-        alt.Chart(df_de)
-        .mark_bar()
-        .encode(
-            x=alt.X("drugname:N", title="Antidepressant"),
-            y=alt.Y("total_cases:Q", title="Total Cases"),
-            color=alt.Color(
-                "drugname:N",
-                title="Antidepressant",
-                scale=alt.Scale(scheme="tableau10")
-            ),
-            tooltip=["drugname", "total_cases"]
-        )
-        .properties(height=450)
-    )
-    st.altair_chart(chart_de, use_container_width=True)
-    st.subheader("Patient Counts Table (Death)")
-    st.dataframe(df_de, use_container_width=True, hide_index=True)
 
-# -----------------------------
-# TAB 3: Life-Threatening Only
-# -----------------------------
-with tab_lt:
-    df_lt = df[df["outcome_category"] == "Life-Threatening"]
-    chart_lt = (
-        alt.Chart(df_lt)
-        .mark_bar()
-        .encode(
-            x=alt.X("drugname:N", title="Antidepressant"),
-            y=alt.Y("total_cases:Q", title="Total Cases"),
-            color=alt.Color(
-                "drugname:N",
-                title="Antidepressant",
-                scale=alt.Scale(scheme="tableau10")
-            ),
-            tooltip=["drugname", "total_cases"]
-        )
-        .properties(height=450)
-    )
-    st.altair_chart(chart_lt, use_container_width=True)
-    st.subheader("Patient Counts Table (Life-Threatening)")
-    st.dataframe(df_lt, use_container_width=True, hide_index=True)
+# -------------------------------------------------
+# CREATE TABS
+# -------------------------------------------------
+labels = [OUTCOME_LABELS[code] for code in outcomes]
+tab_all, *outcome_tabs = st.tabs(["All Outcomes"] + [f"{label} Only" for label in labels])
 
 # -----------------------------
-# TAB 4: Hospitalization Only
+# TAB 1: All Outcomes (Main)
 # -----------------------------
-with tab_hos:
-    df_hos = df[df["outcome_category"] == "Hospitalization"]
-    chart_hos = (
-        alt.Chart(df_hos)
-        .mark_bar()
-        .encode(
-            x=alt.X("drugname:N", title="Antidepressant"),
-            y=alt.Y("total_cases:Q", title="Total Cases"),
-            color=alt.Color(
-                "drugname:N",
-                title="Antidepressant",
-                scale=alt.Scale(scheme="tableau10")
-            ),
-            tooltip=["drugname", "total_cases"]
-        )
-        .properties(height=450)
-    )
-    st.altair_chart(chart_hos, use_container_width=True)
-    st.subheader("Patient Counts Table (Hospitalization)")
-    st.dataframe(df_hos, use_container_width=True, hide_index=True)
+with tab_all:
+    st.altair_chart(bar_chart(df, "outcome_category", "Outcome",
+                              ["drugname", "outcome_category", "total_cases"]),
+                    use_container_width=True)
+    st.subheader("Patient Counts Table (All Outcomes)")
+    st.dataframe(df, use_container_width=True, hide_index=True)
 
 # -----------------------------
-# TAB 5: Disability Only
+# One tab per selected outcome (split once, not filtered per tab)
 # -----------------------------
-with tab_ds:
-    df_ds = df[df["outcome_category"] == "Disability"]
-    chart_ds = (
-        alt.Chart(df_ds)
-        .mark_bar()
-        .encode(
-            x=alt.X("drugname:N", title="Antidepressant"),
-            y=alt.Y("total_cases:Q", title="Total Cases"),
-            color=alt.Color(
-                "drugname:N",
-                title="Antidepressant",
-                scale=alt.Scale(scheme="tableau10")
-            ),
-            tooltip=["drugname", "total_cases"]
-        )
-        .properties(height=450)
-    )
-    st.altair_chart(chart_ds, use_container_width=True)
-    st.subheader("Patient Counts Table (Disability)")
-    st.dataframe(df_ds, use_container_width=True, hide_index=True)
+by_outcome = dict(tuple(df.groupby("outcome_category", sort=False)))
+for tab, label in zip(outcome_tabs, labels):
+    with tab:
+        df_outcome = by_outcome.get(label, df.iloc[0:0])
+        st.altair_chart(bar_chart(df_outcome, "drugname", "Antidepressant", ["drugname", "total_cases"]),
+                        use_container_width=True)
+        st.subheader(f"Patient Counts Table ({label})")
+        st.dataframe(df_outcome, use_container_width=True, hide_index=True)
 
 # -----------------------------
 # DATA TABLE
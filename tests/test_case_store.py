@@ -0,0 +1,51 @@
+# tests/test_case_store.py
+import json
+import numpy as np
+import pandas as pd
+import pytest
+from etl import case_store
+from etl.case_store import CaseStore, build_case_store
+
+
+@pytest.fixture
+def processed_dir(tmp_path):
+    """Merged CSVs with rows out of primaryid order, a non-ASCII value and an invalid primaryid"""
+    pd.DataFrame({"primaryid": ["30", "10", "11", "20"], "caseid": ["3", "1", "1", "2"],
+                  "caseversion": ["1", "0", "1", "1"], "sex": ["F", "M", "M", ""]}) \
+        .to_csv(tmp_path / "merged_demo.csv", index=False)
+    pd.DataFrame({"primaryid": ["20", "11", "30", "11", "Unknown", "20"],
+                  "drug_seq": ["1", "1", "1", "2", "1", "2"],
+                  "drugname": ["ASPIRIN", "SERTRALINE", "MÉTFORMIN", "ASPIRIN", "X", "OZEMPIC"]}) \
+        .to_csv(tmp_path / "merged_drug.csv", index=False)
+    return tmp_path
+
+
+def test_build_sorts_and_indexes(processed_dir, tmp_path, monkeypatch):
+    monkeypatch.setattr(case_store, "REORDER_BATCH", 2)  # reorder in several batches
+    meta = build_case_store(processed_dir, tmp_path / "store", chunksize=4)
+
+    assert meta["DRUG"]["rows"] == 5 and meta["DRUG"]["skipped_rows"] == 1
+    assert meta["DRUG"]["offset_types"]["drugname"] == "int32"
+    assert set(meta) == {"DEMO", "DRUG"}  # other tables have no CSV
+    keys = np.fromfile(tmp_path / "store" / "DRUG" / "primaryid.bin", dtype=np.int64)
+    assert keys.tolist() == [11, 11, 20, 20, 30]
+    assert json.loads((tmp_path / "store" / "DRUG" / "meta.json").read_text())["columns"] == \
+        ["primaryid", "drug_seq", "drugname"]
+
+
+def test_lookup_primaryids_and_cases(processed_dir, tmp_path):
+    build_case_store(processed_dir, tmp_path / "store", chunksize=4)
+    store = CaseStore(tmp_path / "store")
+
+    drug = store.case(11)["DRUG"]
+    assert drug.values.tolist() == [["11", "1", "SERTRALINE"], ["11", "2", "ASPIRIN"]]  # file order kept
+
+    rows = store.lookup(["30", 20, 999], tables=["drug", "DEMO"])
+    assert rows["DRUG"]["drugname"].tolist() == ["ASPIRIN", "OZEMPIC", "MÉTFORMIN"]
+    assert rows["DEMO"]["sex"].tolist() == ["", "F"]
+    assert store.lookup([999])["DRUG"].empty
+
+    assert store.primaryids_for_cases([1]).tolist() == [10, 11]
+    assert store.lookup_cases([1, 3], tables=["DRUG"])["DRUG"]["primaryid"].tolist() == ["11", "11", "30"]
+    with pytest.raises(KeyError):
+        store.lookup([11], tables=["REAC"])
@@ -0,0 +1,69 @@
+# tests/test_dashboard_data.py
+import sys
+from pathlib import Path
+
+import pytest
+
+duckdb = pytest.importorskip("duckdb")
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "fda_dbt" / "scripts"))
+import dashboard_data  # noqa: E402
+
+
+@pytest.fixture
+def warehouse(tmp_path):
+    """Local warehouse holding a small MARTS.agg_drug_outcome_cases"""
+    path = tmp_path / "ETL_TESTING.duckdb"
+    conn = duckdb.connect(str(path))
+    conn.execute("CREATE SCHEMA MARTS")
+    conn.execute("""
+        CREATE TABLE MARTS.agg_drug_outcome_cases AS SELECT * FROM (VALUES
+            ('SERTRALINE', 'DE', 5, TIMESTAMP '2026-02-05 10:00:00'),
+            ('SERTRALINE', 'HO', 9, TIMESTAMP '2026-02-05 10:00:00'),
+            ('FLUOXETINE', 'HO', 3, TIMESTAMP '2026-02-05 10:00:00'),
+            ('ASPIRIN', 'HO', 7, TIMESTAMP '2026-02-05 10:00:00'),
+            ('SERTRALINE', 'OT', 2, TIMESTAMP '2026-02-05 10:00:00')
+        ) t(drugname, outc_cod, num_cases, dbt_built_at)
+    """)
+    conn.close()
+    return path
+
+
+def test_outcome_query_binds_parameters():
+    sql, params = dashboard_data.outcome_query(["SERTRALINE", "O'DRUG"], ["DE"])
+    assert "O'DRUG" not in sql
+    assert sql.count("?") == 3
+    assert params == ["SERTRALINE", "O'DRUG", "DE"]
+    with pytest.raises(ValueError):
+        dashboard_data.outcome_query([], ["DE"])
+
+
+def test_duckdb_source_reads_aggregate(warehouse, monkeypatch):
+    monkeypatch.setenv("WAREHOUSE_BACKEND", "duckdb")
+    monkeypatch.setenv("DUCKDB_PATH", str(warehouse))
+    source = dashboard_data.get_source()
+    assert isinstance(source, dashboard_data.DuckDBSource)
+
+    df = dashboard_data.load_outcomes(source, ("SERTRALINE", "FLUOXETINE"), ("DE", "HO"))
+    assert list(df.columns) == ["drugname", "outcome_category", "total_cases"]
+    assert df.values.tolist() == [
+        ["FLUOXETINE", "Hospitalization", 3],
+        ["SERTRALINE", "Hospitalization", 9],
+        ["SERTRALINE", "Death", 5],
+    ]
+    assert dashboard_data.last_build(source) == "2026-02-05 10:00:00"
+    assert source.queries == 2
+
+
+def test_duckdb_source_does_not_hold_the_warehouse_lock(warehouse):
+    """dbt can rebuild the warehouse between dashboard queries, and the new build is seen"""
+    source = dashboard_data.DuckDBSource(warehouse)
+    assert dashboard_data.last_build(source) == "2026-02-05 10:00:00"
+
+    with duckdb.connect(str(warehouse)) as writer:  # fails while a read-only holder is open
+        writer.execute("UPDATE MARTS.agg_drug_outcome_cases SET dbt_built_at = TIMESTAMP '2026-02-06 09:00:00'")
+    assert dashboard_data.last_build(source) == "2026-02-06 09:00:00"
+
+
+def test_warehouse_source_requires_fetch():
+    with pytest.raises(TypeError):
+        dashboard_data.WarehouseSource()
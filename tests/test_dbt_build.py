@@ -0,0 +1,133 @@
+# tests/test_dbt_build.py
+import json
+import pytest
+from unittest.mock import patch
+from etl import pipeline
+
+
+@pytest.fixture
+def dbt_dirs(tmp_path, monkeypatch):
+    """Point the dbt paths at a temp project"""
+    (tmp_path / "packages.yml").write_text("packages: []\n")
+    (tmp_path / "package-lock.yml").write_text("sha1_hash: abc\n")
+    monkeypatch.setattr(pipeline, "DBT_TARGET_DIR", tmp_path / "target")
+    monkeypatch.setattr(pipeline, "DBT_PACKAGES_DIR", tmp_path / "dbt_packages")
+    monkeypatch.setattr(pipeline, "DBT_STATE_DIR", tmp_path / "dbt_state")
+    monkeypatch.setattr(pipeline, "DBT_PACKAGE_FILES", [tmp_path / "packages.yml", tmp_path / "package-lock.yml"])
+    monkeypatch.setattr(pipeline, "LOGS_DIR", tmp_path / "logs")
+    monkeypatch.delenv("DBT_FULL_BUILD", raising=False)
+    monkeypatch.delenv("WAREHOUSE_BACKEND", raising=False)
+    return tmp_path
+
+
+def _fake_dbt(tmp_path, calls, failed=()):
+    """Stand-in for subprocess.run that writes dbt's target artifacts"""
+    def run(cmd, check):
+        calls.append(cmd)
+        if cmd[1] == "deps":
+            (tmp_path / "dbt_packages").mkdir(exist_ok=True)
+        if cmd[1] == "build":
+            target = tmp_path / "target"
+            target.mkdir(exist_ok=True)
+            (target / "manifest.json").write_text("{}")
+            results = [
+                {"unique_id": "model.fda_dbt.clean_fda_drug", "status": "success", "execution_time": 2.5},
+                {"unique_id": "model.fda_dbt.stg_fda_drug", "status": "success", "execution_time": 0.5},
+                {"unique_id": "test.fda_dbt.not_null_drug", "status": "fail" if failed else "pass",
+                 "execution_time": 0.1},
+            ]
+            (target / "run_results.json").write_text(json.dumps({"results": results}))
+            if failed:
+                raise pipeline.subprocess.CalledProcessError(1, cmd)
+    return run
+
+
+def test_build_skips_deps_and_selects_changed_sources(dbt_dirs):
+    calls = []
+    with patch("etl.pipeline.subprocess.run", side_effect=_fake_dbt(dbt_dirs, calls)):
+        pipeline.run_dbt(force=True, changed_tables=["DRUG"])
+        first = calls[:]
+        calls.clear()
+        pipeline.run_dbt(force=True, changed_tables=["DRUG"])
+
+    # First run: deps + full build (no saved state yet)
+    assert [c[1] for c in first] == ["deps", "build"]
+    assert "--select" not in first[1] and first[1][2:4] == ["--threads", "4"]
+
+    # Second run: lock unchanged → no deps; state-based selection
+    assert [c[1] for c in calls] == ["build"]
+    build = calls[0]
+    selected = build[build.index("--select") + 1:build.index("--state")]
+    assert selected == ["state:modified+", "result:error+", "result:fail+", "source:fda.drug+"]
+    assert (dbt_dirs / "dbt_state" / "manifest.json").exists()
+
+    timings = json.loads((dbt_dirs / "logs" / "dbt_model_timings.json").read_text())
+    assert timings[0] == {"unique_id": "model.fda_dbt.clean_fda_drug", "resource_type": "model",
+                          "status": "success", "execution_time": 2.5}
+
+
+def test_failed_build_keeps_previous_manifest(dbt_dirs):
+    calls = []
+    with patch("etl.pipeline.subprocess.run", side_effect=_fake_dbt(dbt_dirs, calls, failed=True)):
+        with pytest.raises(pipeline.subprocess.CalledProcessError):
+            pipeline.run_dbt(force=True)
+
+    assert not (dbt_dirs / "dbt_state" / "manifest.json").exists()
+    assert (dbt_dirs / "dbt_state" / "run_results.json").exists()  # failed nodes re-selected next time
+    assert (dbt_dirs / "logs" / "dbt_model_timings.json").exists()
+
+
+def test_package_change_reinstalls(dbt_dirs):
+    (dbt_dirs / "dbt_packages").mkdir()
+    (dbt_dirs / "dbt_packages" / ".packages_hash").write_text(pipeline.dbt_packages_hash())
+    assert not pipeline.dbt_deps_needed()
+    (dbt_dirs / "package-lock.yml").write_text("sha1_hash: def\n")
+    assert pipeline.dbt_deps_needed()
+
+
+def test_offline_pipeline_runs_dbt_against_the_loaded_duckdb(dbt_dirs, monkeypatch):
+    """Full offline DAG (extract → … → load → dbt); dbt opens the warehouse the load stage wrote"""
+    pytest.importorskip("duckdb")
+    import subprocess
+    import sys
+    from etl.synthetic import generate_faers, write_faers_zips
+    from validation import extract_gx, referential_integrity
+
+    generate_faers(dbt_dirs / "gen", n_cases=200, seed=11)
+    zip_dir = dbt_dirs / "zips"
+    write_faers_zips(dbt_dirs / "gen", zip_dir)
+    db_path = dbt_dirs / "warehouse" / "ETL_TESTING.duckdb"
+    monkeypatch.setenv("WAREHOUSE_BACKEND", "duckdb")
+    monkeypatch.setenv("DUCKDB_PATH", str(db_path))
+    monkeypatch.setenv("RUN_DBT", "1")
+    monkeypatch.setattr(pipeline, "RUN_STATE_PATH", dbt_dirs / "logs" / "run_state.json")
+    monkeypatch.setattr(extract_gx, "GX_OUTPUT_DIR", dbt_dirs / "gx_reports")
+    monkeypatch.setattr(referential_integrity, "GX_OUTPUT_DIR", dbt_dirs / "gx_reports")
+
+    # dbt-duckdb opens the file read-write from its own process, which fails while a lock is held
+    dbt_model = ("import duckdb, sys; con = duckdb.connect(sys.argv[1]); "
+                 "con.execute('CREATE SCHEMA IF NOT EXISTS MARTS'); "
+                 "con.execute('CREATE OR REPLACE TABLE MARTS.fact_case AS SELECT DISTINCT caseid FROM FDA.DEMO')")
+    calls = []
+    fake_artifacts = _fake_dbt(dbt_dirs, calls)
+    real_run = subprocess.run  # patching pipeline.subprocess.run patches it for everyone
+
+    def run(cmd, check=False, **kwargs):
+        if cmd[0] != "dbt":
+            return real_run(cmd, check=check, **kwargs)
+        if cmd[1] == "build":
+            real_run([sys.executable, "-c", dbt_model, str(db_path)], check=True, capture_output=True)
+        return fake_artifacts(cmd, check)
+
+    with patch("etl.pipeline.subprocess.run", side_effect=run):
+        report = pipeline.run_etl(raw_dir=dbt_dirs / "raw", processed_dir=dbt_dirs / "processed",
+                                  zip_dir=zip_dir, max_workers=2)
+
+    tasks = {t["name"]: t for t in report["tasks"]}
+    assert {"extract:Q1_2025", "transform:DRUG", "validate:DRUG", "load:DRUG", "dbt"} <= set(tasks)
+    assert all(t["status"] == "done" for t in tasks.values())
+    assert [c[1] for c in calls] == ["deps", "build"]
+
+    import duckdb
+    with duckdb.connect(str(db_path), read_only=True) as con:
+        assert con.execute("SELECT COUNT(*) FROM MARTS.fact_case").fetchone()[0] == 200
@@ -0,0 +1,83 @@
+# tests/test_disproportionality.py
+import numpy as np
+import pandas as pd
+import pytest
+
+pytest.importorskip("scipy")
+from scipy import sparse  # noqa: E402
+from analytics import disproportionality as dp  # noqa: E402
+
+
+@pytest.fixture
+def processed_dir(tmp_path):
+    """10 cases: drug X in cases 1-4, reaction R in cases 1-3 and 5; case 1 also has an older version"""
+    demo = pd.DataFrame({"primaryid": [10] + [c * 10 + 1 for c in range(1, 11)],
+                         "caseid": [1] + list(range(1, 11)),
+                         "caseversion": [0] + [1] * 10})
+    demo.to_csv(tmp_path / "merged_demo.csv", index=False)
+    drug = pd.DataFrame({
+        "primaryid": [10, 11, 11, 21, 31, 41] + [c * 10 + 1 for c in range(5, 11)] + ["Unknown"],
+        "drugname": ["Z", "X", "X", "X", "X", "X"] + ["Y"] * 6 + ["X"],
+        "role_cod": ["PS"] * 13,
+    })
+    drug.to_csv(tmp_path / "merged_drug.csv", index=False)
+    reac = pd.DataFrame({
+        "primaryid": [10, 11, 21, 31, 51, 41] + [c * 10 + 1 for c in range(6, 11)],
+        "pt": ["R", "R", "R", "R", "R", "S"] + ["S"] * 5,
+    })
+    reac.to_csv(tmp_path / "merged_reac.csv", index=False)
+    return tmp_path
+
+
+def test_latest_primaryids(processed_dir):
+    ids = dp.latest_primaryids(processed_dir / "merged_demo.csv", chunksize=4)
+    assert ids.tolist() == [c * 10 + 1 for c in range(1, 11)]
+
+
+def test_detect_signals_two_by_two(processed_dir, tmp_path):
+    signals = dp.detect_signals(processed_dir, min_cases=3, min_prr=2.0, min_chi2=1.0, min_ror_lower=0.0,
+                                chunksize=5, output_path=tmp_path / "signals.csv")
+
+    # The older version of case 1 (primaryid 10, drug Z) is not counted
+    assert sorted(signals[["drugname", "pt", "a", "b", "c", "d"]].values.tolist()) == [
+        ["X", "R", 3, 1, 1, 5], ["Y", "S", 5, 1, 1, 3]]
+    row = signals.set_index(["drugname", "pt"]).loc[("X", "R")]
+    assert row["prr"] == pytest.approx((3 / 4) / (1 / 6))
+    assert row["ror"] == pytest.approx(15.0)
+    assert row["chi2"] == pytest.approx(10 * (14 - 5) ** 2 / (4 * 6 * 4 * 6))
+    assert row["prr_lower"] < row["prr"] < row["prr_upper"]
+    assert pd.read_csv(tmp_path / "signals.csv").shape[0] == 2
+
+    # Default thresholds (chi-square ≥ 4, ROR lower bound > 1) reject this small sample
+    assert dp.detect_signals(processed_dir).empty
+
+
+def test_contingency_counts_match_brute_force():
+    rng = np.random.default_rng(0)
+    drugs = sparse.csr_matrix((rng.random((200, 15)) < 0.2).astype(np.int32))
+    reactions = sparse.csr_matrix((rng.random((200, 12)) < 0.3).astype(np.int32))
+    stats = dp.contingency_statistics(drugs.T.tocsr(), reactions)
+
+    dense_d, dense_r = drugs.toarray().astype(bool), reactions.toarray().astype(bool)
+    for i, j, a, b, c, d in zip(*(stats[k] for k in ("drug", "reaction", "a", "b", "c", "d"))):
+        assert a == np.sum(dense_d[:, i] & dense_r[:, j])
+        assert b == np.sum(dense_d[:, i] & ~dense_r[:, j])
+        assert c == np.sum(~dense_d[:, i] & dense_r[:, j])
+        assert d == np.sum(~dense_d[:, i] & ~dense_r[:, j])
+    assert len(stats["a"]) == np.count_nonzero(dense_d.T.astype(int) @ dense_r.astype(int))
+
+
+def test_zero_cells_get_haldane_correction(tmp_path):
+    """A reaction only reported with drug X (c = 0) yields finite PRR/ROR, not inf"""
+    ids = list(range(1, 21))
+    pd.DataFrame({"primaryid": ids, "drugname": ["X"] * 5 + ["Y"] * 15}).to_csv(
+        tmp_path / "merged_drug.csv", index=False)
+    pd.DataFrame({"primaryid": ids, "pt": ["R"] * 4 + ["S"] * 16}).to_csv(
+        tmp_path / "merged_reac.csv", index=False)
+
+    signals = dp.detect_signals(tmp_path, min_chi2=0.0, min_ror_lower=0.0)
+    row = signals.set_index(["drugname", "pt"]).loc[("X", "R")]
+    assert [row[k] for k in ("a", "b", "c", "d")] == [4, 1, 0, 15]
+    assert row["prr"] == pytest.approx((4.5 / 6) / (0.5 / 16))
+    assert row["ror"] == pytest.approx((4.5 * 15.5) / (1.5 * 0.5))
+    assert np.isfinite(signals.drop(columns=["drugname", "pt"]).to_numpy(dtype=float)).all()
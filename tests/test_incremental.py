@@ -0,0 +1,180 @@
+# tests/test_incremental.py
+import re
+import pandas as pd
+import pytest
+from etl import incremental
+
+duckdb = pytest.importorskip("duckdb")
+
+
+class DuckDBCursor:
+    """Translates the few Snowflake-only DDL tokens and runs the SQL on DuckDB"""
+
+    REWRITES = [(r"NUMBER\(38,0\)", "BIGINT"), (r"TIMESTAMP_NTZ", "TIMESTAMP"), (r"\bTRANSIENT\s+", "")]
+
+    def __init__(self, con, log):
+        self.con = con
+        self.log = log
+
+    def execute(self, sql):
+        for pattern, repl in self.REWRITES:
+            sql = re.sub(pattern, repl, sql)
+        self.log.append(sql)
+        self.con.execute(sql)
+
+    def fetchall(self):
+        return self.con.fetchall()
+
+    def close(self):
+        pass
+
+
+class DuckDBConnection:
+    """Local stand-in for a Snowflake connection with the same MERGE semantics"""
+    database = "memory"
+    schema = "FDA"
+
+    def __init__(self):
+        self.con = duckdb.connect()
+        self.log = []
+
+    def cursor(self):
+        return DuckDBCursor(self.con.cursor(), self.log)
+
+    def query(self, sql):
+        return self.con.execute(sql).fetchall()
+
+
+def fake_write_pandas(conn, df, table_name, schema, **kwargs):
+    """write_pandas stand-in: insert the chunk into the DuckDB table by column name"""
+    conn.con.register("chunk_df", df)
+    conn.con.execute(f"INSERT INTO {schema}.{table_name} BY NAME SELECT * FROM chunk_df")
+    conn.con.unregister("chunk_df")
+    return True, 1, len(df), None
+
+
+def write_drug(path, rows):
+    pd.DataFrame(rows, columns=["primaryid", "drug_seq", "drugname", "source_quarter", "load_ts"]) \
+        .to_csv(path, index=False)
+
+
+@pytest.fixture
+def conn(monkeypatch):
+    monkeypatch.setattr(incremental, "write_pandas", fake_write_pandas)
+    monkeypatch.setattr(incremental, "load_csv_to_snowflake", lambda *a, **k: 0)
+    return DuckDBConnection()
+
+
+def test_partition_hashes_ignore_load_ts(tmp_path):
+    path = tmp_path / "merged_drug.csv"
+    write_drug(path, [["1", "1", "A", "25Q1", "2026-01-01 00:00:00"], ["2", "1", "B", "25Q2", "2026-01-01 00:00:00"]])
+    first = incremental.partition_hashes(path)
+    write_drug(path, [["1", "1", "A", "25Q1", "2026-02-01 00:00:00"], ["2", "1", "C", "25Q2", "2026-02-01 00:00:00"]])
+    second = incremental.partition_hashes(path)
+
+    assert first["25Q1"] == second["25Q1"]
+    assert first["25Q2"]["hash"] != second["25Q2"]["hash"]
+    assert second["25Q2"]["rows"] == 1
+
+
+def test_incremental_merge_only_changed_partitions(tmp_path, conn):
+    path = tmp_path / "merged_drug.csv"
+    ts = "2026-02-05 10:00:00"
+    write_drug(path, [["1", "1", "ASPIRIN", "25Q1", ts], ["1", "2", "IBUPROFEN", "25Q1", ts]])
+
+    first = incremental.load_csv_incremental(path, "DRUG", conn)
+    assert first["partitions_loaded"] == ["25Q1"] and first["rows_staged"] == 2
+
+    # Unchanged input (new load_ts only): nothing is staged or merged
+    write_drug(path, [["1", "1", "ASPIRIN", "25Q1", "2026-03-01 00:00:00"],
+                      ["1", "2", "IBUPROFEN", "25Q1", "2026-03-01 00:00:00"]])
+    again = incremental.load_csv_incremental(path, "DRUG", conn)
+    assert again["partitions_loaded"] == [] and again["rows_staged"] == 0
+
+    # A new quarter arrives: only 25Q2 is staged and merged, 25Q1 untouched
+    write_drug(path, [["1", "1", "ASPIRIN", "25Q1", ts], ["1", "2", "IBUPROFEN", "25Q1", ts],
+                      ["2", "1", "SERTRALINE", "25Q2", ts], ["2", "1", "SERTRALINE", "25Q2", ts]])
+    added = incremental.load_csv_incremental(path, "DRUG", conn)
+    assert added["partitions_loaded"] == ["25Q2"] and added["rows_staged"] == 2
+
+    rows = conn.query("SELECT PRIMARYID, DRUG_SEQ, DRUGNAME FROM FDA.DRUG ORDER BY 1, 2")
+    assert rows == [(1, 1, "ASPIRIN"), (1, 2, "IBUPROFEN"), (2, 1, "SERTRALINE")]
+
+    # A changed quarter updates matched keys and deletes rows that disappeared
+    write_drug(path, [["1", "1", "ASPIRIN", "25Q1", ts], ["1", "2", "IBUPROFEN", "25Q1", ts],
+                      ["2", "1", "ZOLOFT", "25Q2", ts], ["3", "1", "PROZAC", "25Q2", ts]])
+    incremental.load_csv_incremental(path, "DRUG", conn)
+    rows = conn.query("SELECT PRIMARYID, DRUG_SEQ, DRUGNAME FROM FDA.DRUG ORDER BY 1, 2")
+    assert rows == [(1, 1, "ASPIRIN"), (1, 2, "IBUPROFEN"), (2, 1, "ZOLOFT"), (3, 1, "PROZAC")]
+
+    watermarks = dict(conn.query("SELECT PARTITION_KEY, ROW_COUNT FROM FDA.LOAD_WATERMARK WHERE TABLE_NAME = 'DRUG'"))
+    assert watermarks == {"25Q1": 2, "25Q2": 2}
+    assert any(sql.startswith("MERGE INTO FDA.DRUG") for sql in conn.log)
+    assert not conn.query("SELECT * FROM information_schema.tables WHERE table_name = 'DRUG_STAGE'")
+
+
+def test_removed_partition_and_full_refresh(tmp_path, conn):
+    path = tmp_path / "merged_drug.csv"
+    ts = "2026-02-05 10:00:00"
+    write_drug(path, [["1", "1", "A", "25Q1", ts], ["2", "1", "B", "25Q2", ts]])
+    incremental.load_csv_incremental(path, "DRUG", conn)
+
+    write_drug(path, [["2", "1", "B", "25Q2", ts]])
+    result = incremental.load_csv_incremental(path, "DRUG", conn)
+    assert result["partitions_removed"] == ["25Q1"]
+    assert conn.query("SELECT PRIMARYID FROM FDA.DRUG") == [(2,)]
+
+    full = incremental.load_csv_incremental(path, "DRUG", conn, full_refresh=True)
+    assert full["mode"] == "full"
+    assert conn.query("SELECT PARTITION_KEY FROM FDA.LOAD_WATERMARK") == [("25Q2",)]
+
+
+def test_incremental_keeps_every_indication_and_therapy_row(tmp_path, conn):
+    """One drug_seq with several indications / therapy periods keeps all its rows"""
+    ts = "2026-02-05 10:00:00"
+    indi = tmp_path / "merged_indi.csv"
+    pd.DataFrame([["1", "1", "Depression", "25Q1", ts], ["1", "1", "Anxiety", "25Q1", ts],
+                  ["1", "2", "Insomnia", "25Q1", ts]],
+                 columns=["primaryid", "indi_drug_seq", "indi_pt", "source_quarter", "load_ts"]
+                 ).to_csv(indi, index=False)
+    ther = tmp_path / "merged_ther.csv"
+    pd.DataFrame([["1", "1", "20240101", "20240301", "", "", "25Q1", ts],
+                  ["1", "1", "20240601", "", "", "", "25Q1", ts]],
+                 columns=["primaryid", "dsg_drug_seq", "start_dt", "end_dt", "dur", "dur_cod",
+                          "source_quarter", "load_ts"]).to_csv(ther, index=False)
+
+    for _ in range(2):  # the second load re-merges a changed partition over the same rows
+        incremental.load_csv_incremental(indi, "INDI", conn)
+        incremental.load_csv_incremental(ther, "THER", conn)
+        conn.query("DELETE FROM FDA.LOAD_WATERMARK")
+
+    assert conn.query("SELECT INDI_DRUG_SEQ, INDI_PT FROM FDA.INDI ORDER BY 1, 2") == [
+        (1, "Anxiety"), (1, "Depression"), (2, "Insomnia")]
+    assert conn.query("SELECT COUNT(*) FROM FDA.THER WHERE DSG_DRUG_SEQ = 1") == [(2,)]
+
+
+def test_incremental_and_full_refresh_keep_the_same_rows(tmp_path, monkeypatch):
+    """Rows sharing primaryid + pt but differing elsewhere survive both load paths"""
+    from etl import load
+    monkeypatch.setattr(incremental, "write_pandas", fake_write_pandas)
+    monkeypatch.setattr(load, "write_pandas", fake_write_pandas)
+    ts = "2026-02-05 10:00:00"
+    rows = [["1", "10", "Nausea", "", "25Q1", ts], ["1", "10", "Nausea", "Nausea", "25Q1", ts],
+            ["2", "20", "Rash", "", "25Q1", ts], ["2", "20", "Rash", "", "25Q2", ts]]
+    path = tmp_path / "merged_reac.csv"
+    columns = ["primaryid", "caseid", "pt", "drug_rec_act", "source_quarter", "load_ts"]
+    pd.DataFrame(rows, columns=columns).to_csv(path, index=False)
+
+    full, inc = DuckDBConnection(), DuckDBConnection()
+    assert incremental.load_csv_incremental(path, "REAC", full, full_refresh=True)["rows_staged"] == 4
+    for _ in range(2):  # the second load re-merges the same partitions
+        result = incremental.load_csv_incremental(path, "REAC", inc)
+        inc.query("DELETE FROM FDA.LOAD_WATERMARK")
+    assert result["rows_deduplicated"] == 0
+    assert inc.query("SELECT COUNT(*) FROM FDA.REAC") == full.query("SELECT COUNT(*) FROM FDA.REAC") == [(4,)]
+
+    # An exact copy can only be merged once; it is reported instead of silently dropped
+    pd.DataFrame(rows + rows[:1], columns=columns).to_csv(path, index=False)
+    result = incremental.load_csv_incremental(path, "REAC", inc)
+    assert result["rows_staged"] == 5 and result["rows_deduplicated"] == 1
+    assert inc.query("SELECT COUNT(*) FROM FDA.REAC") == [(4,)]
@@ -0,0 +1,57 @@
+# tests/test_instrumentation.py
+import json
+import pytest
+from etl import instrumentation
+
+
+@pytest.fixture
+def recorder():
+    return instrumentation.reset_recorder(sample_interval=0.01)
+
+
+def test_stage_records_counters_and_throughput(recorder, tmp_path):
+    """Nested per-table stages record rows, bytes, timings and memory"""
+    with instrumentation.stage("transform"):
+        for table, rows in [("DEMO", 100), ("DRUG", 300)]:
+            with instrumentation.stage("transform", table=table) as st:
+                st.add(rows=rows, n_bytes=rows * 10)
+                sum(range(10_000))
+
+    report = recorder.write_report(tmp_path / "logs" / "run_report.json")
+    assert json.loads((tmp_path / "logs" / "run_report.json").read_text()) == report
+
+    stages = {(s["stage"], s["table"]): s for s in report["stages"]}
+    assert set(stages) == {("transform", None), ("transform", "DEMO"), ("transform", "DRUG")}
+    drug = stages[("transform", "DRUG")]
+    assert drug["rows"] == 300 and drug["bytes"] == 3000 and drug["status"] == "ok"
+    assert drug["wall_seconds"] >= 0 and drug["cpu_seconds"] >= 0
+    assert drug["peak_rss_mb"] > 0
+    assert report["table_totals"]["transform"]["tables"] == 2
+    assert report["table_totals"]["transform"]["rows"] == 400
+    assert report["success"] is True
+
+
+def test_stage_marks_errors(recorder):
+    """A failing stage is recorded with error status and the exception propagates"""
+    with pytest.raises(ValueError):
+        with instrumentation.stage("load", table="REAC"):
+            raise ValueError("boom")
+
+    (st,) = recorder.report()["stages"]
+    assert st["status"] == "error"
+    assert recorder.report()["success"] is False
+
+
+def test_compare_reports_flags_regressions():
+    """Stages slower than the threshold are flagged against the baseline"""
+    def report(seconds):
+        return {"stages": [{"stage": "load", "table": t, "wall_seconds": s, "peak_rss_mb": 100.0}
+                           for t, s in seconds.items()]}
+
+    rows = instrumentation.compare_reports(report({"DEMO": 10.0, "DRUG": 20.0}),
+                                           report({"DEMO": 10.5, "DRUG": 30.0, "REAC": 5.0}))
+    by_table = {r["table"]: r for r in rows}
+    assert set(by_table) == {"DEMO", "DRUG"}
+    assert by_table["DEMO"]["regression"] is False
+    assert by_table["DRUG"]["regression"] is True
+    assert by_table["DRUG"]["change"] == 0.5
@@ -1,9 +1,14 @@
 # tests/test_load.py
+import io
+import gzip
+import threading
+import time
 import pytest
 import pandas as pd
 from pathlib import Path
 from unittest.mock import MagicMock
 from etl import load  
+from db.snowflake_conn import SnowflakeConnectionPool
 
 # ---------------- Fixture ----------------
 @pytest.fixture
@@ -50,3 +55,259 @@ def test_load_csv_to_snowflake(sample_csv):
 
     # --- Restore original function ---
     load.write_pandas = real_write_pandas
+
+
+# ---------------- Staged COPY INTO path ----------------
+
+
+class RecordingCursor:
+    """Cursor stand-in that records PUT/COPY statements and staged file sizes"""
+
+    def __init__(self, conn):
+        self.conn = conn
+        self.description = None
+        self._rows = []
+
+    def execute(self, sql):
+        with self.conn.lock:
+            self.conn.statements.append(sql)
+        if sql.startswith("PUT"):
+            local = Path(sql.split("'file://", 1)[1].split("'", 1)[0])
+            size = local.stat().st_size
+            with self.conn.lock:
+                self.conn.staged[local.name] = gzip.decompress(local.read_bytes())
+            self._rows = [(local.name, local.name, size, size, "GZIP", "GZIP", "UPLOADED", "")]
+        elif sql.startswith("COPY INTO"):
+            self.description = [("file",), ("status",), ("rows_parsed",), ("rows_loaded",),
+                                ("error_limit",), ("errors_seen",), ("first_error",)]
+            self._rows = []
+            for name, data in self.conn.staged.items():
+                rows = len(pd.read_csv(io.BytesIO(data)))
+                if name in self.conn.failing:
+                    self._rows.append((f"drug/{name}", "LOAD_FAILED", rows, 0, 1, 2,
+                                       "Numeric value 'abc' is not recognized"))
+                else:
+                    self._rows.append((f"drug/{name}", "LOADED", rows, rows, 1, 0, None))
+
+    def fetchone(self):
+        return self._rows[0] if self._rows else None
+
+    def fetchall(self):
+        return self._rows
+
+    def close(self):
+        pass
+
+
+class RecordingConnection:
+    database = "ETL_TESTING"
+    schema = "FDA"
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.statements = []
+        self.staged = {}
+        self.failing = set()
+
+    def cursor(self):
+        return RecordingCursor(self)
+
+
+def test_stage_csv_to_snowflake(tmp_path):
+    """Parts are compressed, PUT in parallel, and loaded with one COPY INTO"""
+    df = pd.DataFrame({
+        "primaryid": [str(i) for i in range(25)],
+        "drugname": ["ASPIRIN"] * 24 + ['MULTI\nLINE "NAME"'],
+    })
+    csv_path = tmp_path / "merged_drug.csv"
+    df.to_csv(csv_path, index=False)
+    conn = RecordingConnection()
+
+    results = load.stage_csv_to_snowflake(csv_path, "DRUG", conn, rows_per_part=10, parallel=3)
+
+    puts = [s for s in conn.statements if s.startswith("PUT")]
+    copies = [s for s in conn.statements if s.startswith("COPY INTO")]
+    assert len(puts) == 3
+    assert all("@FDA.%DRUG" in s and "SOURCE_COMPRESSION=GZIP" in s for s in puts)
+    assert len(copies) == 1 and "SKIP_HEADER=1" in copies[0] and "ON_ERROR=SKIP_FILE" in copies[0]
+
+    assert [r["rows"] for r in results] == [10, 10, 5]
+    assert all(r["bytes"] > 0 and r["status"] == "LOADED" for r in results)
+    # The quoted multi-line record stays whole; every part repeats the header
+    assert sum(r["rows_loaded"] for r in results) == 25
+    assert all(data.startswith(b"primaryid,drugname\n") for data in conn.staged.values())
+
+
+def test_stage_csv_to_snowflake_reports_failed_parts(tmp_path):
+    """A skipped part raises only after every part's COPY result is collected"""
+    csv_path = tmp_path / "merged_drug.csv"
+    pd.DataFrame({"primaryid": [str(i) for i in range(25)], "drugname": ["ASPIRIN"] * 25}).to_csv(
+        csv_path, index=False)
+    conn = RecordingConnection()
+    conn.failing.add("drug_part0001.csv.gz")
+
+    with pytest.raises(load.CopyLoadError) as excinfo:
+        load.stage_csv_to_snowflake(csv_path, "DRUG", conn, rows_per_part=10, parallel=3)
+
+    results = {r["file"]: r for r in excinfo.value.results}
+    assert len(results) == 3
+    assert results["drug_part0001.csv.gz"]["status"] == "LOAD_FAILED"
+    assert results["drug_part0001.csv.gz"]["errors_seen"] == 2
+    assert "not recognized" in results["drug_part0001.csv.gz"]["first_error"]
+    assert sum(r["rows_loaded"] for r in results.values()) == 15
+
+
+
+def test_stage_csv_to_snowflake_header_only(tmp_path):
+    """A CSV without data rows recreates the table but issues no PUT or COPY"""
+    csv_path = tmp_path / "merged_drug.csv"
+    pd.DataFrame(columns=["primaryid", "drugname"]).to_csv(csv_path, index=False)
+    conn = RecordingConnection()
+
+    assert load.stage_csv_to_snowflake(csv_path, "DRUG", conn) == []
+    assert any(s.startswith("CREATE TABLE FDA.DRUG") for s in conn.statements)
+    assert not [s for s in conn.statements if s.startswith(("PUT", "COPY INTO"))]
+
+# ---------------- Concurrent multi-table loading ----------------
+
+
+class LocalConnection:
+    """Local stand-in connection that counts rows written per table"""
+    database = "ETL_TESTING"
+    schema = "FDA"
+
+    def __init__(self):
+        self.rows = {}
+        self.closed = False
+
+    def cursor(self):
+        return MagicMock()
+
+    def close(self):
+        self.closed = True
+
+
+def test_load_tables_concurrently(tmp_path, monkeypatch):
+    """Largest tables start first, rows per table are correct, connections reused"""
+    sizes = {"drug": 300, "reac": 200, "demo": 100, "rpsr": 10}
+    for name, n in sizes.items():
+        pd.DataFrame({"primaryid": [str(i) for i in range(n)]}).to_csv(tmp_path / f"merged_{name}.csv", index=False)
+
+    def fake_write_pandas(conn, df, table_name, **kwargs):
+        conn.rows[table_name] = conn.rows.get(table_name, 0) + len(df)
+        return True, 1, len(df), None
+
+    monkeypatch.setattr(load, "write_pandas", fake_write_pandas)
+    conns = []
+    pool = SnowflakeConnectionPool(size=2, factory=lambda: conns.append(LocalConnection()) or conns[-1])
+
+    active, peak, started = [0], [0], []
+    real_loader = load.load_csv_to_snowflake
+
+    def tracking_loader(csv_path, table, conn):
+        active[0] += 1
+        peak[0] = max(peak[0], active[0])
+        started.append(table)
+        time.sleep(0.01)
+        try:
+            return real_loader(csv_path=csv_path, table=table, conn=conn)
+        finally:
+            active[0] -= 1
+
+    start = time.perf_counter()
+    results = load.load_tables_concurrently(tmp_path.glob("merged_*.csv"), pool, max_workers=2,
+                                            loader=tracking_loader)
+    elapsed = time.perf_counter() - start
+    pool.close()
+
+    assert {t: r["rows"] for t, r in results.items()} == {k.upper(): v for k, v in sizes.items()}
+    assert all(r["rows_per_sec"] > 0 for r in results.values())
+    assert started[0] == "DRUG"
+    assert peak[0] <= 2 and len(conns) <= 2
+    assert all(c.closed for c in conns)
+
+    # Per-table rows landed on the connections that loaded them
+    written = {}
+    for c in conns:
+        for t, n in c.rows.items():
+            written[t] = written.get(t, 0) + n
+    assert written == {k.upper(): v for k, v in sizes.items()}
+
+    # Orchestration overhead stays small next to the loads themselves
+    assert elapsed - sum(r["seconds"] for r in results.values()) / 2 < 1.0
+
+
+def test_load_tables_concurrently_raises_after_other_tables(tmp_path):
+    for name in ["drug", "reac"]:
+        pd.DataFrame({"primaryid": ["1"]}).to_csv(tmp_path / f"merged_{name}.csv", index=False)
+    pool = SnowflakeConnectionPool(size=2, factory=LocalConnection)
+    loaded = []
+
+    def loader(csv_path, table, conn):
+        if table == "DRUG":
+            raise RuntimeError("boom")
+        loaded.append(table)
+        return 1
+
+    with pytest.raises(RuntimeError, match="boom"):
+        load.load_tables_concurrently(tmp_path.glob("merged_*.csv"), pool, loader=loader)
+    assert loaded == ["REAC"]
+
+
+def test_connection_pool_rejects_borrowing_after_close():
+    pool = SnowflakeConnectionPool(size=2, factory=LocalConnection)
+    with pool.connection() as conn:
+        pass
+    pool.close()
+
+    assert conn.closed and pool._idle.empty()
+    with pytest.raises(RuntimeError, match="closed"):
+        with pool.connection():
+            pass
+
+
+# ---------------- Overlapped parse/upload pipeline ----------------
+def test_load_overlaps_parse_and_upload(tmp_path, monkeypatch):
+    """Parsing runs ahead of uploads, bounded by max_inflight_chunks"""
+    csv_path = tmp_path / "merged_reac.csv"
+    pd.DataFrame({"primaryid": [str(i) for i in range(50)], "pt": ["Nausea"] * 50}).to_csv(csv_path, index=False)
+
+    parsed, uploaded, ahead = [0], [0], []
+    real_coerce = load.coerce_to_schema
+
+    def counting_coerce(df, table_schema):
+        parsed[0] += 1
+        return real_coerce(df, table_schema)
+
+    def slow_write_pandas(conn, df, **kwargs):
+        ahead.append(parsed[0] - uploaded[0])
+        time.sleep(0.02)
+        uploaded[0] += 1
+        return True, 1, len(df), None
+
+    monkeypatch.setattr(load, "coerce_to_schema", counting_coerce)
+    monkeypatch.setattr(load, "write_pandas", slow_write_pandas)
+    stats = {}
+
+    total = load.load_csv_to_snowflake(csv_path, "REAC", MagicMock(), chunk_size=5,
+                                       max_inflight_chunks=2, stats=stats)
+
+    assert total == 50 and uploaded[0] == 10
+    assert max(ahead) > 1  # next chunks were parsed while uploading
+    assert max(ahead) <= 2 + 2  # queue + one being uploaded + one being parsed
+    assert stats["bottleneck"] == "upload"
+    assert 0 < stats["parse_utilization"] < stats["upload_utilization"] <= 1
+
+
+def test_load_propagates_parse_errors(tmp_path, monkeypatch):
+    csv_path = tmp_path / "merged_reac.csv"
+    pd.DataFrame({"primaryid": ["1", "2"]}).to_csv(csv_path, index=False)
+
+    def broken_coerce(df, table_schema):
+        raise ValueError("bad chunk")
+
+    monkeypatch.setattr(load, "coerce_to_schema", broken_coerce)
+    monkeypatch.setattr(load, "write_pandas", MagicMock(return_value=(True, 1, 2, None)))
+
+    with pytest.raises(ValueError, match="bad chunk"):
+        load.load_csv_to_snowflake(csv_path, "REAC", MagicMock())
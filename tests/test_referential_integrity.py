@@ -0,0 +1,49 @@
+# tests/test_referential_integrity.py
+import json
+import numpy as np
+import pandas as pd
+import pytest
+from validation import referential_integrity as ri
+
+
+@pytest.fixture
+def processed_dir(tmp_path):
+    """Tiny merged DEMO/DRUG/REAC CSVs with known orphans"""
+    pd.DataFrame({"primaryid": ["30", "10", "20", "10"], "caseid": ["3", "1", "2", "1"]}) \
+        .to_csv(tmp_path / "merged_demo.csv", index=False)
+    pd.DataFrame({"primaryid": ["10", "99", "20", "Unknown", "99", "5"], "drugname": ["A"] * 6}) \
+        .to_csv(tmp_path / "merged_drug.csv", index=False)
+    pd.DataFrame({"primaryid": ["10", "30"], "pt": ["Nausea", "Rash"]}) \
+        .to_csv(tmp_path / "merged_reac.csv", index=False)
+    return tmp_path
+
+
+def test_build_primaryid_index(processed_dir):
+    index = ri.build_primaryid_index(processed_dir / "merged_demo.csv", chunksize=2)
+    assert index.dtype == np.int64
+    assert index.tolist() == [10, 20, 30]
+
+
+def test_find_orphans_in_chunks(processed_dir):
+    index = np.array([10, 20, 30], dtype=np.int64)
+    result = ri.find_orphans(processed_dir / "merged_drug.csv", index, chunksize=4)
+
+    assert result["element_count"] == 6
+    assert result["unexpected_count"] == 4  # 99, Unknown, 99, 5
+    assert result["partial_unexpected_list"] == ["99", "Unknown", "5"]
+
+
+def test_validate_referential_integrity_report(processed_dir, tmp_path, monkeypatch):
+    monkeypatch.setattr(ri, "GX_OUTPUT_DIR", tmp_path / "gx_reports")
+
+    report = ri.validate_referential_integrity(processed_dir, chunksize=3)
+
+    by_table = {r["expectation_config"]["kwargs"]["table"]: r for r in report["results"]}
+    assert set(by_table) == {"DRUG", "REAC"}
+    assert by_table["REAC"]["success"]
+    assert not by_table["DRUG"]["success"]
+    assert by_table["DRUG"]["result"]["unexpected_count"] == 4
+    assert not report["success"]
+
+    saved = json.loads((tmp_path / "gx_reports" / "gx_REFERENTIAL_INTEGRITY.json").read_text())
+    assert saved["statistics"]["unsuccessful_expectations"] == 1
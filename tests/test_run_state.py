@@ -0,0 +1,78 @@
+# tests/test_run_state.py
+import os
+import pytest
+from etl.run_state import RunState, fingerprint
+from etl.scheduler import TaskScheduler
+
+
+def _write(path, text):
+    path.write_text(text)
+    return path
+
+
+def _build(tmp_path, state, calls, fail_load=False):
+    """raw → transform → load, recording which tasks actually ran"""
+    raw, csv = tmp_path / "DRUG25Q1.txt", tmp_path / "merged_drug.csv"
+
+    def transform():
+        calls.append("transform")
+        csv.write_text(raw.read_text().upper())
+
+    def load():
+        calls.append("load")
+        if fail_load:
+            raise ConnectionError("warehouse down")
+
+    s = TaskScheduler(max_workers=2, state=state)
+    s.add("transform:DRUG", transform, inputs=lambda: [raw], outputs=lambda: [csv])
+    s.add("load:DRUG", load, deps=["transform:DRUG"], inputs=lambda: [csv])
+    return s
+
+
+def test_fingerprint_marks_missing_files(tmp_path):
+    f = _write(tmp_path / "a.txt", "abc")
+    prints = fingerprint([f, tmp_path / "missing.txt"])
+    assert prints[str(f)][0] == 3
+    assert prints[str(tmp_path / "missing.txt")] is None
+
+
+def test_resume_restarts_at_failed_task(tmp_path):
+    """A resumed run reuses the finished transform and re-runs only the failed load"""
+    _write(tmp_path / "DRUG25Q1.txt", "a$b")
+    state_path = tmp_path / "run_state.json"
+
+    calls = []
+    with pytest.raises(ConnectionError):
+        _build(tmp_path, RunState(state_path, resume=True), calls, fail_load=True).run()
+    assert calls == ["transform", "load"]
+
+    calls = []
+    s = _build(tmp_path, RunState(state_path, resume=True), calls)
+    s.run()
+    assert calls == ["load"]
+    assert s.tasks["transform:DRUG"].cached
+
+    # Everything complete: nothing re-runs; without --resume everything does
+    calls = []
+    _build(tmp_path, RunState(state_path, resume=True), calls).run()
+    assert calls == []
+    _build(tmp_path, RunState(state_path, resume=False), calls).run()
+    assert calls == ["transform", "load"]
+
+
+def test_changed_input_reruns_downstream(tmp_path):
+    """Editing a raw file re-runs its transform and everything after it"""
+    raw = _write(tmp_path / "DRUG25Q1.txt", "a$b")
+    state_path = tmp_path / "run_state.json"
+    _build(tmp_path, RunState(state_path, resume=True), []).run()
+
+    raw.write_text("a$b$c")
+    os.utime(raw, ns=(raw.stat().st_atime_ns, raw.stat().st_mtime_ns + 1_000_000))
+    calls = []
+    _build(tmp_path, RunState(state_path, resume=True), calls).run()
+    assert calls == ["transform", "load"]
+
+    # A different run configuration discards the checkpoint
+    calls = []
+    _build(tmp_path, RunState(state_path, resume=True, config={"backend": "duckdb"}), calls).run()
+    assert calls == ["transform", "load"]
@@ -0,0 +1,82 @@
+# tests/test_scheduler.py
+import threading
+import time
+import pytest
+from etl.scheduler import TaskScheduler
+
+
+def _sleeper(seconds, log=None, name=None):
+    def fn():
+        if log is not None:
+            log.append(("start", name))
+        time.sleep(seconds)
+        if log is not None:
+            log.append(("end", name))
+        return name
+    return fn
+
+
+def test_tables_flow_independently():
+    """A fast table's load starts before a slow table's validation finishes"""
+    log = []
+    s = TaskScheduler(max_workers=4)
+    for table, secs in [("DRUG", 0.05), ("RPSR", 0.3)]:
+        t = s.add(f"transform:{table}", _sleeper(0.01, log, f"transform:{table}"), stage="transform")
+        v = s.add(f"validate:{table}", _sleeper(secs, log, f"validate:{table}"), deps=[t], stage="validate")
+        s.add(f"load:{table}", _sleeper(0.01, log, f"load:{table}"), deps=[v], stage="load")
+
+    results = s.run()
+
+    assert results["load:DRUG"] == "load:DRUG"
+    assert log.index(("start", "load:DRUG")) < log.index(("end", "validate:RPSR"))
+    report = s.report()
+    assert report["critical_path"] == ["transform:RPSR", "validate:RPSR", "load:RPSR"]
+    assert {t["status"] for t in report["tasks"]} == {"done"}
+
+
+def test_stage_limits_and_waits():
+    """Per-stage limits cap concurrency; queued tasks report their wait"""
+    running, peak = [0], [0]
+    lock = threading.Lock()
+
+    def work():
+        with lock:
+            running[0] += 1
+            peak[0] = max(peak[0], running[0])
+        time.sleep(0.05)
+        with lock:
+            running[0] -= 1
+
+    s = TaskScheduler(max_workers=4, limits={"transform": 2})
+    for i in range(4):
+        s.add(f"transform:{i}", work, stage="transform")
+    s.run()
+
+    assert peak[0] == 2
+    waits = sorted(t["wait_seconds"] for t in s.report()["tasks"])
+    assert waits[0] < 0.02 and waits[-1] >= 0.04
+
+
+def test_failure_skips_downstream_only():
+    """A failed task skips its dependents; other branches still complete"""
+    def boom():
+        raise ValueError("bad file")
+
+    s = TaskScheduler(max_workers=2)
+    s.add("transform:DEMO", boom)
+    s.add("load:DEMO", _sleeper(0), deps=["transform:DEMO"])
+    s.add("transform:DRUG", _sleeper(0.01))
+    s.add("load:DRUG", _sleeper(0), deps=["transform:DRUG"])
+
+    with pytest.raises(ValueError, match="bad file"):
+        s.run()
+
+    status = {t.name: t.status for t in s.tasks.values()}
+    assert status == {"transform:DEMO": "failed", "load:DEMO": "skipped",
+                      "transform:DRUG": "done", "load:DRUG": "done"}
+
+
+def test_unknown_dependency_rejected():
+    s = TaskScheduler()
+    with pytest.raises(ValueError):
+        s.add("load:DRUG", _sleeper(0), deps=["validate:DRUG"])
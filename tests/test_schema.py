@@ -0,0 +1,71 @@
+# tests/test_schema.py
+import json
+import datetime as dt
+import pandas as pd
+import pytest
+from etl import schema
+
+
+@pytest.fixture
+def demo_csv(tmp_path):
+    """Processed-style DEMO CSV with numeric, date, timestamp and text columns"""
+    df = pd.DataFrame({
+        "primaryid": ["101", "102", "103"],
+        "caseversion": ["1", "2", ""],
+        "age": ["25.0", "", "71.5"],
+        "event_dt": ["2025-01-01", "", "2025-03-31"],
+        "nda_num": ["019839", "20001", ""],
+        "sex": ["M", "F", "Unknown"],
+        "load_ts": ["2026-02-05 10:00:00.123456"] * 3,
+    })
+    path = tmp_path / "merged_demo.csv"
+    df.to_csv(path, index=False)
+    return path
+
+
+def test_infer_schema_types(demo_csv):
+    inferred = schema.infer_schema(demo_csv, chunksize=2)
+
+    assert inferred["primaryid"] == "NUMBER(38,0)"
+    assert inferred["caseversion"] == "NUMBER(38,0)"
+    assert inferred["age"] == "FLOAT"
+    assert inferred["event_dt"] == "DATE"
+    assert inferred["load_ts"] == "TIMESTAMP_NTZ"
+    assert inferred["nda_num"] == "VARCHAR(16)"  # leading zero keeps it text
+    assert inferred["sex"] == "VARCHAR(16)"
+    assert list(inferred) == list(pd.read_csv(demo_csv, nrows=0).columns)
+
+
+def test_resolve_schema_artifact_and_drift(demo_csv, caplog):
+    columns = schema.resolve_schema(demo_csv, "DEMO", declared={"age": "NUMBER(38,0)"})
+    assert columns["age"] == "NUMBER(38,0)"  # declared overrides inferred
+
+    artifact = demo_csv.parent / "schemas" / "DEMO.json"
+    saved = json.loads(artifact.read_text())
+    assert saved["columns"] == columns and saved["drift"] is None
+
+    # New data with a text value in a numeric column is reported as drift
+    df = pd.read_csv(demo_csv, dtype=str)
+    df.loc[0, "primaryid"] = "P-101"
+    df.to_csv(demo_csv, index=False)
+    columns = schema.resolve_schema(demo_csv, "DEMO", declared={"age": "NUMBER(38,0)"})
+
+    saved = json.loads(artifact.read_text())
+    assert columns["primaryid"].startswith("VARCHAR")
+    assert saved["drift"]["changed"]["primaryid"][0] == "NUMBER(38,0)"
+    assert "Schema drift in DEMO" in caplog.text
+
+
+def test_coerce_to_schema(demo_csv):
+    df = pd.read_csv(demo_csv, dtype=str)
+    table_schema = schema.infer_schema(demo_csv)
+
+    typed = schema.coerce_to_schema(df, table_schema)
+
+    assert str(typed["primaryid"].dtype) == "Int64"
+    assert typed["caseversion"].isna().sum() == 1
+    assert typed["age"].dtype == "float64"
+    assert typed.loc[0, "event_dt"] == dt.date(2025, 1, 1) and typed.loc[1, "event_dt"] is None
+    assert pd.api.types.is_datetime64_any_dtype(typed["load_ts"])
+    assert typed.loc[0, "nda_num"] == "019839"
+    assert schema.columns_ddl({"age": "FLOAT"}) == "AGE FLOAT"
@@ -0,0 +1,80 @@
+# tests/test_synthetic.py
+import zipfile
+import pandas as pd
+from etl.synthetic import generate_faers, write_faers_zips, cases_for_rows, TABLE_COLUMNS
+from etl.extract import download_faers_data
+from etl.transform import merge_and_transform_one_by_one
+
+
+def _read(raw_dir, table):
+    return pd.concat(pd.read_csv(f, sep="$", dtype=str, keep_default_na=False)
+                     for f in sorted(raw_dir.glob(f"{table}25Q*.txt")))
+
+
+def test_generate_faers_is_referentially_consistent(tmp_path):
+    """Every child primaryid/caseid pair belongs to a DEMO report"""
+    written = generate_faers(tmp_path, n_cases=500, seed=7, block_size=200)
+
+    assert set(written) == {f"{t}25Q{q}.txt" for t in TABLE_COLUMNS for q in (1, 2)}
+    demo = _read(tmp_path, "DEMO")
+    assert list(demo.columns) == TABLE_COLUMNS["DEMO"]
+    assert (demo["primaryid"] == demo["caseid"] + demo["caseversion"]).all()
+    assert demo["caseid"].nunique() == 500
+    assert (demo["caseversion"].astype(int) > 1).any()  # follow-up versions
+
+    reports = set(zip(demo["primaryid"], demo["caseid"]))
+    for table in ["DRUG", "REAC", "OUTC", "RPSR", "INDI", "THER"]:
+        df = _read(tmp_path, table)
+        assert list(df.columns) == TABLE_COLUMNS[table]
+        assert set(zip(df["primaryid"], df["caseid"])) <= reports
+
+    drug = _read(tmp_path, "DRUG")
+    assert (drug.groupby("primaryid")["role_cod"].first() == "PS").all()
+    assert sum(written.values()) > 500 * 10
+
+
+def test_generate_faers_has_several_indi_and_ther_rows_per_drug(tmp_path):
+    """A drug_seq can carry several indications / therapy periods, each with its own key"""
+    generate_faers(tmp_path, n_cases=1_000, seed=5, duplicate_rate=0)
+    indi = _read(tmp_path, "INDI")
+    ther = _read(tmp_path, "THER")
+
+    per_drug = indi.groupby(["primaryid", "indi_drug_seq"]).size()
+    assert set(per_drug) == {1, 2, 3}
+    assert not indi.duplicated(["primaryid", "indi_drug_seq", "indi_pt"]).any()
+
+    assert ther.groupby(["primaryid", "dsg_drug_seq"]).size().max() > 1
+    assert not ther.duplicated(["primaryid", "dsg_drug_seq", "start_dt", "end_dt", "dur", "dur_cod"]).any()
+    assert 2.4 < len(indi) / 1_150 < 3.2 and 1.1 < len(ther) / 1_150 < 1.7  # ~1.15 reports per case
+
+
+def test_generate_faers_is_seeded(tmp_path):
+    """Same seed → identical files; different seed → different data"""
+    generate_faers(tmp_path / "a", n_cases=100, seed=1)
+    generate_faers(tmp_path / "b", n_cases=100, seed=1)
+    generate_faers(tmp_path / "c", n_cases=100, seed=2)
+
+    same = (tmp_path / "a" / "DRUG25Q1.txt").read_bytes() == (tmp_path / "b" / "DRUG25Q1.txt").read_bytes()
+    diff = (tmp_path / "a" / "DRUG25Q1.txt").read_bytes() != (tmp_path / "c" / "DRUG25Q1.txt").read_bytes()
+    assert same and diff
+
+
+def test_cases_for_rows_scale():
+    assert 6_000 < cases_for_rows(100_000) < 7_000
+
+
+def test_synthetic_zips_extract_and_transform(tmp_path):
+    """Generated ZIPs go through local extract and transform like FDA exports"""
+    generate_faers(tmp_path / "gen", n_cases=300, seed=3)
+    zips = write_faers_zips(tmp_path / "gen", tmp_path / "zips")
+    assert [z.name for z in zips] == ["FAERS_ASCII_2025Q1.zip", "FAERS_ASCII_2025Q2.zip"]
+    assert "ASCII/DEMO25Q1.txt" in zipfile.ZipFile(zips[0]).namelist()
+
+    raw, processed = tmp_path / "raw", tmp_path / "processed"
+    files = download_faers_data(raw, zip_dir=tmp_path / "zips")
+    assert len(files) == 14
+
+    merge_and_transform_one_by_one(raw, processed)
+    demo = pd.read_csv(processed / "merged_demo.csv", dtype=str)
+    assert set(demo["source_quarter"]) == {"25Q1", "25Q2"}
+    assert len(demo) == len(_read(raw, "DEMO").drop_duplicates())
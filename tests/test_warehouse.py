@@ -0,0 +1,62 @@
+# tests/test_warehouse.py
+import subprocess
+import sys
+import pandas as pd
+import pytest
+from etl import warehouse
+
+pytest.importorskip("duckdb")
+
+
+@pytest.fixture
+def processed_dir(tmp_path):
+    """Tiny processed DEMO/DRUG outputs in the transform stage's CSV format"""
+    pd.DataFrame({
+        "primaryid": ["1", "2"], "caseid": ["10", "20"], "age": ["25.0", ""],
+        "event_dt": ["2025-01-01", ""], "sex": ["M", "Unknown"],
+        "load_ts": ["2026-02-05 10:00:00.123456"] * 2, "source_quarter": ["25Q1", "25Q2"],
+    }).to_csv(tmp_path / "merged_demo.csv", index=False)
+    pd.DataFrame({
+        "primaryid": ["1", "1", "2"], "drug_seq": ["1", "2", "1"],
+        "drugname": ["SERTRALINE", 'ASPIRIN "EC"', "FLUOXETINE"], "nda_num": ["019839", "", "20001"],
+    }).to_csv(tmp_path / "merged_drug.csv", index=False)
+    return tmp_path
+
+
+def test_duckdb_backend_loads_typed_tables(processed_dir, tmp_path):
+    backend = warehouse.get_backend("duckdb", path=tmp_path / "wh" / "ETL_TESTING.duckdb")
+    results = backend.load_tables(processed_dir.glob("merged_*.csv"))
+    assert {t: r["rows"] for t, r in results.items()} == {"DEMO": 2, "DRUG": 3}
+    assert backend.table_counts() == {"DEMO": 2, "DRUG": 3}
+
+    with backend.connection() as conn:
+        types = dict(conn.execute(
+            "SELECT column_name, data_type FROM information_schema.columns WHERE table_name = 'DEMO'"
+        ).fetchall())
+        assert types["PRIMARYID"] == "BIGINT"
+        assert types["AGE"] == "DOUBLE"
+        assert types["EVENT_DT"] == "DATE"
+        assert types["LOAD_TS"] == "TIMESTAMP"
+
+        # Database name matches the Snowflake database used by dbt sources
+        assert conn.execute("SELECT current_database()").fetchone()[0] == "ETL_TESTING"
+        assert conn.execute("SELECT count(*) FROM FDA.DEMO WHERE age < 18").fetchone()[0] == 0
+        assert conn.execute("SELECT nda_num FROM FDA.DRUG WHERE drug_seq = 1 ORDER BY primaryid") \
+            .fetchall() == [("019839",), ("20001",)]
+
+
+def test_duckdb_backend_releases_the_file_between_loads(processed_dir, tmp_path):
+    """Another process (e.g. dbt-duckdb) can open the warehouse for writing after a load"""
+    path = tmp_path / "wh" / "ETL_TESTING.duckdb"
+    backend = warehouse.get_backend("duckdb", path=path)
+    backend.load_file(processed_dir / "merged_demo.csv")
+
+    writer = ("import duckdb, sys; con = duckdb.connect(sys.argv[1]); "
+              "con.execute('CREATE TABLE FDA.WRITER_CHECK AS SELECT 1 AS x')")
+    subprocess.run([sys.executable, "-c", writer, str(path)], check=True, capture_output=True)
+    assert backend.table_counts(["DEMO", "WRITER_CHECK"]) == {"DEMO": 2, "WRITER_CHECK": 1}
+
+
+def test_get_backend_rejects_unknown_name():
+    with pytest.raises(ValueError, match="Unknown warehouse backend"):
+        warehouse.get_backend("postgres")
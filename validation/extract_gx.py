@@ -7,9 +7,15 @@ and dynamic Great Expectations registration.
 Features:
 - Registers a Pandas datasource, assets, batches, and expectation suites dynamically.
 - Checks row count ranges and expected columns for each table.
+- Counts rows with a cached, memory-mapped newline scan.
 - Samples large CSVs to avoid memory overload.
 - Writes JSON validation reports to GX_OUTPUT_DIR.
 - Frees memory after each validation to prevent leaks.
+- Records per-table validation time and peak memory in the run report.
+- validate_table() checks one table; GX calls are serialized with a lock so
+  tables can be validated from parallel pipeline tasks.
+- Great Expectations is imported and its context created on first use, so
+  importing this module (e.g. for FAERS_ROW_COUNTS) stays cheap.
 
 Date: 2026-02-05
 """
@@ -17,27 +23,41 @@ Date: 2026-02-05
 import logging
 import gc
 import json
+import threading
 from pathlib import Path
 import pandas as pd
-import great_expectations as gx
-from great_expectations import expectations as gxe
+from etl.row_count import count_rows
+from etl.instrumentation import stage
 
 # -----------------------
 # Base directories
 # -----------------------
 BASE_DIR = Path.cwd()  # repo root
 PROCESSED_DIR = BASE_DIR / "data"  # processed CSV storage
-PROCESSED_DIR.mkdir(parents=True, exist_ok=True)
 GX_OUTPUT_DIR = PROCESSED_DIR / "gx_reports"  # GE JSON output directory
 
-# -----------------------
-# Initialize GE context
-# -----------------------
-context = gx.get_context()
-try:
-    datasource = context.data_sources.get("pandas_src")  # fetch existing datasource
-except Exception:
-    datasource = context.data_sources.add_pandas(name="pandas_src")  # create new Pandas datasource
+_GX_LOCK = threading.Lock()
+_GX = {}  # lazily created GE context and datasource
+
+
+def get_gx_context():
+    """
+    Create the GE context and Pandas datasource on first use.
+
+    Returns:
+        tuple: (context, datasource)
+    """
+    with _GX_LOCK:
+        if not _GX:
+            import great_expectations as gx
+
+            context = gx.get_context()
+            try:
+                datasource = context.data_sources.get("pandas_src")  # fetch existing datasource
+            except Exception:
+                datasource = context.data_sources.add_pandas(name="pandas_src")  # create new Pandas datasource
+            _GX.update(context=context, datasource=datasource)
+    return _GX["context"], _GX["datasource"]
 
 # -----------------------
 # FAERS table expectations
@@ -65,12 +85,12 @@ FAERS_ROW_COUNTS = {
 }
 
 
-def validate_all_texts(processed_dir: Path):
+def validate_all_texts(processed_dir: Path, output_dir: Path = None):
     """
     Validate all merged FAERS CSV files in `processed_dir` using Great Expectations.
 
     Workflow:
-    - Streams row count for large CSVs to avoid memory overload.
+    - Counts rows with a memory-mapped, quote-aware scan (cached per file).
     - Loads a sample (or full CSV if small) into Pandas.
     - Dynamically registers datasource, asset, batch, expectation suite, and validation definition.
     - Applies row count and column set expectations.
@@ -79,18 +99,41 @@ def validate_all_texts(processed_dir: Path):
 
     Args:
         processed_dir (Path): Directory containing merged FAERS CSVs.
+        output_dir (Path): Report directory, defaults to GX_OUTPUT_DIR.
+    """
+    for file_path in sorted(processed_dir.glob("merged_*.csv")):
+        validate_table(file_path, output_dir)
+
+
+def validate_table(file_path: Path, output_dir: Path = None) -> bool:
     """
-    GX_OUTPUT_DIR.mkdir(parents=True, exist_ok=True)  # ensure output directory exists
+    Validate one merged FAERS CSV and write gx_<TABLE>.json.
+
+    Row counting and sample loading run outside the GX lock, so several
+    tables can be validated from parallel pipeline tasks.
 
-    for file_path in processed_dir.glob("merged_*.csv"):
-        table_name = file_path.stem.replace("merged_", "").upper()
-        logging.info(f">>> validating: {table_name}")
+    Args:
+        file_path (Path): merged_<table>.csv to validate.
+        output_dir (Path): Report directory, defaults to GX_OUTPUT_DIR.
 
+    Returns:
+        bool: Whether all expectations passed (False if the file is missing).
+    """
+    output_dir = output_dir or GX_OUTPUT_DIR
+    output_dir.mkdir(parents=True, exist_ok=True)  # ensure output directory exists
+
+    table_name = file_path.stem.replace("merged_", "").upper()
+    if not file_path.exists():
+        logging.warning(f"{file_path.name} not found — skipping validation")
+        return False
+
+    logging.info(f">>> validating: {table_name}")
+    with stage("validate", table=table_name) as st:
         # -----------------------
-        # Determine row count (streaming)
+        # Determine row count (memory-mapped, cached)
         # -----------------------
-        with open(file_path, "r", encoding="utf-8") as f:
-            actual_row_count = sum(1 for line in f) - 1  # exclude header
+        actual_row_count = count_rows(file_path, header=True, quoted=True)
+        st.add(rows=actual_row_count, n_bytes=file_path.stat().st_size)
 
         # -----------------------
         # Load a sample or full CSV
@@ -101,59 +144,67 @@ def validate_all_texts(processed_dir: Path):
             df = pd.read_csv(file_path, low_memory=True)
 
         try:
-            # -----------------------
-            # Datasource and asset registration
-            # -----------------------
-            try:
-                asset = datasource.get_asset(table_name)
-            except Exception:
-                asset = datasource.add_dataframe_asset(name=table_name)
-
-            # -----------------------
-            # Batch registration
-            # -----------------------
-            try:
-                batch_def = asset.get_batch_definition(f"def_{table_name}")
-            except Exception:
-                batch_def = asset.add_batch_definition_whole_dataframe(name=f"def_{table_name}")
-
-            # -----------------------
-            # Expectation suite setup
-            # -----------------------
-            suite_name = f"suite_{table_name}"
-            suite = gx.ExpectationSuite(name=suite_name)
-
-            min_r, max_r = FAERS_ROW_COUNTS.get(table_name, (10_000, 20_000_000))
-            suite.add_expectation(gxe.ExpectTableRowCountToBeBetween(min_value=min_r, max_value=max_r))
-
-            cols = FAERS_SCHEMAS.get(table_name, list(df.columns))
-            suite.add_expectation(gxe.ExpectTableColumnsToMatchSet(column_set=cols, exact_match=False))
-
-            try:
-                context.suites.add(suite)
-            except Exception:
-                context.suites.delete(suite_name)
-                context.suites.add(suite)
-
-            # -----------------------
-            # Validation definition
-            # -----------------------
-            val_name = f"v_{table_name}"
-            val = gx.ValidationDefinition(data=batch_def, suite=suite, name=val_name)
-            try:
-                val = context.validation_definitions.add(val)
-            except Exception:
-                context.validation_definitions.delete(val_name)
-                val = context.validation_definitions.add(val)
-
-            # -----------------------
-            # Run validation
-            # -----------------------
-            results = val.run(batch_parameters={"dataframe": df})
-            with open(GX_OUTPUT_DIR / f"gx_{table_name}.json", "w") as f:
+            import great_expectations as gx
+            from great_expectations import expectations as gxe
+
+            context, datasource = get_gx_context()
+            # GX context objects are not thread-safe; serialize registration and runs
+            with _GX_LOCK:
+                # -----------------------
+                # Datasource and asset registration
+                # -----------------------
+                try:
+                    asset = datasource.get_asset(table_name)
+                except Exception:
+                    asset = datasource.add_dataframe_asset(name=table_name)
+
+                # -----------------------
+                # Batch registration
+                # -----------------------
+                try:
+                    batch_def = asset.get_batch_definition(f"def_{table_name}")
+                except Exception:
+                    batch_def = asset.add_batch_definition_whole_dataframe(name=f"def_{table_name}")
+
+                # -----------------------
+                # Expectation suite setup
+                # -----------------------
+                suite_name = f"suite_{table_name}"
+                suite = gx.ExpectationSuite(name=suite_name)
+
+                min_r, max_r = FAERS_ROW_COUNTS.get(table_name, (10_000, 20_000_000))
+                suite.add_expectation(gxe.ExpectTableRowCountToBeBetween(min_value=min_r, max_value=max_r))
+
+                cols = FAERS_SCHEMAS.get(table_name, list(df.columns))
+                suite.add_expectation(gxe.ExpectTableColumnsToMatchSet(column_set=cols, exact_match=False))
+
+                try:
+                    context.suites.add(suite)
+                except Exception:
+                    context.suites.delete(suite_name)
+                    context.suites.add(suite)
+
+                # -----------------------
+                # Validation definition
+                # -----------------------
+                val_name = f"v_{table_name}"
+                val = gx.ValidationDefinition(data=batch_def, suite=suite, name=val_name)
+                try:
+                    val = context.validation_definitions.add(val)
+                except Exception:
+                    context.validation_definitions.delete(val_name)
+                    val = context.validation_definitions.add(val)
+
+                # -----------------------
+                # Run validation
+                # -----------------------
+                results = val.run(batch_parameters={"dataframe": df})
+
+            with open(output_dir / f"gx_{table_name}.json", "w") as f:
                 json.dump(results.to_json_dict(), f, indent=2)
 
             logging.info(f"success: {table_name} (verified {actual_row_count} rows)")
+            return results.success
 
         finally:
             del df
@@ -0,0 +1,179 @@
+"""
+FAERS Cross-Table Referential Integrity Validation
+
+This script checks that every `primaryid` in the child FAERS tables
+(DRUG, REAC, OUTC, THER, RPSR, INDI) exists in DEMO, using bounded memory.
+
+Features:
+- Builds a sorted numpy int64 index of DEMO primaryids in one streaming pass.
+- Streams each child table's primaryid column in chunks and checks membership
+  with vectorized np.searchsorted.
+- Reports orphan counts, percentages and samples per table.
+- Writes a GX-style (expect_column_values_to_be_in_set) JSON report to GX_OUTPUT_DIR.
+
+Date: 2026-02-05
+"""
+
+import logging
+import json
+from pathlib import Path
+import numpy as np
+import pandas as pd
+
+# -----------------------
+# Base directories
+# -----------------------
+BASE_DIR = Path.cwd()  # repo root
+GX_OUTPUT_DIR = BASE_DIR / "data" / "gx_reports"  # same report folder as extract_gx
+
+PARENT_TABLE = "DEMO"
+CHILD_TABLES = ["DRUG", "REAC", "OUTC", "THER", "RPSR", "INDI"]
+CHUNK_SIZE = 500_000
+
+
+def _read_primaryids(csv_path: Path, chunksize: int):
+    """
+    Stream the primaryid column as (int64 ids, valid mask, raw strings) chunks.
+
+    Non-numeric ids (e.g. the 'Unknown' fill value) are marked invalid.
+    """
+    for chunk in pd.read_csv(csv_path, usecols=["primaryid"], dtype=str,
+                             chunksize=chunksize, keep_default_na=False):
+        raw = chunk["primaryid"].str.strip()
+        numeric = pd.to_numeric(raw, errors="coerce")
+        valid = numeric.notna().to_numpy()
+        ids = numeric.fillna(-1).to_numpy(dtype=np.int64)
+        yield ids, valid, raw.to_numpy()
+
+
+def build_primaryid_index(demo_csv: Path, chunksize: int = CHUNK_SIZE) -> np.ndarray:
+    """
+    Build a sorted, unique int64 array of DEMO primaryids in one streaming pass.
+
+    Args:
+        demo_csv (Path): Path to merged_demo.csv.
+        chunksize (int): Rows read per chunk.
+
+    Returns:
+        np.ndarray: Sorted unique primaryids (int64).
+    """
+    parts = [np.unique(ids[valid]) for ids, valid, _ in _read_primaryids(demo_csv, chunksize)]
+    if not parts:
+        return np.empty(0, dtype=np.int64)
+    return np.unique(np.concatenate(parts))
+
+
+def find_orphans(child_csv: Path, index: np.ndarray, chunksize: int = CHUNK_SIZE,
+                 sample_size: int = 20) -> dict:
+    """
+    Count child rows whose primaryid is missing from a sorted parent index.
+
+    Args:
+        child_csv (Path): Path to a merged child CSV.
+        index (np.ndarray): Sorted unique parent primaryids.
+        chunksize (int): Rows read per chunk.
+        sample_size (int): Maximum number of distinct orphan ids to keep.
+
+    Returns:
+        dict: element_count, unexpected_count and partial_unexpected_list.
+    """
+    element_count = 0
+    unexpected_count = 0
+    samples = []
+
+    for ids, valid, raw in _read_primaryids(child_csv, chunksize):
+        element_count += len(ids)
+        if len(index):
+            pos = np.searchsorted(index, ids)
+            pos[pos == len(index)] = 0  # out-of-range ids compare against index[0]
+            found = (index[pos] == ids) & valid
+        else:
+            found = np.zeros(len(ids), dtype=bool)
+
+        orphan_mask = ~found
+        unexpected_count += int(orphan_mask.sum())
+        if len(samples) < sample_size and orphan_mask.any():
+            for value in pd.unique(raw[orphan_mask]):
+                if value not in samples:
+                    samples.append(value)
+                if len(samples) >= sample_size:
+                    break
+
+    return {
+        "element_count": element_count,
+        "unexpected_count": unexpected_count,
+        "partial_unexpected_list": samples,
+    }
+
+
+def validate_referential_integrity(processed_dir: Path, chunksize: int = CHUNK_SIZE,
+                                   sample_size: int = 20, output_dir: Path = None) -> dict:
+    """
+    Validate that child table primaryids exist in DEMO and write a GX-style report.
+
+    Workflow:
+    - Builds the DEMO primaryid index in one streaming pass.
+    - Checks each merged child CSV in chunks against the index.
+    - Writes gx_REFERENTIAL_INTEGRITY.json to `output_dir` (GX_OUTPUT_DIR by default).
+
+    Args:
+        processed_dir (Path): Directory containing merged FAERS CSVs.
+        chunksize (int): Rows read per chunk.
+        sample_size (int): Maximum orphan ids reported per table.
+        output_dir (Path): Report directory, defaults to GX_OUTPUT_DIR.
+
+    Returns:
+        dict: GX-style validation result with one entry per child table.
+    """
+    output_dir = output_dir or GX_OUTPUT_DIR
+    output_dir.mkdir(parents=True, exist_ok=True)
+
+    demo_csv = processed_dir / f"merged_{PARENT_TABLE.lower()}.csv"
+    if not demo_csv.exists():
+        logging.warning(f"{demo_csv.name} not found — skipping referential integrity checks")
+        return {"success": False, "results": []}
+
+    index = build_primaryid_index(demo_csv, chunksize)
+    logging.info(f">>> referential integrity: {len(index)} distinct {PARENT_TABLE} primaryids "
+                 f"({index.nbytes / 1e6:.1f} MB index)")
+
+    results = []
+    for table in CHILD_TABLES:
+        child_csv = processed_dir / f"merged_{table.lower()}.csv"
+        if not child_csv.exists():
+            continue
+
+        result = find_orphans(child_csv, index, chunksize, sample_size)
+        total = result["element_count"]
+        result["unexpected_percent"] = 100 * result["unexpected_count"] / total if total else 0.0
+        success = result["unexpected_count"] == 0
+
+        results.append({
+            "success": success,
+            "expectation_config": {
+                "type": "expect_column_values_to_be_in_set",
+                "kwargs": {"column": "primaryid", "value_set": f"{PARENT_TABLE}.primaryid", "table": table},
+            },
+            "result": result,
+        })
+
+        if success:
+            logging.info(f"success: {table} primaryids all present in {PARENT_TABLE} ({total} rows)")
+        else:
+            logging.warning(f"orphans: {table} has {result['unexpected_count']} rows "
+                            f"({result['unexpected_percent']:.3f}%) not in {PARENT_TABLE}, "
+                            f"e.g. {result['partial_unexpected_list'][:5]}")
+
+    report = {
+        "success": all(r["success"] for r in results),
+        "results": results,
+        "statistics": {
+            "evaluated_expectations": len(results),
+            "successful_expectations": sum(r["success"] for r in results),
+            "unsuccessful_expectations": sum(not r["success"] for r in results),
+        },
+    }
+    with open(output_dir / "gx_REFERENTIAL_INTEGRITY.json", "w") as f:
+        json.dump(report, f, indent=2)
+
+    return report